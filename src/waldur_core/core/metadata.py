@@ -445,6 +445,10 @@ class WaldurSlurm(BaseModel):
         "/etc/waldur/id_rsa",
         description="Path to private key file used as SSH identity file for accessing SLURM master.",
     )
+    SSH_CONTROL_PERSIST = Field(
+        "10m",
+        description="How long SSH connection to SLURM master is kept open for reuse after the last command. Empty value disables connection reuse.",
+    )
     DEFAULT_LIMITS = Field(
         {
             "CPU": 16000,  # Measured unit is CPU-minutes
@@ -766,6 +770,10 @@ class WaldurOpenstack(BaseModel):
         False,
         description="If true, allow connecting of instances directly to external networks",
     )
+    TENANT_RESOURCES_RECONCILIATION_PERIOD = Field(
+        timedelta(hours=24),
+        description="Between full pulls only instances, volumes and snapshots changed since the previous pull are fetched. Full pull is needed to detect resources deleted in OpenStack.",
+    )
 
     class Meta:
         public_settings = [
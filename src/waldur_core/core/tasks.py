@@ -1,3 +1,5 @@
+import hashlib
+import json
 import logging
 import traceback
 from uuid import uuid4
@@ -8,6 +10,7 @@ from celery.app.task import _reprtask
 from celery.local import Proxy
 from celery.result import AsyncResult
 from celery.worker.request import Request
+from django.core.cache import cache
 from django.db import IntegrityError
 from django.db import models as django_models
 from django.db.models import ObjectDoesNotExist
@@ -382,37 +385,37 @@ class BackgroundTask(CeleryTask, metaclass=TaskType):
        should log themselves explicitly and make sure that they will not
        spam error messages.
 
-    Implement "is_equal" method to define what tasks are equal and should
-    be executed simultaneously.
+    Uncompleted tasks are tracked with leases stored in cache. Lease is acquired
+    when task is scheduled and released when task is completed. If worker dies
+    before task is completed, lease expires after "lease_timeout" seconds.
+
+    Override "get_lease_key" method to define what tasks are equal and should
+    not be executed simultaneously. By default tasks are equal if they have
+    the same name and input parameters.
     """
 
     is_background = True
+    lease_timeout = 60 * 60
 
-    def is_equal(self, other_task, *args, **kwargs):
-        """Return True if task do the same operation as other_task.
+    def get_lease_key(self, *args, **kwargs):
+        params = json.dumps([args, kwargs], sort_keys=True, default=str)
+        digest = hashlib.sha256(params.encode()).hexdigest()
+        return f"background_task:{self.name}:{digest}"
 
-        Note! Other task is represented as serialized celery task - dictionary.
-        """
-        raise NotImplementedError(
-            'BackgroundTask should implement "is_equal" method to avoid queue overload.'
+    def acquire_lease(self, *args, **kwargs):
+        """Return True if lease is acquired, ie there is no uncompleted equal task"""
+        return cache.add(
+            self.get_lease_key(*args, **kwargs), True, timeout=self.lease_timeout
         )
 
-    def is_previous_task_processing(self, *args, **kwargs):
-        """Return True if exist task that is equal to current and is uncompleted"""
-        app = self._get_app()
-        inspect = app.control.inspect()
-        active = inspect.active() or {}
-        scheduled = inspect.scheduled() or {}
-        reserved = inspect.reserved() or {}
-        uncompleted = sum(
-            list(active.values()) + list(scheduled.values()) + list(reserved.values()),
-            [],
-        )
-        return any(self.is_equal(task, *args, **kwargs) for task in uncompleted)
+    def release_lease(self, *args, **kwargs):
+        cache.delete(self.get_lease_key(*args, **kwargs))
 
     def apply_async(self, args=None, kwargs=None, **options):
         """Do not run background task if previous task is uncompleted"""
-        if self.is_previous_task_processing(*args, **kwargs):
+        args = args or ()
+        kwargs = kwargs or {}
+        if not self.acquire_lease(*args, **kwargs):
             message = (
                 "Background task %s was not scheduled, because its predecessor is not completed yet."
                 % self.name
@@ -420,7 +423,15 @@ class BackgroundTask(CeleryTask, metaclass=TaskType):
             logger.info(message)
             # It is expected by Celery that apply_async return AsyncResult, otherwise celerybeat dies
             return self.AsyncResult(options.get("task_id") or str(uuid4()))
-        return super().apply_async(args=args, kwargs=kwargs, **options)
+        try:
+            return super().apply_async(args=args, kwargs=kwargs, **options)
+        except Exception:
+            self.release_lease(*args, **kwargs)
+            raise
+
+    def after_return(self, status, retval, task_id, args, kwargs, einfo):
+        self.release_lease(*(args or ()), **(kwargs or {}))
+        super().after_return(status, retval, task_id, args, kwargs, einfo)
 
 
 def log_celery_task(request):
@@ -0,0 +1,57 @@
+from unittest import mock
+
+from celery import Task as CeleryTask
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from waldur_core.core import tasks
+
+
+class DummyBackgroundTask(tasks.BackgroundTask):
+    name = "waldur_core.core.tests.DummyBackgroundTask"
+
+    def run(self, serialized_instance):
+        pass
+
+
+@mock.patch.object(CeleryTask, "apply_async")
+class BackgroundTaskTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.task = DummyBackgroundTask()
+
+    def test_task_is_not_scheduled_if_previous_task_is_not_completed(self, apply_async):
+        self.task.apply_async(args=("instance:1",))
+        self.task.apply_async(args=("instance:1",))
+        self.assertEqual(apply_async.call_count, 1)
+
+    def test_tasks_with_different_arguments_are_scheduled(self, apply_async):
+        self.task.apply_async(args=("instance:1",))
+        self.task.apply_async(args=("instance:2",))
+        self.assertEqual(apply_async.call_count, 2)
+
+    def test_task_is_scheduled_after_previous_task_is_completed(self, apply_async):
+        self.task.apply_async(args=("instance:1",))
+        self.task.after_return("SUCCESS", None, "task-id", ["instance:1"], {}, None)
+        self.task.apply_async(args=("instance:1",))
+        self.assertEqual(apply_async.call_count, 2)
+
+    def test_lease_is_released_if_task_scheduling_failed(self, apply_async):
+        apply_async.side_effect = ConnectionError()
+        with self.assertRaises(ConnectionError):
+            self.task.apply_async(args=("instance:1",))
+
+        apply_async.side_effect = None
+        self.task.apply_async(args=("instance:1",))
+        self.assertEqual(apply_async.call_count, 2)
+
+
+class EagerBackgroundTaskTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    @override_settings(task_always_eager=True)
+    def test_lease_is_released_when_eager_task_is_completed(self):
+        task = DummyBackgroundTask()
+        task.apply_async(args=("instance:1",))
+        self.assertTrue(task.acquire_lease("instance:1"))
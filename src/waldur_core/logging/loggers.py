@@ -4,12 +4,17 @@ import datetime
 import decimal
 import importlib
 import logging
+import threading
 import types
 import uuid
 from collections import defaultdict
+from contextlib import contextmanager
 
 from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from django.db.models import signals
 
 from waldur_core.logging import models
 from waldur_core.logging.log import EventLoggerAdapter
@@ -230,15 +235,104 @@ class EventLogger(BaseLogger):
         log = getattr(self.logger, level)
         log(msg, extra={"event_type": event_type, "event_context": context})
 
-        event = models.Event.objects.create(
+        event = models.Event(
             event_type=event_type,
             message=msg,
             context=context,
         )
+        scopes = []
         if event_context:
-            for scope in self.get_scopes(event_context) or []:
-                if scope and scope.id:
-                    models.Feed.objects.create(scope=scope, event=event)
+            scopes = [
+                scope
+                for scope in self.get_scopes(event_context) or []
+                if scope and scope.id
+            ]
+
+        buffer = getattr(_events_buffer, "events", None)
+        if buffer is not None:
+            # Scopes are referenced by key because they may be deleted before flush
+            buffer.append(
+                (
+                    event,
+                    [
+                        (ContentType.objects.get_for_model(scope), scope.id)
+                        for scope in scopes
+                    ],
+                )
+            )
+        else:
+            event.save()
+            models.Feed.objects.bulk_create(
+                [models.Feed(scope=scope, event=event) for scope in scopes]
+            )
+
+
+_events_buffer = threading.local()
+
+
+def write_events(events):
+    """
+    Store events and their feeds using two bulk INSERT statements.
+    events - list of tuples (event, scope keys), where scope key is
+    a tuple of content type and object ID.
+    As bulk_create does not send post_save signal, it is sent explicitly
+    so that event hooks are still processed.
+    """
+    if not events:
+        return
+    models.Event.objects.bulk_create([event for (event, _) in events])
+    models.Feed.objects.bulk_create(
+        [
+            models.Feed(content_type=content_type, object_id=object_id, event=event)
+            for (event, scope_keys) in events
+            for (content_type, object_id) in scope_keys
+        ]
+    )
+    for event, _ in events:
+        signals.post_save.send(
+            sender=models.Event,
+            instance=event,
+            created=True,
+            update_fields=None,
+            raw=False,
+            using=event._state.db,
+        )
+
+
+@contextmanager
+def buffered_events():
+    """
+    Collect events emitted within the block and store them in batch
+    when the block is finished and current transaction is committed.
+    If the block raises an exception, collected events are discarded.
+    It should be nested in transaction.atomic block so that events are
+    written on commit of that transaction.
+    It is useful for flows which emit a lot of events, for example, backend pulls.
+
+    Example usage:
+
+    .. code-block:: python
+
+        with transaction.atomic(), buffered_events():
+            for rule in rules:
+                event_logger.security_group_rule.info(...)
+    """
+    if getattr(_events_buffer, "events", None) is not None:
+        # Events are flushed by outer block
+        yield
+        return
+
+    _events_buffer.events = []
+    try:
+        yield
+    except BaseException:
+        # Events of failed block are discarded
+        _events_buffer.events = None
+        raise
+    else:
+        events = _events_buffer.events
+        _events_buffer.events = None
+        transaction.on_commit(lambda: write_events(events))
 
 
 class LoggableMixin:
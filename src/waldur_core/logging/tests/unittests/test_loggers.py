@@ -0,0 +1,68 @@
+from django.db import transaction
+from django.test import TestCase
+
+from waldur_core.logging import models
+from waldur_core.logging.loggers import buffered_events, event_logger
+from waldur_core.structure.tests import factories as structure_factories
+
+
+class EventLoggerTest(TestCase):
+    def setUp(self):
+        self.project = structure_factories.ProjectFactory()
+
+    def log_project_event(self):
+        event_logger.project.info(
+            "Project {project_name} has been updated.",
+            event_type="project_update_succeeded",
+            event_context={"project": self.project},
+        )
+
+    def test_event_is_stored_with_feeds(self):
+        self.log_project_event()
+
+        event = models.Event.objects.get(event_type="project_update_succeeded")
+        self.assertEqual(
+            set(models.Feed.objects.filter(event=event).values_list("object_id")),
+            {(self.project.id,), (self.project.customer.id,)},
+        )
+
+    def test_buffered_events_are_stored_when_block_is_finished(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with buffered_events():
+                self.log_project_event()
+                self.log_project_event()
+                self.assertFalse(
+                    models.Event.objects.filter(
+                        event_type="project_update_succeeded"
+                    ).exists()
+                )
+
+        events = models.Event.objects.filter(event_type="project_update_succeeded")
+        self.assertEqual(events.count(), 2)
+        self.assertEqual(models.Feed.objects.filter(event__in=events).count(), 4)
+
+    def test_buffered_events_are_not_stored_if_transaction_is_rolled_back(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic(), buffered_events():
+                    self.log_project_event()
+                    raise ValueError()
+            except ValueError:
+                pass
+
+        self.assertFalse(
+            models.Event.objects.filter(event_type="project_update_succeeded").exists()
+        )
+
+    def test_buffered_events_are_discarded_if_block_fails(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with buffered_events():
+                    self.log_project_event()
+                    raise ValueError()
+            except ValueError:
+                pass
+
+        self.assertFalse(
+            models.Event.objects.filter(event_type="project_update_succeeded").exists()
+        )
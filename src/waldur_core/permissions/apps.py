@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.db.models import signals as model_signals
 
 
 class PermissionsConfig(AppConfig):
@@ -6,7 +7,7 @@ class PermissionsConfig(AppConfig):
     verbose_name = "Permissions"
 
     def ready(self):
-        from . import handlers, signals
+        from . import handlers, models, signals
 
         signals.role_granted.connect(
             handlers.log_role_granted,
@@ -22,3 +23,27 @@ class PermissionsConfig(AppConfig):
             handlers.log_role_updated,
             dispatch_uid="waldur_core.permissions.log_role_updated",
         )
+
+        model_signals.post_save.connect(
+            handlers.invalidate_permissions_cache,
+            sender=models.UserRole,
+            dispatch_uid="waldur_core.permissions.invalidate_permissions_cache_on_user_role_save",
+        )
+
+        model_signals.post_delete.connect(
+            handlers.invalidate_permissions_cache,
+            sender=models.UserRole,
+            dispatch_uid="waldur_core.permissions.invalidate_permissions_cache_on_user_role_delete",
+        )
+
+        model_signals.post_save.connect(
+            handlers.invalidate_permissions_cache,
+            sender=models.RolePermission,
+            dispatch_uid="waldur_core.permissions.invalidate_permissions_cache_on_role_permission_save",
+        )
+
+        model_signals.post_delete.connect(
+            handlers.invalidate_permissions_cache,
+            sender=models.RolePermission,
+            dispatch_uid="waldur_core.permissions.invalidate_permissions_cache_on_role_permission_delete",
+        )
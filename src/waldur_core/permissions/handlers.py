@@ -1,4 +1,5 @@
 from waldur_core.permissions.log import event_logger
+from waldur_core.permissions.utils import PermissionsCache
 from waldur_core.structure.permissions import _get_customer
 
 
@@ -60,3 +61,7 @@ def log_role_updated(sender, instance, current_user=None, **kwargs):
         f"in {get_scope_name(instance.scope)} is updated from {old_time} to {new_time}.",
         event_type="role_updated",
     )
+
+
+def invalidate_permissions_cache(sender, **kwargs):
+    PermissionsCache.invalidate()
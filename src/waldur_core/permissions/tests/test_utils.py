@@ -0,0 +1,44 @@
+from django.test import TestCase
+
+from waldur_core.permissions.enums import PermissionEnum
+from waldur_core.permissions.fixtures import ProjectRole
+from waldur_core.permissions.utils import has_permission
+from waldur_core.structure.tests import fixtures
+
+
+class HasPermissionTest(TestCase):
+    def setUp(self):
+        self.fixture = fixtures.ProjectFixture()
+        self.project = self.fixture.project
+        self.user = self.fixture.admin
+        ProjectRole.ADMIN.add_permission(PermissionEnum.UPDATE_PROJECT)
+
+    def test_repeated_checks_do_not_hit_database(self):
+        self.assertTrue(
+            has_permission(self.user, PermissionEnum.UPDATE_PROJECT, self.project)
+        )
+        with self.assertNumQueries(0):
+            self.assertTrue(
+                has_permission(self.user, PermissionEnum.UPDATE_PROJECT, self.project)
+            )
+            self.assertFalse(
+                has_permission(self.user, PermissionEnum.DELETE_PROJECT, self.project)
+            )
+
+    def test_cache_is_invalidated_when_role_is_revoked(self):
+        self.assertTrue(
+            has_permission(self.user, PermissionEnum.UPDATE_PROJECT, self.project)
+        )
+        self.project.remove_user(self.user)
+        self.assertFalse(
+            has_permission(self.user, PermissionEnum.UPDATE_PROJECT, self.project)
+        )
+
+    def test_cache_is_invalidated_when_role_permission_is_deleted(self):
+        self.assertTrue(
+            has_permission(self.user, PermissionEnum.UPDATE_PROJECT, self.project)
+        )
+        ProjectRole.ADMIN.delete_permission(PermissionEnum.UPDATE_PROJECT)
+        self.assertFalse(
+            has_permission(self.user, PermissionEnum.UPDATE_PROJECT, self.project)
+        )
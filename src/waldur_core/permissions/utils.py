@@ -1,3 +1,5 @@
+from collections import defaultdict
+
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
 from django.db.models import Q
@@ -9,6 +11,64 @@ from . import enums, models, signals
 User = get_user_model()
 
 
+class PermissionsCache:
+    """
+    Active roles of the user and permissions of these roles.
+
+    Cache is stored in user instance, which is created for each request,
+    so that repeated permission checks within request do not hit database.
+    Any change of user role or role permission invalidates all caches.
+    """
+
+    version = 0
+
+    def __init__(self, user):
+        self.version = PermissionsCache.version
+        self.roles = defaultdict(set)
+        self.permissions = defaultdict(set)
+
+        for content_type_id, object_id, role_id in models.UserRole.objects.filter(
+            user=user, is_active=True
+        ).values_list("content_type_id", "object_id", "role_id"):
+            self.roles[(content_type_id, object_id)].add(role_id)
+
+        role_ids = {role_id for ids in self.roles.values() for role_id in ids}
+        if role_ids:
+            for role_id, permission in models.RolePermission.objects.filter(
+                role_id__in=role_ids
+            ).values_list("role_id", "permission"):
+                self.permissions[role_id].add(permission)
+
+    @classmethod
+    def invalidate(cls):
+        cls.version += 1
+
+    @property
+    def is_valid(self):
+        return self.version == PermissionsCache.version
+
+    def get_scope_ids(self, model):
+        content_type = ContentType.objects.get_for_model(model)
+        return {
+            object_id
+            for (content_type_id, object_id) in self.roles.keys()
+            if content_type_id == content_type.id
+        }
+
+    def has_permission(self, permission, scope):
+        content_type = ContentType.objects.get_for_model(scope)
+        role_ids = self.roles.get((content_type.id, scope.id), ())
+        return any(permission in self.permissions[role_id] for role_id in role_ids)
+
+
+def get_permissions_cache(user):
+    cache = getattr(user, "_permissions_cache", None)
+    if cache is None or not cache.is_valid:
+        cache = PermissionsCache(user)
+        user._permissions_cache = cache
+    return cache
+
+
 def has_permission(request, permission, scope):
     if isinstance(request, User):
         user = request
@@ -18,14 +78,7 @@ def has_permission(request, permission, scope):
     if user.is_staff:
         return True
 
-    roles = models.UserRole.objects.filter(
-        user=user, is_active=True, scope=scope
-    ).values_list("role", flat=True)
-    if not roles:
-        return False
-    return models.RolePermission.objects.filter(
-        role__in=roles, permission=permission
-    ).exists()
+    return get_permissions_cache(user).has_permission(permission, scope)
 
 
 def permission_factory(permission, sources=None):
@@ -2,7 +2,12 @@ from django.db.models import signals
 
 from waldur_core.core.models import DescendantMixin
 from waldur_core.quotas import fields
-from waldur_core.quotas.models import QuotaLimit, QuotaModelMixin, QuotaUsage
+from waldur_core.quotas.models import (
+    QuotaLimit,
+    QuotaModelMixin,
+    QuotaUsage,
+    QuotaUsageCheckpoint,
+)
 from waldur_core.structure import models as structure_models
 
 # new quotas
@@ -77,6 +82,7 @@ def handle_aggregated_quotas(sender, instance, **kwargs):
 def delete_quotas_when_model_is_deleted(sender, instance, **kwargs):
     QuotaLimit.objects.filter(scope=instance).delete()
     QuotaUsage.objects.filter(scope=instance).delete()
+    QuotaUsageCheckpoint.objects.filter(scope=instance).delete()
 
 
 def projects_customer_has_been_changed(
@@ -4,15 +4,21 @@ Quota usage is updated concurrently.
 In order to avoid shared write deadlock we use INSERT instead of UPDATE statement.
 That's why for usage we store delta instead of aggregated SUM value.
 And we use SUM function when we read quota usage.
+
+In order to keep reads cheap for long-lived scopes, deltas are periodically
+folded into QuotaUsageCheckpoint by compact_quota_usages task.
+Compaction deletes folded deltas and increments checkpoint in the same statement,
+so quota usage is always equal to checkpoint value plus SUM of remaining deltas.
 """
 
 import inspect
 import logging
+from collections import defaultdict
 
 from django.contrib.contenttypes import fields as ct_fields
 from django.contrib.contenttypes import models as ct_models
 from django.db import models, transaction
-from django.db.models import Sum
+from django.db.models import Q, Sum
 from django.utils.translation import gettext_lazy as _
 from model_utils import FieldTracker
 
@@ -51,6 +57,142 @@ class QuotaUsage(models.Model):
     objects = managers.QuotaManager("scope")
 
 
+class QuotaUsageCheckpoint(models.Model):
+    """
+    Aggregated value of quota usage deltas which have been already compacted.
+    """
+
+    name = models.CharField(max_length=150)
+    value = models.BigIntegerField(default=0)
+
+    content_type = models.ForeignKey(on_delete=models.CASCADE, to=ct_models.ContentType)
+    object_id = models.PositiveIntegerField()
+    scope = ct_fields.GenericForeignKey("content_type", "object_id")
+
+    objects = managers.QuotaManager("scope")
+
+    class Meta:
+        unique_together = (("name", "content_type", "object_id"),)
+
+
+def _get_scopes_query(scopes):
+    ids_by_content_type = defaultdict(set)
+    for scope in scopes:
+        content_type = ct_models.ContentType.objects.get_for_model(scope)
+        ids_by_content_type[content_type.id].add(scope.id)
+    query = Q()
+    for content_type_id, ids in ids_by_content_type.items():
+        query |= Q(content_type_id=content_type_id, object_id__in=ids)
+    return query
+
+
+def _get_scopes_map(scopes):
+    return {
+        (ct_models.ContentType.objects.get_for_model(scope).id, scope.id): scope
+        for scope in scopes
+    }
+
+
+def get_quota_usages_map(query, names=None):
+    """
+    Return dictionary where key is tuple of content type ID, object ID and quota name
+    and value is quota usage. Scopes are filtered by query on content type and object ID.
+    Usage is a sum of checkpoint value and deltas which have not been compacted yet.
+    Both tables are read using single UNION ALL statement so that
+    concurrent compaction does not cause inconsistent result.
+    """
+    deltas = QuotaUsage.objects.filter(query)
+    checkpoints = QuotaUsageCheckpoint.objects.filter(query)
+    if names is not None:
+        deltas = deltas.filter(name__in=names)
+        checkpoints = checkpoints.filter(name__in=names)
+    columns = ("content_type_id", "object_id", "name")
+    deltas = deltas.values(*columns).annotate(value=Sum("delta")).order_by()
+    checkpoints = checkpoints.values(*columns, "value").order_by()
+    result = defaultdict(int)
+    for row in deltas.union(checkpoints, all=True):
+        result[(row["content_type_id"], row["object_id"], row["name"])] += (
+            row["value"] or 0
+        )
+    return dict(result)
+
+
+def get_scopes_quota_usages(scopes, names=None):
+    """
+    Return dictionary where key is quota scope and value is dictionary with its quota usages.
+    """
+    scopes_map = _get_scopes_map(scopes)
+    if not scopes_map:
+        return {}
+    usages = get_quota_usages_map(_get_scopes_query(scopes_map.values()), names)
+    result = defaultdict(dict)
+    for (content_type_id, object_id, name), value in usages.items():
+        result[scopes_map[(content_type_id, object_id)]][name] = value
+    return dict(result)
+
+
+def get_scopes_quota_limits(scopes, names=None):
+    """
+    Return dictionary where key is quota scope and value is dictionary with its quota limits.
+    Only limits which are stored in the database are returned.
+    """
+    scopes_map = _get_scopes_map(scopes)
+    if not scopes_map:
+        return {}
+    limits = QuotaLimit.objects.filter(_get_scopes_query(scopes_map.values()))
+    if names is not None:
+        limits = limits.filter(name__in=names)
+    result = defaultdict(dict)
+    for row in limits.values("content_type_id", "object_id", "name", "value"):
+        scope = scopes_map[(row["content_type_id"], row["object_id"])]
+        result[scope][row["name"]] = row["value"]
+    return dict(result)
+
+
+def get_quota_usages(scope, names=None):
+    return get_scopes_quota_usages([scope], names).get(scope, {})
+
+
+def validate_quota_changes(scopes_deltas):
+    """
+    Validate quota deltas of several scopes using one usages query and one limits query.
+
+    scopes_deltas - dictionary where key is quota scope and value is dictionary of quotas deltas, example:
+    {
+        tenant: {'ram': 1024, 'storage': 2048},
+        project: {'os_cpu_count': 2},
+    }
+    """
+    scopes_deltas = {
+        scope: {name: delta for name, delta in deltas.items() if delta}
+        for scope, deltas in scopes_deltas.items()
+        if scope
+    }
+    scopes_deltas = {scope: deltas for scope, deltas in scopes_deltas.items() if deltas}
+    if not scopes_deltas:
+        return
+
+    names = {name for deltas in scopes_deltas.values() for name in deltas}
+    usages = get_scopes_quota_usages(scopes_deltas.keys(), names)
+    limits = get_scopes_quota_limits(scopes_deltas.keys(), names)
+
+    errors = []
+    for scope, deltas in scopes_deltas.items():
+        for name, delta in deltas.items():
+            limit = limits.get(scope, {}).get(name)
+            if limit is None:
+                limit = scope.get_default_quota_limit(name)
+            if limit == -1:
+                continue
+            usage = max(0, usages.get(scope, {}).get(name, 0))
+            if usage + delta > limit:
+                errors.append(f"{name} quota limit: {limit}, requires {usage + delta}")
+    if errors:
+        raise exceptions.QuotaValidationError(
+            _("One or more quotas were exceeded: %s") % ";".join(errors)
+        )
+
+
 class QuotaModelMixin(models.Model):
     """
     Add general fields and methods to model for quotas usage.
@@ -76,14 +218,17 @@ class QuotaModelMixin(models.Model):
     class Meta:
         abstract = True
 
+    def get_default_quota_limit(self, quota_name):
+        field = getattr(self.Quotas, quota_name, None)
+        if field:
+            return field.default_limit
+        return -1
+
     def get_quota_limit(self, quota_name):
         try:
             return QuotaLimit.objects.get(scope=self, name=quota_name).value
         except QuotaLimit.DoesNotExist:
-            field = getattr(self.Quotas, quota_name, None)
-            if field:
-                return field.default_limit
-            return -1
+            return self.get_default_quota_limit(quota_name)
 
     def set_quota_limit(self, quota_name, limit):
         QuotaLimit.objects.update_or_create(
@@ -93,11 +238,35 @@ class QuotaModelMixin(models.Model):
             defaults={"value": limit},
         )
 
+    def set_quota_limits(self, limits):
+        """
+        Set several quota limits at once.
+        Current limits are fetched with single query and only changed limits are saved.
+        """
+        current_limits = {
+            limit.name: limit
+            for limit in QuotaLimit.objects.filter(scope=self, name__in=limits.keys())
+        }
+        content_type = ct_models.ContentType.objects.get_for_model(self)
+        for name, value in limits.items():
+            limit = current_limits.get(name)
+            if limit is None:
+                QuotaLimit.objects.create(
+                    object_id=self.id,
+                    content_type=content_type,
+                    name=name,
+                    value=value,
+                )
+            elif limit.value != value:
+                limit.value = value
+                limit.save(update_fields=["value"])
+
     def get_quota_usage(self, quota_name):
-        qs = QuotaUsage.objects.filter(scope=self, name=quota_name)
+        # Quota field could be passed instead of quota name
+        quota_name = str(quota_name)
         return max(
             0,
-            qs.aggregate(sum=Sum("delta"))["sum"] or 0,
+            get_quota_usages(self, [quota_name]).get(quota_name, 0),
         )
 
     @transaction.atomic
@@ -132,20 +301,7 @@ class QuotaModelMixin(models.Model):
             ['ram quota limit: 1024, requires: 2048(instance#1)', ...]
 
         """
-        errors = []
-        for name, delta in quota_deltas.items():
-            if not delta:
-                continue
-            usage = self.get_quota_usage(name)
-            limit = self.get_quota_limit(name)
-            if limit == -1:
-                continue
-            if usage + delta > limit:
-                errors.append(f"{name} quota limit: {limit}, requires {usage + delta}")
-        if errors:
-            raise exceptions.QuotaValidationError(
-                _("One or more quotas were exceeded: %s") % ";".join(errors)
-            )
+        validate_quota_changes({self: quota_deltas})
 
     @classmethod
     def get_quotas_fields(cls, field_class=None) -> list[fields.QuotaField]:
@@ -159,21 +315,36 @@ class QuotaModelMixin(models.Model):
             return [v for v in cls._quota_fields if isinstance(v, field_class)]
         return cls._quota_fields
 
+    @classmethod
+    def prefetch_quotas(cls, instances):
+        """
+        Load quota usages and limits of several instances using two grouped queries.
+        Result is cached in instances, so that quota_usages, quota_limits and quotas
+        properties do not hit database. It is intended for list serializers.
+        """
+        instances = list(instances)
+        usages = get_scopes_quota_usages(instances)
+        limits = get_scopes_quota_limits(instances)
+        for instance in instances:
+            instance._prefetched_quota_usages = usages.get(instance, {})
+            instance._prefetched_quota_limits = limits.get(instance, {})
+        return instances
+
     @property
     def quota_usages(self):
-        return {
-            row["name"]: row["value"] or 0
-            for row in QuotaUsage.objects.filter(scope=self)
-            .values("name")
-            .annotate(value=Sum("delta"))
-        }
+        if hasattr(self, "_prefetched_quota_usages"):
+            return self._prefetched_quota_usages
+        return get_quota_usages(self)
 
     @property
     def quota_limits(self):
-        return {
-            row["name"]: row["value"] or -1
-            for row in QuotaLimit.objects.filter(scope=self).values("name", "value")
-        }
+        if hasattr(self, "_prefetched_quota_limits"):
+            limits = self._prefetched_quota_limits
+        else:
+            limits = dict(
+                QuotaLimit.objects.filter(scope=self).values_list("name", "value")
+            )
+        return {name: value or -1 for name, value in limits.items()}
 
     @property
     def quotas(self):
@@ -247,12 +418,12 @@ class SharedQuotaMixin:
         raise NotImplementedError()
 
     def apply_quota_changes(self, mult=1, validate=False):
-        scopes = self.get_quota_scopes()
-        deltas = self.get_quota_deltas()
-        for name, delta in deltas.items():
-            for scope in scopes:
-                if scope:
-                    scope.add_quota_usage(name, delta * mult, validate=validate)
+        scopes = [scope for scope in self.get_quota_scopes() if scope]
+        deltas = {name: delta * mult for name, delta in self.get_quota_deltas().items()}
+        if validate:
+            validate_quota_changes({scope: deltas for scope in scopes})
+        for scope in scopes:
+            scope.apply_quota_usage(deltas)
 
     def increase_backend_quotas_usage(self, validate=False):
         self.apply_quota_changes(validate=validate)
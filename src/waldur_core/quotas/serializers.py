@@ -0,0 +1,16 @@
+from django.db import models
+from rest_framework import serializers
+
+from waldur_core.quotas.models import QuotaModelMixin
+
+
+class QuotasListSerializer(serializers.ListSerializer):
+    """
+    Prefetch quotas of all serialized instances using two queries
+    instead of evaluating quota usages and limits for each instance separately.
+    """
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        instances = QuotaModelMixin.prefetch_quotas(iterable)
+        return super().to_representation(instances)
@@ -1,6 +1,6 @@
 from celery import shared_task
 
-from waldur_core.quotas import signals
+from waldur_core.quotas import signals, utils
 from waldur_core.quotas.utils import get_models_with_quotas
 
 
@@ -15,3 +15,8 @@ def update_standard_quotas():
         for field in model.get_quotas_fields():
             for instance in model.objects.all():
                 field.recalculate(scope=instance)
+
+
+@shared_task(name="waldur_core.quotas.compact_quota_usages")
+def compact_quota_usages():
+    utils.compact_quota_usages()
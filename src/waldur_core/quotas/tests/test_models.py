@@ -1,7 +1,8 @@
 from django.test import TestCase
 
 from waldur_core.quotas import exceptions
-from waldur_core.quotas.tests.models import GrandparentModel
+from waldur_core.quotas.models import validate_quota_changes
+from waldur_core.quotas.tests.models import GrandparentModel, ParentModel
 
 
 class QuotaModelMixinTest(TestCase):
@@ -38,3 +39,70 @@ class QuotaModelMixinTest(TestCase):
             delta=200,
             validate=True,
         )
+
+    def test_set_quota_limits(self):
+        instance = GrandparentModel.objects.create()
+        instance.set_quota_limit("regular_quota", 10)
+
+        instance.set_quota_limits({"regular_quota": 20, "quota_with_default_limit": 5})
+
+        self.assertEqual(instance.get_quota_limit("regular_quota"), 20)
+        self.assertEqual(instance.get_quota_limit("quota_with_default_limit"), 5)
+
+
+class ValidateQuotaChangesTest(TestCase):
+    def setUp(self):
+        self.grandparent = GrandparentModel.objects.create()
+        self.parent = ParentModel.objects.create(parent=self.grandparent)
+        self.grandparent.set_quota_limit("regular_quota", 10)
+        self.grandparent.add_quota_usage("regular_quota", 5)
+
+    def test_valid_changes_for_several_scopes(self):
+        validate_quota_changes(
+            {
+                self.grandparent: {"regular_quota": 5, "quota_with_default_limit": 100},
+                self.parent: {"counter_quota": 1000},
+            }
+        )
+
+    def test_default_limit_is_used_if_limit_is_not_set(self):
+        self.assertRaises(
+            exceptions.QuotaValidationError,
+            validate_quota_changes,
+            {self.grandparent: {"quota_with_default_limit": 101}},
+        )
+
+    def test_errors_are_reported_for_exceeded_quotas(self):
+        self.parent.set_quota_limit("counter_quota", 1)
+        with self.assertRaises(exceptions.QuotaValidationError) as cm:
+            validate_quota_changes(
+                {
+                    self.grandparent: {"regular_quota": 6},
+                    self.parent: {"counter_quota": 2},
+                }
+            )
+        self.assertIn("regular_quota quota limit: 10, requires 11", str(cm.exception))
+        self.assertIn("counter_quota quota limit: 1, requires 2", str(cm.exception))
+
+    def test_zero_deltas_are_skipped(self):
+        self.grandparent.set_quota_limit("regular_quota", 0)
+        validate_quota_changes({self.grandparent: {"regular_quota": 0}, None: {}})
+
+
+class PrefetchQuotasTest(TestCase):
+    def test_quotas_are_prefetched_for_several_instances(self):
+        first = GrandparentModel.objects.create()
+        second = GrandparentModel.objects.create()
+        first.set_quota_limit("regular_quota", 10)
+        first.add_quota_usage("regular_quota", 3)
+        second.add_quota_usage("regular_quota", 7)
+
+        instances = GrandparentModel.prefetch_quotas(
+            GrandparentModel.objects.filter(id__in=[first.id, second.id]).order_by("id")
+        )
+
+        with self.assertNumQueries(0):
+            self.assertEqual(instances[0].quota_usages, {"regular_quota": 3})
+            self.assertEqual(instances[0].quota_limits, {"regular_quota": 10})
+            self.assertEqual(instances[1].quota_usages, {"regular_quota": 7})
+            self.assertEqual(instances[1].quota_limits, {})
@@ -1,6 +1,8 @@
 from django.test import TestCase
 
-from waldur_core.quotas.tasks import update_standard_quotas
+from waldur_core.quotas.models import QuotaUsage, QuotaUsageCheckpoint
+from waldur_core.quotas.tasks import compact_quota_usages, update_standard_quotas
+from waldur_core.quotas.tests import models as test_models
 from waldur_core.structure.tests import factories as structure_factories
 
 
@@ -22,3 +24,48 @@ class RecalculateCommandTest(TestCase):
 
         update_standard_quotas()
         self.assertEqual(customer.get_quota_usage("nc_resource_count"), 0)
+
+
+class CompactQuotaUsagesTest(TestCase):
+    def test_usage_is_preserved_after_compaction(self):
+        customer = structure_factories.CustomerFactory()
+        customer.add_quota_usage("nc_project_count", 3)
+        customer.add_quota_usage("nc_project_count", -1)
+        customer.add_quota_usage("nc_user_count", 5)
+
+        compact_quota_usages()
+
+        self.assertFalse(QuotaUsage.objects.filter(scope=customer).exists())
+        self.assertEqual(QuotaUsageCheckpoint.objects.filter(scope=customer).count(), 2)
+        self.assertEqual(customer.get_quota_usage("nc_project_count"), 2)
+        self.assertEqual(customer.quota_usages["nc_user_count"], 5)
+
+    def test_new_deltas_are_added_to_checkpoint(self):
+        customer = structure_factories.CustomerFactory()
+        customer.add_quota_usage("nc_user_count", 5)
+        compact_quota_usages()
+
+        customer.add_quota_usage("nc_user_count", 2)
+        self.assertEqual(customer.get_quota_usage("nc_user_count"), 7)
+
+        compact_quota_usages()
+        self.assertEqual(customer.get_quota_usage("nc_user_count"), 7)
+        self.assertEqual(
+            QuotaUsageCheckpoint.objects.get(
+                scope=customer, name="nc_user_count"
+            ).value,
+            7,
+        )
+
+    def test_aggregator_quota_is_not_changed_by_compaction(self):
+        grandparent = test_models.GrandparentModel.objects.create()
+        parent = test_models.ParentModel.objects.create(parent=grandparent)
+        child = test_models.ChildModel.objects.create(parent=parent)
+        child.add_quota_usage("usage_aggregator_quota", 3)
+        self.assertEqual(parent.get_quota_usage("usage_aggregator_quota"), 3)
+
+        compact_quota_usages()
+
+        self.assertEqual(child.get_quota_usage("usage_aggregator_quota"), 3)
+        self.assertEqual(parent.get_quota_usage("usage_aggregator_quota"), 3)
+        self.assertEqual(grandparent.get_quota_usage("usage_aggregator_quota"), 3)
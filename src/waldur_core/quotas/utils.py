@@ -1,7 +1,57 @@
 from django.apps import apps
+from django.db import connection, transaction
 
 from waldur_core.quotas import models
 
 
 def get_models_with_quotas():
     return [m for m in apps.get_models() if issubclass(m, models.QuotaModelMixin)]
+
+
+COMPACT_QUOTA_USAGES_QUERY = """
+WITH folded AS (
+    DELETE FROM {usage_table}
+    WHERE id IN (
+        SELECT id FROM {usage_table}
+        WHERE id <= %s
+            AND content_type_id IS NOT NULL
+            AND object_id IS NOT NULL
+        ORDER BY id
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING content_type_id, object_id, name, delta
+)
+INSERT INTO {checkpoint_table} (content_type_id, object_id, name, value)
+SELECT content_type_id, object_id, name, SUM(delta)
+FROM folded
+GROUP BY content_type_id, object_id, name
+ON CONFLICT (name, content_type_id, object_id)
+DO UPDATE SET value = {checkpoint_table}.value + EXCLUDED.value
+"""
+
+
+def compact_quota_usages(batch_size=10000):
+    """
+    Fold quota usage deltas into checkpoints.
+
+    Only deltas which exist when compaction starts are processed,
+    new deltas are inserted concurrently without any locking.
+    Rows are deleted with raw SQL, so that aggregator quota handlers
+    connected to QuotaUsage deletion are not triggered.
+    """
+    last_id = (
+        models.QuotaUsage.objects.order_by("-id").values_list("id", flat=True).first()
+    )
+    if last_id is None:
+        return
+
+    query = COMPACT_QUOTA_USAGES_QUERY.format(
+        usage_table=models.QuotaUsage._meta.db_table,
+        checkpoint_table=models.QuotaUsageCheckpoint._meta.db_table,
+    )
+    while True:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(query, [last_id, batch_size])
+            if cursor.rowcount == 0:
+                break
@@ -280,6 +280,11 @@ CELERY_BEAT_SCHEDULE = {
         "schedule": timedelta(hours=24),
         "args": (),
     },
+    "compact-quota-usages": {
+        "task": "waldur_core.quotas.compact_quota_usages",
+        "schedule": timedelta(hours=6),
+        "args": (),
+    },
 }
 
 globals().update(WaldurConfiguration().dict())
@@ -1,13 +1,18 @@
 from typing import TypeVar
 
 from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import FieldDoesNotExist
 from django.db import models
 from django.db.models import QuerySet
 
 from waldur_core.core import utils as core_utils
 from waldur_core.core.managers import GenericKeyMixin
 from waldur_core.permissions.models import Role
-from waldur_core.permissions.utils import get_scope_ids, get_user_ids
+from waldur_core.permissions.utils import (
+    get_permissions_cache,
+    get_scope_ids,
+    get_user_ids,
+)
 from waldur_core.structure import models as structure_models
 
 
@@ -17,6 +22,24 @@ def build_filter(path, ids):
     return models.Q(**{f"{path}__in": ids})
 
 
+def is_multivalued_path(model, path):
+    """
+    Check whether filtering by path may produce duplicate rows,
+    ie path traverses reverse or many-to-many relation.
+    """
+    if path == "self":
+        return False
+    for part in path.split("__"):
+        try:
+            field = model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return True
+        if field.many_to_many or field.one_to_many or not field.related_model:
+            return True
+        model = field.related_model
+    return False
+
+
 T = TypeVar("T")
 
 
@@ -34,11 +57,21 @@ def filter_queryset_for_user(queryset: QuerySet[T], user) -> QuerySet[T]:
     customer_path = getattr(permissions, "customer_path", None)
     project_path = getattr(permissions, "project_path", None)
 
+    # Visible customers and projects are resolved from user roles cache,
+    # which is invalidated when user roles are changed,
+    # so that list filtering does not need to evaluate subqueries.
+    if customer_path or project_path:
+        permissions_cache = get_permissions_cache(user)
+
     if customer_path:
-        subquery |= build_filter(customer_path, get_connected_customers(user))
+        subquery |= build_filter(
+            customer_path, permissions_cache.get_scope_ids(structure_models.Customer)
+        )
 
     if project_path:
-        subquery |= build_filter(project_path, get_connected_projects(user))
+        subquery |= build_filter(
+            project_path, permissions_cache.get_scope_ids(structure_models.Project)
+        )
 
     build_query = getattr(permissions, "build_query", None)
     if build_query:
@@ -47,7 +80,13 @@ def filter_queryset_for_user(queryset: QuerySet[T], user) -> QuerySet[T]:
     if not subquery:
         return queryset
 
-    return queryset.filter(subquery).distinct()
+    queryset = queryset.filter(subquery)
+
+    paths = [path for path in (customer_path, project_path) if path]
+    if build_query or any(is_multivalued_path(queryset.model, path) for path in paths):
+        queryset = queryset.distinct()
+
+    return queryset
 
 
 def filter_queryset_by_user_ip(queryset, request):
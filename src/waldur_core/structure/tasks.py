@@ -1,8 +1,10 @@
+import collections
 import functools
 import logging
 from datetime import timedelta
 
-from celery import shared_task
+from celery import chain, current_app, shared_task
+from django.core.exceptions import ObjectDoesNotExist
 from django.db.models import Q
 from django.db.utils import DatabaseError
 from django.utils import timezone
@@ -49,11 +51,6 @@ class BackgroundPullTask(core_tasks.BackgroundTask):
         else:
             self.on_pull_success(instance)
 
-    def is_equal(self, other_task, serialized_instance):
-        return self.name == other_task.get(
-            "name"
-        ) and serialized_instance in other_task.get("args", [])
-
     def pull(self, instance):
         """Pull instance from backend.
 
@@ -94,13 +91,20 @@ class BackgroundPullTask(core_tasks.BackgroundTask):
 
 
 class BackgroundListPullTask(core_tasks.BackgroundTask):
-    """Schedules pull task for each stable object of the model."""
+    """Schedules pull task for each stable object of the model.
+
+    If "chunk_size" is defined, objects are grouped by backend and split into chunks,
+    each chunk is pulled sequentially by single task. Chunks of the same backend
+    are chained into "max_concurrency" lanes, so that backend does not process
+    more than "max_concurrency" chunks simultaneously. Chunks of each lane are
+    spread evenly over "schedule_period" seconds, it should not exceed beat interval.
+    """
 
     model = NotImplemented
     pull_task = NotImplemented
-
-    def is_equal(self, other_task):
-        return self.name == other_task.get("name")
+    chunk_size = None
+    max_concurrency = 1
+    schedule_period = 0
 
     def get_pulled_objects(self):
         States = self.model.States
@@ -108,10 +112,64 @@ class BackgroundListPullTask(core_tasks.BackgroundTask):
             backend_id=""
         )
 
+    def get_backend_key(self, instance):
+        return getattr(instance, "service_settings_id", None)
+
     def run(self):
+        if not self.chunk_size:
+            for instance in self.get_pulled_objects():
+                serialized = core_utils.serialize_instance(instance)
+                self.pull_task().apply_async(args=(serialized,), kwargs={})
+            return
+
+        backends = collections.defaultdict(list)
         for instance in self.get_pulled_objects():
-            serialized = core_utils.serialize_instance(instance)
-            self.pull_task().apply_async(args=(serialized,), kwargs={})
+            backends[self.get_backend_key(instance)].append(
+                core_utils.serialize_instance(instance)
+            )
+
+        start = timezone.now()
+        for serialized_instances in backends.values():
+            chunks = [
+                serialized_instances[index : index + self.chunk_size]
+                for index in range(0, len(serialized_instances), self.chunk_size)
+            ]
+            lanes = [
+                chunks[index :: self.max_concurrency]
+                for index in range(min(self.max_concurrency, len(chunks)))
+            ]
+            for lane in lanes:
+                step = timedelta(seconds=self.schedule_period / len(lane))
+                chain(
+                    *[
+                        pull_chunk.si(self.pull_task.name, chunk).set(
+                            eta=start + index * step
+                        )
+                        for index, chunk in enumerate(lane)
+                    ]
+                ).apply_async()
+
+
+@shared_task(name="waldur_core.structure.pull_chunk")
+def pull_chunk(task_name, serialized_instances):
+    """Pull objects sequentially using background pull task with the given name.
+
+    Objects that are already being pulled by another task are skipped.
+    """
+    task = current_app.tasks[task_name]
+    for serialized_instance in serialized_instances:
+        if not task.acquire_lease(serialized_instance):
+            continue
+        try:
+            task.run(serialized_instance)
+        except ObjectDoesNotExist:
+            logger.info(
+                "Skipping pull of %s because it has been deleted.", serialized_instance
+            )
+        except Exception as e:
+            logger.exception("Unable to pull %s. Error: %s", serialized_instance, e)
+        finally:
+            task.release_lease(serialized_instance)
 
 
 class ServiceListPullTask(BackgroundListPullTask):
@@ -211,9 +269,6 @@ class SetErredStuckResources(core_tasks.BackgroundTask):
 
     name = "waldur_core.structure.SetErredStuckResources"
 
-    def is_equal(self, other_task):
-        return self.name == other_task.get("name")
-
     def run(self):
         cutoff = timezone.now() - timedelta(hours=3)
         states = (
@@ -1,9 +1,15 @@
 from datetime import datetime, timedelta
 
+from django.test import TestCase
 from rest_framework.test import APITransactionTestCase
 
 from waldur_core.core.tests.helpers import override_waldur_core_settings
-from waldur_core.structure.tests import factories
+from waldur_core.structure import models
+from waldur_core.structure.managers import (
+    filter_queryset_for_user,
+    is_multivalued_path,
+)
+from waldur_core.structure.tests import factories, fixtures
 from waldur_core.structure.tests.factories import ProjectFactory, UserFactory
 
 
@@ -43,3 +49,26 @@ class CustomerAccountingStartDateFilterTest(APITransactionTestCase):
             },
         )
         self.assertEqual(len(response.data), 1)
+
+
+class FilterQuerysetForUserTest(TestCase):
+    def setUp(self):
+        self.fixture = fixtures.ProjectFixture()
+
+    def test_projects_are_filtered_without_distinct(self):
+        queryset = filter_queryset_for_user(
+            models.Project.objects.all(), self.fixture.admin
+        )
+        self.assertFalse(queryset.query.distinct)
+        self.assertEqual(list(queryset), [self.fixture.project])
+
+    def test_visible_projects_are_updated_when_role_is_revoked(self):
+        user = self.fixture.admin
+        self.fixture.project.remove_user(user)
+        queryset = filter_queryset_for_user(models.Project.objects.all(), user)
+        self.assertEqual(list(queryset), [])
+
+    def test_multivalued_path_is_detected(self):
+        self.assertFalse(is_multivalued_path(models.Project, "customer"))
+        self.assertFalse(is_multivalued_path(models.Customer, "self"))
+        self.assertTrue(is_multivalued_path(models.Customer, "projects"))
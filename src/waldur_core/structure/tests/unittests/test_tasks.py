@@ -2,7 +2,7 @@ from datetime import timedelta
 from unittest import mock
 
 from ddt import data, ddt
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.utils import timezone
 from freezegun import freeze_time
 
@@ -89,3 +89,52 @@ class ExceptionTest(TestCase):
         task = tasks.ServiceResourcesPullTask()
         error_message = f"'test error', Service settings: {service_settings.name}, {service_settings.type}"
         self.assertRaisesRegex(KeyError, error_message, task.pull, service_settings)
+
+
+class TestInstancePullTask(tasks.BackgroundPullTask):
+    pulled = []
+
+    def pull(self, instance):
+        self.pulled.append(instance.pk)
+
+
+class TestInstanceListPullTask(tasks.BackgroundListPullTask):
+    model = models.TestNewInstance
+    pull_task = TestInstancePullTask
+    chunk_size = 2
+    max_concurrency = 2
+    schedule_period = 60
+
+
+class ChunkedListPullTaskTest(TestCase):
+    def setUp(self):
+        self.service_settings = factories.ServiceSettingsFactory()
+        self.instances = factories.TestNewInstanceFactory.create_batch(
+            size=5,
+            state=models.TestNewInstance.States.OK,
+            service_settings=self.service_settings,
+            backend_id="backend_id",
+        )
+        TestInstancePullTask.pulled = []
+
+    @mock.patch("waldur_core.structure.tasks.chain")
+    def test_chunks_of_the_same_backend_are_chained_into_lanes(self, mocked_chain):
+        TestInstanceListPullTask().run()
+
+        self.assertEqual(mocked_chain.call_count, 2)
+        lanes = [call.args for call in mocked_chain.call_args_list]
+        self.assertEqual([len(lane) for lane in lanes], [2, 1])
+        first, second = lanes[0]
+        self.assertEqual(len(first.args[1]), 2)
+        self.assertEqual(
+            (second.options["eta"] - first.options["eta"]).total_seconds(), 30
+        )
+
+    @override_settings(task_always_eager=True)
+    def test_all_instances_are_pulled(self):
+        TestInstanceListPullTask().run()
+
+        self.assertEqual(
+            sorted(TestInstancePullTask.pulled),
+            sorted(instance.pk for instance in self.instances),
+        )
@@ -1,23 +1,59 @@
 from celery import shared_task
 from django.conf import settings as django_settings
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Q
 from django.utils import timezone
 
+from waldur_core.quotas import models as quotas_models
 from waldur_core.structure import models as structure_models
 
 from . import models
 
+BATCH_SIZE = 1000
+
+
+def get_quota_usages(scope_models):
+    """
+    Return dictionary where key is tuple of content type ID, object ID and quota name
+    and value is quota usage. Usages of all scopes are read by single query.
+    """
+    query = Q()
+    for model in scope_models:
+        content_type = ContentType.objects.get_for_model(model)
+        query |= Q(
+            content_type=content_type,
+            object_id__in=model.objects.values("id"),
+        )
+    return quotas_models.get_quota_usages_map(query)
+
 
 @shared_task(name="analytics.sync_daily_quotas")
 def sync_daily_quotas():
     date = timezone.now().date()
-    for model in (structure_models.Project, structure_models.Customer):
-        for scope in model.objects.all():
-            for name, value in scope.quota_usages.items():
-                models.DailyQuotaHistory.objects.update_or_create_quota(
-                    scope, name, date, value
-                )
+    usages = get_quota_usages((structure_models.Project, structure_models.Customer))
+    models.DailyQuotaHistory.objects.bulk_create(
+        [
+            models.DailyQuotaHistory(
+                content_type_id=content_type_id,
+                object_id=object_id,
+                name=name,
+                date=date,
+                usage=usage,
+            )
+            for (content_type_id, object_id, name), usage in usages.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["content_type", "object_id", "name", "date"],
+        update_fields=["usage"],
+        batch_size=BATCH_SIZE,
+    )
 
     expiration_date = (
         timezone.now() - django_settings.WALDUR_ANALYTICS["DAILY_QUOTA_LIFETIME"]
     )
-    models.DailyQuotaHistory.objects.filter(date__lt=expiration_date).delete()
+    expired = models.DailyQuotaHistory.objects.filter(date__lt=expiration_date)
+    while True:
+        ids = list(expired.values_list("id", flat=True)[:BATCH_SIZE])
+        if not ids:
+            break
+        models.DailyQuotaHistory.objects.filter(id__in=ids).delete()
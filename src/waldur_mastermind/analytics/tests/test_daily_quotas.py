@@ -3,6 +3,7 @@ from django.utils import timezone
 from rest_framework import status, test
 from rest_framework.reverse import reverse
 
+from waldur_core.quotas.utils import compact_quota_usages
 from waldur_core.structure.tests import factories as structure_factories
 from waldur_core.structure.tests import fixtures as structure_fixtures
 from waldur_mastermind.analytics import models, tasks
@@ -68,6 +69,40 @@ class TestDailyQuotasTask(test.APITransactionTestCase):
         ).usage
         self.assertEqual(30, actual)
 
+    def test_compacted_quota_usages_are_synced(self):
+        self.project.set_quota_usage("nc_user_count", 30)
+        compact_quota_usages()
+        self.project.add_quota_usage("nc_user_count", 5)
+        tasks.sync_daily_quotas()
+        actual = models.DailyQuotaHistory.objects.get(
+            scope=self.project, name="nc_user_count", date=timezone.now().date()
+        ).usage
+        self.assertEqual(35, actual)
+
+    def test_existing_snapshot_is_updated(self):
+        self.project.set_quota_usage("nc_user_count", 30)
+        tasks.sync_daily_quotas()
+        self.project.set_quota_usage("nc_user_count", 40)
+        tasks.sync_daily_quotas()
+        actual = models.DailyQuotaHistory.objects.get(
+            scope=self.project, name="nc_user_count", date=timezone.now().date()
+        ).usage
+        self.assertEqual(40, actual)
+
+    def test_expired_quotas_are_deleted(self):
+        models.DailyQuotaHistory.objects.create(
+            scope=self.project,
+            name="nc_user_count",
+            date=parse_date("2018-10-01"),
+            usage=10,
+        )
+        tasks.sync_daily_quotas()
+        self.assertFalse(
+            models.DailyQuotaHistory.objects.filter(
+                date=parse_date("2018-10-01")
+            ).exists()
+        )
+
 
 class TestDailyQuotasSignalHandler(testcases.TestCase):
     def setUp(self):
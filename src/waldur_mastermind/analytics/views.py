@@ -9,7 +9,7 @@ from rest_framework import permissions, status, viewsets
 from rest_framework.response import Response
 
 from waldur_core.core.utils import SubquerySum, get_ordering
-from waldur_core.quotas.models import QuotaUsage
+from waldur_core.quotas.models import QuotaUsage, QuotaUsageCheckpoint
 from waldur_core.structure.models import Customer, Project
 from waldur_core.structure.permissions import IsStaffOrSupportUser
 from waldur_mastermind.billing.models import PriceEstimate
@@ -112,7 +112,14 @@ class BaseQuotasViewSet(viewsets.GenericViewSet):
             content_type=self.get_content_type(),
             name=quota_name,
         )
-        value = Coalesce(SubquerySum(quotas, "delta"), Value(0))
+        checkpoints = QuotaUsageCheckpoint.objects.filter(
+            object_id=OuterRef("pk"),
+            content_type=self.get_content_type(),
+            name=quota_name,
+        )
+        value = Coalesce(SubquerySum(quotas, "delta"), Value(0)) + Coalesce(
+            SubquerySum(checkpoints, "value"), Value(0)
+        )
         return self.get_queryset().annotate(value=value)
 
     def annotate_estimated_price(self):
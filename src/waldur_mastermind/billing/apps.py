@@ -11,6 +11,7 @@ class BillingConfig(AppConfig):
         from waldur_core.structure import serializers as structure_serializers
         from waldur_mastermind.billing.serializers import add_price_estimate
         from waldur_mastermind.invoices import models as invoices_models
+        from waldur_mastermind.invoices import signals as invoices_signals
         from waldur_mastermind.policy import serializers as policy_serializers
 
         from . import handlers, models
@@ -44,6 +45,12 @@ class BillingConfig(AppConfig):
             dispatch_uid="waldur_mastermind.billing.process_invoice_item",
         )
 
+        invoices_signals.invoice_items_updated.connect(
+            handlers.process_invoice_items,
+            sender=invoices_models.InvoiceItem,
+            dispatch_uid="waldur_mastermind.billing.process_invoice_items",
+        )
+
         core_signals.pre_serializer_fields.connect(
             sender=structure_serializers.ProjectSerializer,
             receiver=add_price_estimate,
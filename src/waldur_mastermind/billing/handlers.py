@@ -2,6 +2,8 @@ import logging
 
 from django.db import transaction
 
+from waldur_core.structure import models as structure_models
+
 from . import models
 
 logger = logging.getLogger(__name__)
@@ -47,3 +49,16 @@ def process_invoice_item(sender, instance, created=False, **kwargs):
             estimate, _ = models.PriceEstimate.objects.get_or_create(scope=scope)
             estimate.update_total()
             estimate.save(update_fields=["total"])
+
+
+def process_invoice_items(sender, invoice_items, **kwargs):
+    project_ids = {item.project_id for item in invoice_items if item.project_id}
+    projects = structure_models.Project.objects.filter(
+        id__in=project_ids
+    ).select_related("customer")
+    scopes = set(projects) | {project.customer for project in projects}
+    with transaction.atomic():
+        for scope in scopes:
+            estimate, _ = models.PriceEstimate.objects.get_or_create(scope=scope)
+            estimate.update_total()
+            estimate.save(update_fields=["total"])
@@ -37,15 +37,27 @@ class InvoiceConfig(AppConfig):
         )
 
         signals.post_save.connect(
-            handlers.update_cache_when_invoice_item_is_updated,
+            handlers.update_invoice_when_invoice_item_is_saved,
             sender=models.InvoiceItem,
-            dispatch_uid="waldur_mastermind.invoices.update_cache_when_invoice_item_is_updated_%s",
+            dispatch_uid="waldur_mastermind.invoices.update_invoice_when_invoice_item_is_saved",
         )
 
         signals.post_delete.connect(
-            handlers.update_cache_when_invoice_item_is_deleted,
+            handlers.update_invoice_when_invoice_item_is_deleted,
             sender=models.InvoiceItem,
-            dispatch_uid="waldur_mastermind.invoices.update_cache_when_invoice_item_is_deleted",
+            dispatch_uid="waldur_mastermind.invoices.update_invoice_when_invoice_item_is_deleted",
+        )
+
+        signals.post_save.connect(
+            handlers.update_invoice_costs_when_invoice_item_is_saved,
+            sender=models.InvoiceItem,
+            dispatch_uid="waldur_mastermind.invoices.update_invoice_costs_when_invoice_item_is_saved",
+        )
+
+        signals.post_delete.connect(
+            handlers.update_invoice_costs_when_invoice_item_is_deleted,
+            sender=models.InvoiceItem,
+            dispatch_uid="waldur_mastermind.invoices.update_invoice_costs_when_invoice_item_is_deleted",
         )
 
         signals.post_save.connect(
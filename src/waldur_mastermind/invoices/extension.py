@@ -31,6 +31,8 @@ class InvoicesExtension(WaldurExtension):
                     "delimiter": ";",
                 },
                 "USE_SAF": False,
+                # Attach report compressed with gzip
+                "USE_GZIP": False,
                 "SERIALIZER_EXTRA_KWARGS": {
                     "start": {
                         "format": "%d.%m.%Y",
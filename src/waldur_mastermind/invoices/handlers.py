@@ -1,15 +1,16 @@
 import datetime
+import decimal
 import logging
 
 from django.conf import settings
-from django.core.exceptions import ObjectDoesNotExist
-from django.db import transaction
+from django.db import connection, transaction
 from django.db.models import Q
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from rest_framework.exceptions import ValidationError
 
 from waldur_core.core import utils as core_utils
+from waldur_mastermind.common.utils import quantize_price
 from waldur_mastermind.invoices import signals as cost_signals
 from waldur_mastermind.marketplace import models as marketplace_models
 
@@ -117,28 +118,133 @@ def prevent_deletion_of_customer_with_invoice(sender, instance, user, **kwargs):
             )
 
 
-def update_cache_when_invoice_item_is_updated(
-    sender, instance, created=False, **kwargs
+def get_stored_price(unit_price, quantity):
+    """Return price of invoice item as it is computed from values stored in database."""
+
+    def get_stored_value(field_name, value):
+        field = models.InvoiceItem._meta.get_field(field_name)
+        return decimal.Decimal(field.get_db_prep_save(value, connection))
+
+    return quantize_price(
+        get_stored_value("unit_price", unit_price)
+        * get_stored_value("quantity", quantity)
+    )
+
+
+def update_invoice_when_invoice_item_is_saved(
+    sender, instance, created=False, update_fields=None, **kwargs
 ):
     invoice_item = instance
-    if created or set(invoice_item.tracker.changed()) & {
-        "start",
-        "end",
+    price_fields = {"invoice", "invoice_id", "quantity", "unit_price"}
+    invoices = models.Invoice.objects
+
+    if created:
+        price = get_stored_price(invoice_item.unit_price, invoice_item.quantity)
+        invoices.filter(pk=invoice_item.invoice_id).apply_price_delta(price)
+        return
+
+    if update_fields is not None and not price_fields & set(update_fields):
+        return
+
+    tracker = invoice_item.tracker
+    if not price_fields & set(tracker.changed()):
+        return
+
+    if tracker.previous("invoice_id") is None:
+        # Item is saved again before its creation has been tracked
+        invoices.filter(pk=invoice_item.invoice_id).update_totals()
+        return
+
+    price = get_stored_price(invoice_item.unit_price, invoice_item.quantity)
+    previous_price = get_stored_price(
+        tracker.previous("unit_price"), tracker.previous("quantity")
+    )
+    previous_invoice_id = tracker.previous("invoice_id")
+    if previous_invoice_id == invoice_item.invoice_id:
+        invoices.filter(pk=invoice_item.invoice_id).apply_price_delta(
+            price - previous_price
+        )
+    else:
+        invoices.filter(pk=previous_invoice_id).apply_price_delta(-previous_price)
+        invoices.filter(pk=invoice_item.invoice_id).apply_price_delta(price)
+
+
+def update_invoice_when_invoice_item_is_deleted(sender, instance, **kwargs):
+    tracker = instance.tracker
+    price = get_stored_price(
+        tracker.previous("unit_price"), tracker.previous("quantity")
+    )
+    # Invoice may be already removed, then nothing is updated
+    models.Invoice.objects.filter(pk=tracker.previous("invoice_id")).apply_price_delta(
+        -price
+    )
+
+
+class InvoiceCostsRefresh:
+    """Refresh costs of invoices collected within transaction when it is committed."""
+
+    def __init__(self):
+        self.invoice_ids = set()
+
+    def __call__(self):
+        models.InvoiceCost.objects.refresh(self.invoice_ids)
+
+
+def refresh_invoice_costs(invoice_ids):
+    """
+    Refresh costs of invoices when current transaction is committed.
+    Invoices changed several times within transaction are refreshed once.
+    """
+    invoice_ids = {invoice_id for invoice_id in invoice_ids if invoice_id}
+    if not invoice_ids:
+        return
+
+    if not connection.in_atomic_block:
+        models.InvoiceCost.objects.refresh(invoice_ids)
+        return
+
+    pending_refresh = getattr(connection, "pending_invoice_costs_refresh", None)
+    # Callback is discarded if savepoint it has been registered in is rolled back
+    if pending_refresh is None or not any(
+        callback is pending_refresh for _, callback, *_ in connection.run_on_commit
+    ):
+        pending_refresh = InvoiceCostsRefresh()
+        connection.pending_invoice_costs_refresh = pending_refresh
+        transaction.on_commit(pending_refresh)
+    pending_refresh.invoice_ids.update(invoice_ids)
+
+
+def update_invoice_costs_when_invoice_item_is_saved(
+    sender, instance, created=False, update_fields=None, **kwargs
+):
+    cost_fields = {
+        "invoice",
+        "invoice_id",
         "quantity",
         "unit_price",
-    }:
-        transaction.on_commit(lambda: invoice_item.invoice.update_cache())
+        "project",
+        "project_id",
+        "resource",
+        "resource_id",
+        "details",
+    }
+    if created:
+        refresh_invoice_costs([instance.invoice_id])
+        return
 
+    if update_fields is not None and not cost_fields & set(update_fields):
+        return
+
+    if not cost_fields & set(instance.tracker.changed()):
+        return
+
+    refresh_invoice_costs(
+        [instance.invoice_id, instance.tracker.previous("invoice_id")]
+    )
 
-def update_cache_when_invoice_item_is_deleted(sender, instance, **kwargs):
-    def update_invoice():
-        try:
-            instance.invoice.update_cache()
-        except ObjectDoesNotExist:
-            # It is okay to skip cache invalidation if invoice has been already removed
-            pass
 
-    transaction.on_commit(update_invoice)
+def update_invoice_costs_when_invoice_item_is_deleted(sender, instance, **kwargs):
+    refresh_invoice_costs([instance.tracker.previous("invoice_id")])
 
 
 def projects_customer_has_been_changed(
@@ -165,6 +271,10 @@ def projects_customer_has_been_changed(
         invoice.items.filter(project=project).delete()
     else:
         invoice.items.filter(project=project).update(invoice=new_invoice)
+        models.Invoice.objects.filter(
+            pk__in=[invoice.pk, new_invoice.pk]
+        ).update_totals()
+        refresh_invoice_costs([invoice.pk, new_invoice.pk])
 
 
 def create_recurring_usage_if_invoice_has_been_created(
@@ -0,0 +1,208 @@
+import decimal
+
+from django.db import models as django_models
+from django.db import transaction
+from django.db.models import (
+    Case,
+    DateTimeField,
+    DecimalField,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    IntegerField,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.fields.json import KT
+from django.db.models.functions import (
+    Abs,
+    Cast,
+    Ceil,
+    Coalesce,
+    Extract,
+    Least,
+    Round,
+    Sign,
+)
+from django.utils import timezone
+
+from waldur_mastermind.common.mixins import UnitPriceMixin
+
+Units = UnitPriceMixin.Units
+
+
+def get_price_expression(current=False):
+    """
+    Database expression reproducing InvoiceItem._price.
+    Price is rounded up to 2 places after the decimal point the same way as quantize_price does.
+    """
+    quantity = F("quantity")
+    if current:
+        duration = ExpressionWrapper(
+            Least(F("end"), Value(timezone.now(), output_field=DateTimeField()))
+            - F("start"),
+            output_field=DurationField(),
+        )
+        seconds = Extract(duration, "epoch")
+        quantity = Case(
+            When(
+                unit=Units.PER_HOUR,
+                then=Cast(Ceil(seconds / 3600), output_field=IntegerField()),
+            ),
+            When(
+                unit=Units.PER_DAY,
+                then=Cast(Ceil(seconds / 86400), output_field=IntegerField()),
+            ),
+            default=F("quantity"),
+            output_field=DecimalField(),
+        )
+    price = ExpressionWrapper(F("unit_price") * quantity, output_field=DecimalField())
+    return ExpressionWrapper(
+        Sign(price) * Ceil(Abs(price) * 100) / 100, output_field=DecimalField()
+    )
+
+
+class InvoiceItemQuerySet(django_models.QuerySet):
+    def get_price(self, current=False):
+        return self.aggregate(
+            price=Coalesce(
+                Sum(get_price_expression(current)),
+                Value(decimal.Decimal(0)),
+                output_field=DecimalField(),
+            )
+        )["price"]
+
+
+class InvoiceItemManager(django_models.Manager):
+    def get_queryset(self):
+        return InvoiceItemQuerySet(self.model, using=self._db)
+
+
+def get_total_cost_expression(price):
+    return price + price * F("tax_percent") / 100
+
+
+class InvoiceQuerySet(django_models.QuerySet):
+    def _get_price_subquery(self):
+        InvoiceItem = self.model.items.field.model
+        return Coalesce(
+            Subquery(
+                InvoiceItem.objects.filter(invoice=OuterRef("pk"))
+                .order_by()
+                .values("invoice")
+                .annotate(price=Sum(get_price_expression()))
+                .values("price")
+            ),
+            Value(decimal.Decimal(0)),
+            output_field=DecimalField(),
+        )
+
+    def update_totals(self):
+        """Update cached total price and cost of invoices using single UPDATE statement."""
+        price = self._get_price_subquery()
+        return self.update(
+            total_price=price,
+            total_cost=get_total_cost_expression(price),
+        )
+
+    def apply_price_delta(self, delta):
+        """Shift cached total price and cost of invoices by price delta of their items."""
+        price = F("total_price") + delta
+        return self.update(
+            total_price=price,
+            total_cost=get_total_cost_expression(price),
+        )
+
+    def filter_drifted(self):
+        """Return invoices which cached totals are different from actual ones."""
+        price = self._get_price_subquery()
+        return self.alias(
+            actual_price=price,
+            actual_cost=Round(get_total_cost_expression(price), 2),
+        ).filter(~Q(total_price=F("actual_price")) | ~Q(total_cost=F("actual_cost")))
+
+
+class InvoiceManager(django_models.Manager):
+    def get_queryset(self):
+        return InvoiceQuerySet(self.model, using=self._db)
+
+
+class InvoiceCostQuerySet(django_models.QuerySet):
+    def filter_period(self, start, end=None):
+        """Filter costs by month range, start and end are dates."""
+        queryset = self.filter(
+            Q(year__gt=start.year) | Q(year=start.year, month__gte=start.month)
+        )
+        if end:
+            queryset = queryset.filter(
+                Q(year__lt=end.year) | Q(year=end.year, month__lte=end.month)
+            )
+        return queryset
+
+
+class InvoiceCostManager(django_models.Manager):
+    def get_queryset(self):
+        return InvoiceCostQuerySet(self.model, using=self._db)
+
+    @transaction.atomic
+    def refresh(self, invoice_ids):
+        """Recompute costs of invoices from their items."""
+        # Models are resolved via relations to avoid circular import
+        Invoice = self.model._meta.get_field("invoice").related_model
+        InvoiceItem = Invoice._meta.get_field("items").related_model
+
+        # Invoices are locked in stable order so that concurrent refreshes
+        # of the same invoices are serialized and do not create duplicates
+        invoice_ids = list(
+            Invoice.objects.select_for_update()
+            .filter(id__in=invoice_ids)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        self.filter(invoice_id__in=invoice_ids).delete()
+        rows = (
+            InvoiceItem.objects.filter(invoice_id__in=invoice_ids)
+            .annotate(
+                component_type=Coalesce(
+                    KT("details__offering_component_type"),
+                    Value(""),
+                    output_field=django_models.CharField(),
+                )
+            )
+            .values(
+                "invoice_id",
+                "invoice__year",
+                "invoice__month",
+                "invoice__customer_id",
+                "project_id",
+                "resource__offering_id",
+                "resource__offering__customer_id",
+                "resource__offering__category_id",
+                "component_type",
+            )
+            .annotate(price=Sum(get_price_expression()), quantity=Sum("quantity"))
+            .order_by()
+        )
+        self.bulk_create(
+            [
+                self.model(
+                    invoice_id=row["invoice_id"],
+                    year=row["invoice__year"],
+                    month=row["invoice__month"],
+                    customer_id=row["invoice__customer_id"],
+                    project_id=row["project_id"],
+                    offering_id=row["resource__offering_id"],
+                    provider_id=row["resource__offering__customer_id"],
+                    category_id=row["resource__offering__category_id"],
+                    component_type=row["component_type"],
+                    price=row["price"],
+                    quantity=row["quantity"],
+                )
+                for row in rows
+            ],
+            batch_size=1000,
+        )
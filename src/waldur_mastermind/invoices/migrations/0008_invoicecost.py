@@ -0,0 +1,188 @@
+# Generated by Django 4.2.16 on 2026-10-17 10:44
+
+import django.db.models.deletion
+import django.db.models.functions.comparison
+from django.db import migrations, models
+from django.db.models import DecimalField, ExpressionWrapper, F, Sum, Value
+from django.db.models.fields.json import KT
+from django.db.models.functions import Abs, Ceil, Coalesce, Sign
+
+
+def fill_invoice_costs(apps, schema_editor):
+    Invoice = apps.get_model("invoices", "Invoice")
+    InvoiceItem = apps.get_model("invoices", "InvoiceItem")
+    InvoiceCost = apps.get_model("invoices", "InvoiceCost")
+
+    # Price of item is rounded up to 2 places after the decimal point
+    price = ExpressionWrapper(
+        F("unit_price") * F("quantity"), output_field=DecimalField()
+    )
+    price = ExpressionWrapper(
+        Sign(price) * Ceil(Abs(price) * 100) / 100, output_field=DecimalField()
+    )
+
+    invoice_ids = list(Invoice.objects.values_list("id", flat=True))
+    for index in range(0, len(invoice_ids), 500):
+        rows = (
+            InvoiceItem.objects.filter(invoice_id__in=invoice_ids[index : index + 500])
+            .annotate(
+                component_type=Coalesce(
+                    KT("details__offering_component_type"),
+                    Value(""),
+                    output_field=models.CharField(),
+                )
+            )
+            .values(
+                "invoice_id",
+                "invoice__year",
+                "invoice__month",
+                "invoice__customer_id",
+                "project_id",
+                "resource__offering_id",
+                "resource__offering__customer_id",
+                "resource__offering__category_id",
+                "component_type",
+            )
+            .annotate(price=Sum(price), quantity=Sum("quantity"))
+            .order_by()
+        )
+        InvoiceCost.objects.bulk_create(
+            [
+                InvoiceCost(
+                    invoice_id=row["invoice_id"],
+                    year=row["invoice__year"],
+                    month=row["invoice__month"],
+                    customer_id=row["invoice__customer_id"],
+                    project_id=row["project_id"],
+                    offering_id=row["resource__offering_id"],
+                    provider_id=row["resource__offering__customer_id"],
+                    category_id=row["resource__offering__category_id"],
+                    component_type=row["component_type"],
+                    price=row["price"],
+                    quantity=row["quantity"],
+                )
+                for row in rows
+            ],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("marketplace", "0145_clean_price_logs"),
+        ("structure", "0047_alter_customer_phone_number"),
+        ("invoices", "0007_customercredit_minimal_consumption_logic"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="InvoiceCost",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("year", models.PositiveSmallIntegerField()),
+                ("month", models.PositiveSmallIntegerField()),
+                ("component_type", models.CharField(blank=True, max_length=255)),
+                (
+                    "price",
+                    models.DecimalField(decimal_places=10, default=0, max_digits=22),
+                ),
+                (
+                    "quantity",
+                    models.DecimalField(decimal_places=10, default=0, max_digits=22),
+                ),
+                (
+                    "category",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="marketplace.category",
+                    ),
+                ),
+                (
+                    "customer",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="structure.customer",
+                    ),
+                ),
+                (
+                    "invoice",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="costs",
+                        to="invoices.invoice",
+                    ),
+                ),
+                (
+                    "offering",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="marketplace.offering",
+                    ),
+                ),
+                (
+                    "project",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="structure.project",
+                    ),
+                ),
+                (
+                    "provider",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="structure.customer",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["offering", "year", "month"],
+                        name="invoices_in_offerin_4b898c_idx",
+                    ),
+                    models.Index(
+                        fields=["provider", "year", "month"],
+                        name="invoices_in_provide_f196a5_idx",
+                    ),
+                    models.Index(
+                        fields=["customer", "year", "month"],
+                        name="invoices_in_custome_0e1f88_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="invoicecost",
+            constraint=models.UniqueConstraint(
+                models.F("invoice"),
+                django.db.models.functions.comparison.Coalesce("project", 0),
+                django.db.models.functions.comparison.Coalesce("offering", 0),
+                django.db.models.functions.comparison.Coalesce("provider", 0),
+                django.db.models.functions.comparison.Coalesce("category", 0),
+                models.F("component_type"),
+                name="invoices_invoicecost_unique_group",
+            ),
+        ),
+        migrations.RunPython(fill_invoice_costs, migrations.RunPython.noop),
+    ]
@@ -8,6 +8,7 @@ from django.conf import settings
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models, transaction
 from django.db.models.aggregates import Sum
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from model_utils import FieldTracker
@@ -22,7 +23,7 @@ from waldur_mastermind.common import mixins as common_mixins
 from waldur_mastermind.common.utils import quantize_price
 from waldur_mastermind.marketplace import models as marketplace_models
 
-from . import log, utils
+from . import log, managers, utils
 
 logger = logging.getLogger(__name__)
 
@@ -107,19 +108,15 @@ class Invoice(core_models.UuidMixin, core_models.BackendMixin, models.Model):
     )
 
     tracker = FieldTracker()
+    objects = managers.InvoiceManager()
 
-    def update_cache(self):
-        current_total = self.total
-
-        if self.total_cost != current_total:
-            self.total_cost = current_total
-            self.save(update_fields=["total_cost"])
-
-        current_price = self.price
+    # Price computed by cache_price
+    _cached_price = None
 
-        if self.total_price != current_price:
-            self.total_price = current_price
-            self.save(update_fields=["total_price"])
+    def update_cache(self):
+        Invoice.objects.filter(pk=self.pk).update_totals()
+        InvoiceCost.objects.refresh([self.pk])
+        self.refresh_from_db(fields=["total_cost", "total_price"])
 
     @property
     def tax(self):
@@ -131,9 +128,17 @@ class Invoice(core_models.UuidMixin, core_models.BackendMixin, models.Model):
 
     @property
     def price(self):
-        return quantize_price(
-            decimal.Decimal(sum(item.price for item in self.items.all()))
-        )
+        if self._cached_price is not None:
+            return self._cached_price
+        return quantize_price(self.items.all().get_price())
+
+    def cache_price(self):
+        """
+        Compute price once for this instance, so that it is not recomputed
+        when instance is shared by many items, for example, in invoice report.
+        """
+        self._cached_price = None
+        self._cached_price = self.price
 
     @property
     def tax_current(self):
@@ -145,7 +150,7 @@ class Invoice(core_models.UuidMixin, core_models.BackendMixin, models.Model):
 
     @property
     def price_current(self):
-        return sum(item.price_current for item in self.items.all())
+        return self.items.all().get_price(current=True)
 
     @property
     def due_date(self):
@@ -313,6 +318,7 @@ class InvoiceItem(
     )
 
     tracker = FieldTracker()
+    objects = managers.InvoiceItemManager()
 
     @property
     def tax(self):
@@ -454,6 +460,88 @@ class InvoiceItem(
         return self.name or "<InvoiceItem %s>" % self.pk
 
 
+class InvoiceCost(models.Model):
+    """
+    Price and quantity of invoice items aggregated by month, customer, project,
+    offering, service provider, category and offering component.
+    It is refreshed when invoice items are changed and used for reporting.
+    References to project, offering, provider and category are kept when they are deleted,
+    so that grouping of costs stays unique until invoice costs are refreshed.
+    """
+
+    invoice = models.ForeignKey(
+        on_delete=models.CASCADE, to=Invoice, related_name="costs"
+    )
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField()
+    customer = models.ForeignKey(
+        on_delete=models.CASCADE, to=structure_models.Customer, related_name="+"
+    )
+    project = models.ForeignKey(
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        to=structure_models.Project,
+        related_name="+",
+        null=True,
+    )
+    offering = models.ForeignKey(
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        to=marketplace_models.Offering,
+        related_name="+",
+        null=True,
+    )
+    provider = models.ForeignKey(
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        to=structure_models.Customer,
+        related_name="+",
+        null=True,
+    )
+    category = models.ForeignKey(
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        to=marketplace_models.Category,
+        related_name="+",
+        null=True,
+    )
+    component_type = models.CharField(max_length=255, blank=True)
+    price = models.DecimalField(
+        default=0,
+        max_digits=common_mixins.PRICE_MAX_DIGITS,
+        decimal_places=common_mixins.PRICE_DECIMAL_PLACES,
+    )
+    quantity = models.DecimalField(
+        default=0,
+        max_digits=common_mixins.PRICE_MAX_DIGITS,
+        decimal_places=common_mixins.PRICE_DECIMAL_PLACES,
+    )
+
+    objects = managers.InvoiceCostManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["offering", "year", "month"]),
+            models.Index(fields=["provider", "year", "month"]),
+            models.Index(fields=["customer", "year", "month"]),
+        ]
+        constraints = [
+            # Nullable references are coalesced because NULL values are distinct in unique index
+            models.UniqueConstraint(
+                "invoice",
+                Coalesce("project", 0),
+                Coalesce("offering", 0),
+                Coalesce("provider", 0),
+                Coalesce("category", 0),
+                "component_type",
+                name="invoices_invoicecost_unique_group",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.invoice} | {self.offering_id} | {self.component_type}"
+
+
 class PaymentType(models.CharField):
     FIXED_PRICE = "fixed_price"
     MONTHLY_INVOICES = "invoices"
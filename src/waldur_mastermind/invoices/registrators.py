@@ -13,11 +13,16 @@ used for invoice items registration and termination.
 Registrators defines items creation and termination logic for each invoice item.
 """
 
+import logging
+
 from django.db import transaction
+from django.db.models import signals
 from django.utils import timezone
 
 from waldur_core.core import utils as core_utils
 
+logger = logging.getLogger(__name__)
+
 
 class BaseRegistrator:
     def get_customer(self, source):
@@ -30,12 +35,29 @@ class BaseRegistrator:
         for source in sources:
             self._create_item(source, invoice, start=start, end=end, **kwargs)
 
+    def build_items(self, sources, invoice, start, **kwargs):
+        """For each source build unsaved invoice items so that they could be created in bulk."""
+        end = core_utils.month_end(start)
+        items = []
+        for source in sources:
+            items.extend(self._build_items(source, invoice, start, end, **kwargs))
+        return items
+
     def get_sources(self, customer):
         """Return a list of invoice item sources to charge customer for."""
         raise NotImplementedError()
 
+    def get_sources_for_customers(self, customers):
+        """Return a mapping from customer ID to a list of invoice item sources to charge customer for."""
+        return {customer.id: self.get_sources(customer) for customer in customers}
+
     def _create_item(self, source, invoice, start, end, **kwargs):
         """Register single chargeable item in the invoice."""
+        for item in self._build_items(source, invoice, start, end, **kwargs):
+            item.save()
+
+    def _build_items(self, source, invoice, start, end, **kwargs):
+        """Return unsaved invoice items for single chargeable source."""
         raise NotImplementedError()
 
     def terminate(self, source, now=None):
@@ -113,6 +135,90 @@ class RegistrationManager:
 
         return invoice, created
 
+    @classmethod
+    def create_invoices(cls, customers, date, **kwargs):
+        """
+        Create invoices with items for many customers using bulk inserts.
+        Customers which already have invoice for given month are skipped.
+        If items could not be built for some customer, its invoice is created
+        without items of failed registrator so that other customers are not affected.
+        """
+        from . import models
+
+        customers = list(customers)
+        existing_ids = set(
+            models.Invoice.objects.filter(
+                customer__in=customers, year=date.year, month=date.month
+            ).values_list("customer_id", flat=True)
+        )
+        customers = [
+            customer for customer in customers if customer.id not in existing_ids
+        ]
+        if not customers:
+            return []
+
+        invoices = [
+            models.Invoice(
+                customer=customer,
+                month=date.month,
+                year=date.year,
+                tax_percent=customer.default_tax_percent,
+            )
+            for customer in customers
+        ]
+        items = []
+        for registrator in cls.get_registrators():
+            customer_sources = registrator.get_sources_for_customers(customers)
+            for invoice in invoices:
+                customer = invoice.customer
+                try:
+                    items.extend(
+                        registrator.build_items(
+                            customer_sources.get(customer.id, []),
+                            invoice,
+                            date,
+                            **kwargs,
+                        )
+                    )
+                except Exception:
+                    logger.exception(
+                        "Unable to build invoice items for customer %s using %s",
+                        customer,
+                        registrator.__class__.__name__,
+                    )
+
+        for item in items:
+            if item.project:
+                item.project_name = item.project.name
+                item.project_uuid = item.project.uuid.hex
+
+        with transaction.atomic():
+            models.Invoice.objects.bulk_create(invoices)
+            models.InvoiceItem.objects.bulk_create(items, batch_size=1000)
+            invoice_ids = [invoice.id for invoice in invoices]
+            models.Invoice.objects.filter(id__in=invoice_ids).update_totals()
+            models.InvoiceCost.objects.refresh(invoice_ids)
+
+        # Bulk insert does not send signals, so that invoice creation
+        # is processed by its receivers only after all items are created.
+        for invoice in invoices:
+            try:
+                signals.post_save.send(
+                    sender=models.Invoice,
+                    instance=invoice,
+                    created=True,
+                    update_fields=None,
+                    raw=False,
+                    using=invoice._state.db,
+                )
+            except Exception:
+                logger.exception(
+                    "Unable to process creation of invoice for customer %s",
+                    invoice.customer,
+                )
+
+        return invoices
+
     @classmethod
     def register(cls, source, now=None, **kwargs):
         """
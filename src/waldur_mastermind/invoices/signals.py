@@ -2,3 +2,7 @@ import django.dispatch
 
 # providing_args=['invoice', 'issuer_details']
 invoice_created = django.dispatch.Signal()
+
+# Sent when invoice items are created or updated in bulk, so that post_save is not sent
+# providing_args=['invoice_items']
+invoice_items_updated = django.dispatch.Signal()
@@ -1,12 +1,14 @@
 import datetime
+import gzip
 import logging
+import tempfile
 from csv import DictWriter
-from io import StringIO
+from io import StringIO, TextIOWrapper
 
 from celery import shared_task
 from constance import config
 from django.conf import settings
-from django.db.models import Q
+from django.db.models import Exists, OuterRef, Q
 from django.template.loader import render_to_string
 from django.utils import timezone
 
@@ -35,23 +37,36 @@ def create_monthly_invoices():
         Q(state=models.Invoice.States.PENDING, year__lt=date.year)
         | Q(state=models.Invoice.States.PENDING, year=date.year, month__lt=date.month)
     )
-    for invoice in old_invoices:
-        invoice.set_created()
+    for invoice in old_invoices.select_related("customer"):
+        try:
+            invoice.set_created()
+        except Exception:
+            # Continue processing even if some invoices could not be processed
+            logger.exception("Unable to change state of invoice %s", invoice)
 
     customers = structure_models.Customer.objects.exclude(archived=True)
     if settings.WALDUR_CORE["ENABLE_ACCOUNTING_START_DATE"]:
         customers = customers.filter(accounting_start_date__lt=timezone.now())
 
-    for customer in customers.iterator():
+    month_start = core_utils.month_start(date)
+    for chunk in core_utils.chunks(list(customers.order_by("id")), 500):
         try:
-            registrators.RegistrationManager.get_or_create_invoice(
-                customer, core_utils.month_start(date)
-            )
+            registrators.RegistrationManager.create_invoices(chunk, month_start)
         except Exception:
-            # Continue processing even if some customers could not be processed
             logger.exception(
-                "Unable to create monthly invoice for customer %s", customer
+                "Unable to create monthly invoices in bulk, "
+                "falling back to processing customers one by one."
             )
+            for customer in chunk:
+                try:
+                    registrators.RegistrationManager.get_or_create_invoice(
+                        customer, month_start
+                    )
+                except Exception:
+                    # Continue processing even if some customers could not be processed
+                    logger.exception(
+                        "Unable to create monthly invoice for customer %s", customer
+                    )
 
     if settings.WALDUR_INVOICES["INVOICE_REPORTING"]["ENABLE"]:
         send_invoice_report.delay()
@@ -130,8 +145,30 @@ def send_invoice_report(
         )
 
     # Report should not include customers with 0 invoice items.
-    invoices = [invoice for invoice in invoices if invoice.items.count() > 0]
-    text_message = format_invoice_csv(invoices)
+    invoices = (
+        invoices.filter(
+            Exists(models.InvoiceItem.objects.filter(invoice=OuterRef("pk")))
+        )
+        .select_related("customer")
+        .order_by("id")
+    )
+
+    # Report is written to temporary file instead of keeping all rows in memory
+    with tempfile.TemporaryFile() as report_file:
+        if settings.WALDUR_INVOICES["INVOICE_REPORTING"].get("USE_GZIP"):
+            with gzip.GzipFile(fileobj=report_file, mode="wb") as gzip_file:
+                with TextIOWrapper(gzip_file, encoding="utf-8", newline="") as stream:
+                    write_invoice_csv(invoices, stream)
+            report_file.seek(0)
+            attachment = report_file.read()
+            filename += ".gz"
+            content_type = "application/gzip"
+        else:
+            with TextIOWrapper(report_file, encoding="utf-8", newline="") as stream:
+                write_invoice_csv(invoices, stream)
+                stream.seek(0)
+                attachment = stream.read()
+            content_type = "text/plain"
 
     # Please note that email body could be empty if there are no valid invoices
     recipient_emails = []
@@ -144,64 +181,102 @@ def send_invoice_report(
         subject=subject,
         body=body,
         to=recipient_emails,
-        attachment=text_message,
+        attachment=attachment,
         filename=filename,
+        content_type=content_type,
     )
 
 
-def format_invoice_csv(invoices):
-    if not isinstance(invoices, list):
+def get_invoice_report_serializer_class():
+    reporting = settings.WALDUR_INVOICES["INVOICE_REPORTING"]
+    if reporting.get("USE_SAF"):
+        return serializers.SAFReportSerializer
+    elif reporting.get("USE_SAP"):
+        return serializers.SAPReportSerializer
+    return serializers.InvoiceItemReportSerializer
+
+
+def get_invoice_report_rows(invoices):
+    """
+    Yield serialized invoice items row by row so that report is not kept in memory.
+    Items of each invoice are streamed from database and share the same invoice instance.
+    """
+    if isinstance(invoices, models.Invoice):
         invoices = [invoices]
 
-    csv_params = settings.WALDUR_INVOICES["INVOICE_REPORTING"]["CSV_PARAMS"]
+    serializer_class = get_invoice_report_serializer_class()
+    serializer = serializer_class()
+    is_default_layout = serializer_class is serializers.InvoiceItemReportSerializer
 
-    if settings.WALDUR_INVOICES["INVOICE_REPORTING"].get("USE_SAF"):
-        fields = serializers.SAFReportSerializer.Meta.fields
-        stream = StringIO()
-        writer = DictWriter(stream, fieldnames=fields, **csv_params)
-        writer.writeheader()
+    for invoice in invoices:
+        # Invoice instance is shared by its items, so its price is computed once
+        invoice.cache_price()
+        items = invoice.items.select_related("resource__offering")
+        if is_default_layout:
+            items = items.order_by("id")
+        else:
+            items = items.order_by("project_name", "name")
+        if serializer_class is serializers.SAPReportSerializer:
+            items = items.prefetch_related("resource__offering__plans")
+
+        for item in items.iterator(chunk_size=2000):
+            item.invoice = invoice
+            # skip empty, but leave in credit and debit
+            if item.total == 0:
+                continue
+            yield serializer.to_representation(item)
+
+
+def write_invoice_csv(invoices, stream):
+    """Write invoice report in CSV format to the file-like object."""
+    serializer_class = get_invoice_report_serializer_class()
+    csv_params = settings.WALDUR_INVOICES["INVOICE_REPORTING"]["CSV_PARAMS"]
+    writer = DictWriter(stream, fieldnames=serializer_class.Meta.fields, **csv_params)
+    writer.writeheader()
+    for row in get_invoice_report_rows(invoices):
+        writer.writerow(row)
 
-        for invoice in invoices:
-            items = utils.filter_invoice_items(
-                invoice.items.order_by("project_name", "name")
-            )
-            serializer = serializers.SAFReportSerializer(items, many=True)
-            writer.writerows(serializer.data)
-        return stream.getvalue()
-    elif settings.WALDUR_INVOICES["INVOICE_REPORTING"].get("USE_SAP"):
-        fields = serializers.SAPReportSerializer.Meta.fields
-        stream = StringIO()
-        writer = DictWriter(stream, fieldnames=fields, **csv_params)
-        writer.writeheader()
-
-        for invoice in invoices:
-            items = utils.filter_invoice_items(
-                invoice.items.order_by("project_name", "name")
-            )
-            serializer = serializers.SAPReportSerializer(items, many=True)
-            writer.writerows(serializer.data)
-        return stream.getvalue()
 
-    fields = serializers.InvoiceItemReportSerializer.Meta.fields
+def iter_invoice_csv(invoices):
+    """Yield invoice report in CSV format line by line, for example, for HTTP streaming response."""
+    serializer_class = get_invoice_report_serializer_class()
+    csv_params = settings.WALDUR_INVOICES["INVOICE_REPORTING"]["CSV_PARAMS"]
     stream = StringIO()
-    writer = DictWriter(stream, fieldnames=fields, **csv_params)
+    writer = DictWriter(stream, fieldnames=serializer_class.Meta.fields, **csv_params)
+
+    def flush():
+        value = stream.getvalue()
+        stream.seek(0)
+        stream.truncate()
+        return value
+
     writer.writeheader()
+    yield flush()
+    for row in get_invoice_report_rows(invoices):
+        writer.writerow(row)
+        yield flush()
 
-    for invoice in invoices:
-        items = utils.filter_invoice_items(invoice.items.all())
-        serializer = serializers.InvoiceItemReportSerializer(items, many=True)
-        writer.writerows(serializer.data)
 
+def format_invoice_csv(invoices):
+    stream = StringIO()
+    write_invoice_csv(invoices, stream)
     return stream.getvalue()
 
 
 @shared_task(name="invoices.update_invoices_total_cost")
 def update_invoices_total_cost():
+    """
+    Cached totals are updated when invoice items are changed,
+    so that this task only fixes totals which have drifted from actual ones.
+    """
     year = utils.get_current_year()
     month = utils.get_current_month()
-
-    for invoice in models.Invoice.objects.filter(year=year, month=month):
-        invoice.update_cache()
+    drifted = models.Invoice.objects.filter(year=year, month=month).filter_drifted()
+    invoice_ids = list(drifted.values_list("id", flat=True))
+    if invoice_ids:
+        logger.warning("Fixing cached totals of invoices with IDs %s", invoice_ids)
+        models.Invoice.objects.filter(id__in=invoice_ids).update_totals()
+        models.InvoiceCost.objects.refresh(invoice_ids)
 
 
 @shared_task
@@ -14,6 +14,7 @@ from waldur_core.permissions.fixtures import CustomerRole
 from waldur_core.structure.tests import factories as structure_factories
 from waldur_core.structure.tests import fixtures as structure_fixtures
 from waldur_mastermind.common.mixins import UnitPriceMixin
+from waldur_mastermind.common.utils import quantize_price
 from waldur_mastermind.invoices import models, tasks
 from waldur_mastermind.invoices.tests import factories, fixtures
 from waldur_mastermind.marketplace import models as marketplace_models
@@ -351,6 +352,31 @@ class InvoiceStatsTest(test.APITransactionTestCase):
             },
         )
 
+    @freeze_time("2019-01-01")
+    def test_invoice_stats_include_tax(self):
+        tasks.create_monthly_invoices()
+        invoice = models.Invoice.objects.get(customer=self.customer, year=2019, month=1)
+        invoice.tax_percent = 20
+        invoice.save()
+        url = factories.InvoiceFactory.get_url(invoice=invoice, action="stats")
+        self.client.force_authenticate(structure_factories.UserFactory(is_staff=True))
+        result = self.client.get(url)
+
+        items = models.InvoiceItem.objects.filter(
+            invoice=invoice, resource__offering=self.offering_2
+        )
+        offering_stats = [
+            row for row in result.data if row["uuid"] == self.offering_2.uuid.hex
+        ][0]
+        self.assertEqual(
+            offering_stats["aggregated_tax"],
+            quantize_price(sum(item.tax for item in items)),
+        )
+        self.assertEqual(
+            offering_stats["aggregated_total"],
+            quantize_price(sum(item.total for item in items)),
+        )
+
 
 class DeleteCustomerWithInvoiceTest(test.APITransactionTestCase):
     def setUp(self):
@@ -1,12 +1,16 @@
+import csv
 import datetime
+import gzip
+import io
 from unittest import mock
 
 from django.test import TransactionTestCase
 from django.utils import timezone
 from freezegun import freeze_time
+from rest_framework import status
 
 from waldur_core.core.tests.helpers import override_waldur_core_settings
-from waldur_mastermind.invoices import models, tasks
+from waldur_mastermind.invoices import managers, models, tasks
 from waldur_mastermind.invoices import utils as invoices_utils
 from waldur_mastermind.invoices.tasks import format_invoice_csv
 from waldur_mastermind.invoices.tests import factories, fixtures, utils
@@ -42,6 +46,50 @@ class GenericReportFormatterTest(BaseReportFormatterTest):
         self.assertEqual(lines[0], expected_header)
         self.assertTrue("OFFERING-001" in lines[1])
 
+    def test_invoice_totals_are_rendered_for_each_item(self):
+        report = format_invoice_csv(self.invoice)
+        row = next(csv.DictReader(io.StringIO(report), delimiter=";"))
+        self.assertEqual(row["invoice_price"], str(self.invoice.price))
+        self.assertEqual(row["invoice_total"], str(self.invoice.total))
+
+    def test_invoice_price_is_computed_once_per_invoice(self):
+        factories.InvoiceItemFactory(
+            invoice=self.invoice,
+            project=self.fixture.project,
+            unit_price=10,
+            quantity=1,
+            unit=models.InvoiceItem.Units.QUANTITY,
+        )
+        with mock.patch.object(
+            managers.InvoiceItemQuerySet,
+            "get_price",
+            autospec=True,
+            side_effect=managers.InvoiceItemQuerySet.get_price,
+        ) as get_price:
+            report = format_invoice_csv(self.invoice)
+
+        self.assertEqual(3, len(report.splitlines()))
+        self.assertEqual(get_price.call_count, 1)
+
+    def test_report_is_streamed_line_by_line(self):
+        lines = list(tasks.iter_invoice_csv(self.invoice))
+        self.assertEqual(2, len(lines))
+        self.assertEqual("".join(lines), format_invoice_csv(self.invoice))
+
+
+class InvoiceReportViewTest(BaseReportFormatterTest):
+    def test_staff_can_download_report(self):
+        self.client.force_login(self.fixture.staff)
+        response = self.client.get(factories.InvoiceFactory.get_list_url() + "report/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        report = b"".join(response.streaming_content).decode()
+        self.assertEqual(report, format_invoice_csv(self.invoice))
+
+    def test_owner_can_not_download_report(self):
+        self.client.force_login(self.fixture.owner)
+        response = self.client.get(factories.InvoiceFactory.get_list_url() + "report/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
 
 INVOICE_REPORTING = {
     "ENABLE": True,
@@ -191,6 +239,23 @@ class InvoiceReportTaskTest(BaseReportFormatterTest):
         lines = self.send_report()
         self.assertEqual(0, len(lines))
 
+    def test_report_is_compressed_if_gzip_is_enabled(self):
+        with (
+            utils.override_invoices_settings(
+                INVOICE_REPORTING=dict(INVOICE_REPORTING, USE_GZIP=True)
+            ),
+            mock.patch(
+                "waldur_mastermind.invoices.tasks.core_utils.send_mail"
+            ) as send_mail_mock,
+        ):
+            tasks.send_invoice_report()
+
+        kwargs = send_mail_mock.call_args[1]
+        self.assertEqual(kwargs["filename"], "3M102017Waldur.txt.gz")
+        self.assertEqual(kwargs["content_type"], "application/gzip")
+        report = gzip.decompress(kwargs["attachment"]).decode()
+        self.assertEqual(report, format_invoice_csv(self.invoice))
+
     def test_all_active_organizations_are_rendered_in_one_invoice(self):
         # First customer is active and it his invoice has one item
         self.customer.accounting_start_date = timezone.now() - datetime.timedelta(
@@ -1,6 +1,8 @@
+import decimal
 from unittest import mock
 
 from django.conf import settings
+from django.db import IntegrityError, transaction
 from django.test import TransactionTestCase
 from django.utils import timezone
 
@@ -71,6 +73,111 @@ class UpdateInvoiceTotalCostTest(TransactionTestCase):
         self.invoice.refresh_from_db()
         self.assertEqual(0, self.invoice.total_cost)
 
+    def test_when_invoice_item_is_moved_totals_of_both_invoices_are_updated(self):
+        invoice_item = self.create_invoice_item()
+        new_invoice = factories.InvoiceFactory()
+
+        invoice_item.invoice = new_invoice
+        invoice_item.quantity = 3
+        invoice_item.save()
+
+        self.invoice.refresh_from_db()
+        new_invoice.refresh_from_db()
+        self.assertEqual(0, self.invoice.total_cost)
+        self.assertEqual(300, new_invoice.total_cost)
+
+    def test_tax_is_applied_when_totals_are_updated(self):
+        self.invoice.tax_percent = 20
+        self.invoice.save()
+        invoice_item = self.create_invoice_item()
+        invoice_item.unit_price = "0.3333333"
+        invoice_item.save()
+
+        self.invoice.refresh_from_db()
+        self.assertEqual(decimal.Decimal("0.34"), self.invoice.total_price)
+        self.assertEqual(decimal.Decimal("0.41"), self.invoice.total_cost)
+
+
+class UpdateInvoiceCostTest(TransactionTestCase):
+    def setUp(self):
+        super().setUp()
+        self.project = structure_factories.ProjectFactory()
+        self.invoice = factories.InvoiceFactory(customer=self.project.customer)
+        self.invoice_item = factories.InvoiceItemFactory(
+            invoice=self.invoice,
+            project=self.project,
+            unit_price=100,
+            quantity=1,
+            unit=models.InvoiceItem.Units.QUANTITY,
+            details={"offering_component_type": "cpu"},
+        )
+
+    def get_costs(self, invoice):
+        return list(
+            models.InvoiceCost.objects.filter(invoice=invoice).values_list(
+                "component_type", "price", "quantity"
+            )
+        )
+
+    def test_cost_is_created_when_invoice_item_is_created(self):
+        self.assertEqual([("cpu", 100, 1)], self.get_costs(self.invoice))
+
+    def test_cost_is_updated_when_invoice_item_is_updated(self):
+        self.invoice_item.quantity = 2
+        self.invoice_item.save()
+        self.assertEqual([("cpu", 200, 2)], self.get_costs(self.invoice))
+
+    def test_cost_is_deleted_when_invoice_item_is_deleted(self):
+        self.invoice_item.delete()
+        self.assertEqual([], self.get_costs(self.invoice))
+
+    def test_costs_of_both_invoices_are_updated_when_invoice_item_is_moved(self):
+        new_invoice = factories.InvoiceFactory()
+        self.invoice_item.invoice = new_invoice
+        self.invoice_item.save()
+        self.assertEqual([], self.get_costs(self.invoice))
+        self.assertEqual([("cpu", 100, 1)], self.get_costs(new_invoice))
+
+    def test_costs_are_refreshed_once_per_transaction(self):
+        with mock.patch.object(
+            models.InvoiceCost.objects,
+            "refresh",
+            wraps=models.InvoiceCost.objects.refresh,
+        ) as refresh:
+            with transaction.atomic():
+                for quantity in range(2, 5):
+                    self.invoice_item.quantity = quantity
+                    self.invoice_item.save()
+
+        refresh.assert_called_once_with({self.invoice.id})
+        self.assertEqual([("cpu", 400, 4)], self.get_costs(self.invoice))
+
+    def test_costs_without_project_are_unique(self):
+        cost = models.InvoiceCost.objects.get(invoice=self.invoice)
+        cost.project = None
+        cost.save()
+        cost.pk = None
+        with self.assertRaises(IntegrityError):
+            cost.save()
+
+    def test_items_without_component_type_are_grouped_together(self):
+        for details in ({}, {"offering_component_type": ""}):
+            factories.InvoiceItemFactory(
+                invoice=self.invoice,
+                project=self.project,
+                unit_price=10,
+                quantity=1,
+                unit=models.InvoiceItem.Units.QUANTITY,
+                details=details,
+            )
+
+        models.InvoiceCost.objects.refresh([self.invoice.id])
+
+        self.assertEqual(
+            [("", 20, 2), ("cpu", 100, 1)],
+            sorted(self.get_costs(self.invoice)),
+        )
+
 
 class MoveProjectInvoiceTest(TransactionTestCase):
     def test_delete_invoice_items_if_project_customer_has_been_changed(self):
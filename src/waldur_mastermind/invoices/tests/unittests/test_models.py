@@ -1,6 +1,7 @@
 import decimal
 
 from django.test import TestCase
+from freezegun import freeze_time
 
 from waldur_mastermind.common.utils import parse_datetime, quantize_price
 from waldur_mastermind.invoices import models
@@ -41,3 +42,50 @@ class InvoiceItemTest(TestCase):
             ),
             4,
         )
+
+
+class InvoicePriceTest(TestCase):
+    def setUp(self):
+        self.invoice = factories.InvoiceFactory(tax_percent=20)
+        Units = models.InvoiceItem.Units
+        with freeze_time("2019-08-01"):
+            for unit, unit_price, quantity in (
+                (Units.PER_HOUR, "0.3333333", 5),
+                (Units.PER_DAY, "1.1111111", "2.5"),
+                (Units.PER_MONTH, "10.005", "0.27"),
+                (Units.QUANTITY, "-3.3333333", 3),
+            ):
+                factories.InvoiceItemFactory(
+                    invoice=self.invoice,
+                    unit=unit,
+                    unit_price=decimal.Decimal(unit_price),
+                    quantity=decimal.Decimal(quantity),
+                    start=parse_datetime("2019-08-01 10:00:00"),
+                    end=parse_datetime("2019-08-31 23:59:59"),
+                )
+
+    def test_price_is_equal_to_sum_of_item_prices(self):
+        self.assertEqual(
+            self.invoice.price,
+            quantize_price(sum(item.price for item in self.invoice.items.all())),
+        )
+
+    @freeze_time("2019-08-09 14:30:00")
+    def test_current_price_is_equal_to_sum_of_current_item_prices(self):
+        self.assertEqual(
+            self.invoice.price_current,
+            sum(item.price_current for item in self.invoice.items.all()),
+        )
+
+    def test_totals_are_updated_for_all_invoices(self):
+        empty_invoice = factories.InvoiceFactory(total_price=10, total_cost=10)
+        models.Invoice.objects.filter(
+            pk__in=[self.invoice.pk, empty_invoice.pk]
+        ).update_totals()
+
+        self.invoice.refresh_from_db()
+        empty_invoice.refresh_from_db()
+        self.assertEqual(self.invoice.total_price, self.invoice.price)
+        self.assertEqual(self.invoice.total_cost, self.invoice.total)
+        self.assertEqual(empty_invoice.total_price, 0)
+        self.assertEqual(empty_invoice.total_cost, 0)
@@ -1,4 +1,5 @@
 from datetime import timedelta
+from unittest import mock
 
 from ddt import data, ddt
 from django.core import mail
@@ -11,6 +12,7 @@ from waldur_core.structure.tests import factories as structure_factories
 from waldur_core.structure.tests import fixtures as structure_fixtures
 from waldur_mastermind.invoices import models, tasks
 from waldur_mastermind.invoices.tests import factories, fixtures
+from waldur_mastermind.marketplace.registrators import MarketplaceRegistrator
 
 
 class CreateMonthlyInvoiceTest(TestCase):
@@ -35,6 +37,63 @@ class CreateMonthlyInvoiceTest(TestCase):
 
         self.assertEqual(models.InvoiceItem.objects.count(), 1)
 
+    def create_fixture_with_active_resource(self):
+        with freeze_time("2017-01-15"):
+            fixture = fixtures.InvoiceFixture()
+            fixture.resource.set_state_ok()
+            fixture.resource.save()
+        return fixture
+
+    def get_new_invoice(self, fixture):
+        return models.Invoice.objects.get(customer=fixture.customer, year=2017, month=2)
+
+    def test_invoices_are_created_with_items_for_many_customers(self):
+        customer_fixtures = [
+            self.create_fixture_with_active_resource() for _ in range(2)
+        ]
+
+        with freeze_time("2017-02-01"):
+            tasks.create_monthly_invoices()
+
+        for fixture in customer_fixtures:
+            invoice = self.get_new_invoice(fixture)
+            item = invoice.items.get()
+            self.assertEqual(item.resource, fixture.resource)
+            self.assertEqual(item.project_name, fixture.project.name)
+            self.assertEqual(item.project_uuid, fixture.project.uuid.hex)
+            self.assertEqual(invoice.total_price, invoice.price)
+            self.assertNotEqual(invoice.total_price, 0)
+
+    def test_failure_of_single_customer_does_not_affect_other_customers(self):
+        failed_fixture = self.create_fixture_with_active_resource()
+        fixture = self.create_fixture_with_active_resource()
+        build_items = MarketplaceRegistrator._build_items
+
+        def side_effect(registrator, source, *args, **kwargs):
+            if source == failed_fixture.resource:
+                raise ValueError()
+            return build_items(registrator, source, *args, **kwargs)
+
+        with (
+            freeze_time("2017-02-01"),
+            mock.patch.object(
+                MarketplaceRegistrator, "_build_items", autospec=True
+            ) as mocked_build_items,
+        ):
+            mocked_build_items.side_effect = side_effect
+            tasks.create_monthly_invoices()
+
+        self.assertFalse(self.get_new_invoice(failed_fixture).items.exists())
+        self.assertTrue(self.get_new_invoice(fixture).items.exists())
+
+    def test_existing_invoice_is_not_duplicated(self):
+        fixture = self.create_fixture_with_active_resource()
+        with freeze_time("2017-02-01"):
+            tasks.create_monthly_invoices()
+            tasks.create_monthly_invoices()
+
+        self.assertEqual(self.get_new_invoice(fixture).items.count(), 1)
+
     def test_old_invoices_are_marked_as_created(self):
         # previous year
         with freeze_time("2016-11-01"):
@@ -86,6 +145,33 @@ class CheckAccountingStartDateTest(TestCase):
             )
 
 
+class UpdateInvoicesTotalCostTest(TestCase):
+    def setUp(self):
+        customer = structure_factories.CustomerFactory(default_tax_percent=10)
+        self.invoice = factories.InvoiceFactory(customer=customer)
+        factories.InvoiceItemFactory(
+            invoice=self.invoice,
+            unit_price=100,
+            quantity=1,
+            unit=models.InvoiceItem.Units.QUANTITY,
+        )
+
+    def test_drifted_totals_are_fixed(self):
+        models.Invoice.objects.filter(pk=self.invoice.pk).update(
+            total_price=1, total_cost=1
+        )
+        self.assertTrue(models.Invoice.objects.all().filter_drifted().exists())
+
+        tasks.update_invoices_total_cost()
+
+        self.invoice.refresh_from_db()
+        self.assertEqual(self.invoice.total_price, 100)
+        self.assertEqual(self.invoice.total_cost, 110)
+
+    def test_valid_totals_are_not_reported_as_drifted(self):
+        self.assertFalse(models.Invoice.objects.all().filter_drifted().exists())
+
+
 @override_settings(task_always_eager=True)
 class NotificationTest(TestCase):
     def setUp(self):
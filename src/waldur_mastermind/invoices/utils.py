@@ -384,6 +384,9 @@ class MonthlyCompensation:
             return
 
         models.InvoiceItem.objects.bulk_create(self.compensations)
+        invoice_ids = {item.invoice_id for item in self.compensations}
+        models.Invoice.objects.filter(id__in=invoice_ids).update_totals()
+        models.InvoiceCost.objects.refresh(invoice_ids)
 
         for pc in self.projects_credits:
             pc.save()
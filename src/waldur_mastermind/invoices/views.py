@@ -1,10 +1,10 @@
 import datetime
-import decimal
 import uuid
 
 from dateutil.relativedelta import relativedelta
 from django.db import transaction
-from django.db.models import F, Sum
+from django.db.models import F, Q, Sum
+from django.http import StreamingHttpResponse
 from django.utils.translation import gettext_lazy as _
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import exceptions, status
@@ -20,7 +20,7 @@ from waldur_core.structure.permissions import IsStaffOrSupportUser
 from waldur_mastermind.common.utils import quantize_price
 from waldur_mastermind.invoices.models import InvoiceItem
 
-from . import filters, log, models, serializers, tasks, utils
+from . import filters, log, managers, models, serializers, tasks, utils
 
 
 class InvoiceViewSet(core_views.ReadOnlyActionsViewSet):
@@ -105,48 +105,50 @@ class InvoiceViewSet(core_views.ReadOnlyActionsViewSet):
     paid_permissions = [structure_permissions.is_staff]
     paid_validators = [core_validators.StateValidator(models.Invoice.States.CREATED)]
 
+    @action(detail=False)
+    def report(self, request):
+        invoices = self.filter_queryset(self.get_queryset()).select_related("customer")
+        response = StreamingHttpResponse(
+            tasks.iter_invoice_csv(invoices), content_type="text/csv"
+        )
+        response["Content-Disposition"] = 'attachment; filename="invoices.csv"'
+        return response
+
+    report_permissions = [structure_permissions.is_staff]
+
     @action(detail=True)
     def stats(self, request, uuid=None):
         invoice = self.get_object()
-        offerings = {}
-
-        for item in invoice.items.all():
-            if not item.resource:
-                continue
-
-            resource = item.resource
-            offering = resource.offering
-            customer = offering.customer
-            service_category_title = offering.category.title
-            service_provider_name = customer.name
-            service_provider_uuid = customer.serviceprovider.uuid.hex
-
-            if offering.uuid.hex not in offerings.keys():
-                offerings[offering.uuid.hex] = {
-                    "offering_name": offering.name,
-                    "aggregated_price": item.price,
-                    "aggregated_tax": item.tax,
-                    "aggregated_total": item.total,
-                    "service_category_title": service_category_title,
-                    "service_provider_name": service_provider_name,
-                    "service_provider_uuid": service_provider_uuid,
-                }
-            else:
-                offerings[offering.uuid.hex]["aggregated_price"] += item.price
-                offerings[offering.uuid.hex]["aggregated_tax"] += item.tax
-                offerings[offering.uuid.hex]["aggregated_total"] += item.total
-
-        queryset = [dict(uuid=key, **details) for (key, details) in offerings.items()]
-
-        for item in queryset:
-            item["aggregated_price"] = quantize_price(
-                decimal.Decimal(item["aggregated_price"])
-            )
-            item["aggregated_tax"] = quantize_price(
-                decimal.Decimal(item["aggregated_tax"])
+        rows = (
+            invoice.items.filter(resource__isnull=False)
+            .values(
+                offering_uuid=F("resource__offering__uuid"),
+                offering_name=F("resource__offering__name"),
+                service_category_title=F("resource__offering__category__title"),
+                service_provider_name=F("resource__offering__customer__name"),
+                service_provider_uuid=F(
+                    "resource__offering__customer__serviceprovider__uuid"
+                ),
             )
-            item["aggregated_total"] = quantize_price(
-                decimal.Decimal(item["aggregated_total"])
+            .annotate(aggregated_price=Sum(managers.get_price_expression()))
+            .order_by("offering_name", "offering_uuid")
+        )
+
+        queryset = []
+        for row in rows:
+            price = row.pop("aggregated_price")
+            tax = price * invoice.tax_percent / 100
+            service_provider_uuid = row.pop("service_provider_uuid")
+            queryset.append(
+                dict(
+                    uuid=row.pop("offering_uuid").hex,
+                    aggregated_price=quantize_price(price),
+                    aggregated_tax=quantize_price(tax),
+                    aggregated_total=quantize_price(price + tax),
+                    service_provider_uuid=service_provider_uuid
+                    and service_provider_uuid.hex,
+                    **row,
+                )
             )
 
         page = self.paginate_queryset(queryset)
@@ -195,21 +197,24 @@ class InvoiceViewSet(core_views.ReadOnlyActionsViewSet):
             periods.append(f"{month.year}-{month.month}")
 
         field = is_accounting_mode and "total_price" or "total_cost"
+        invoices = models.Invoice.objects.filter(
+            Q(year__gt=year_ago.year) | Q(year=year_ago.year, month__gte=year_ago.month)
+        )
         total_values = {
             f"{row['year']}-{row['month']}": row["total_value"]
-            for row in models.Invoice.objects.values("year", "month").annotate(
-                total_value=Sum(field)
-            )
+            for row in invoices.values("year", "month").annotate(total_value=Sum(field))
         }
         other_values = {
             f"{row['year']}-{row['month']}": row["total_value"]
-            for row in models.Invoice.objects.filter(customer__in=minors)
+            for row in invoices.filter(customer__in=minors)
             .values("year", "month")
             .annotate(total_value=Sum(field))
         }
         customer_periods = {
-            f"{row.customer_id}-{row.year}-{row.month}": getattr(row, field)
-            for row in models.Invoice.objects.filter(customer__in=majors)
+            f"{row['customer_id']}-{row['year']}-{row['month']}": row[field]
+            for row in invoices.filter(customer__in=majors).values(
+                "customer_id", "year", "month", field
+            )
         }
         customer_periods = [
             {
@@ -13,6 +13,8 @@ class MarketplaceConfig(AppConfig):
         from waldur_core.structure import models as structure_models
         from waldur_core.structure import signals as structure_signals
         from waldur_core.structure.serializers import BaseResourceSerializer
+        from waldur_mastermind.promotions import models as promotions_models
+        from waldur_mastermind.support import models as support_models
 
         from . import PLUGIN_NAME, handlers, models, processors, utils
         from . import registrators as marketplace_registrators
@@ -295,3 +297,40 @@ class MarketplaceConfig(AppConfig):
             sender=models.ResourceUser,
             dispatch_uid="waldur_mastermind.marketplace.log_resource_user_deleted",
         )
+
+        signals.post_save.connect(
+            handlers.update_service_provider_stat_on_resource_change,
+            sender=models.Resource,
+            dispatch_uid="waldur_mastermind.marketplace.update_service_provider_stat_on_resource_change",
+        )
+
+        signals.post_delete.connect(
+            handlers.update_service_provider_stat_on_resource_deletion,
+            sender=models.Resource,
+            dispatch_uid="waldur_mastermind.marketplace.update_service_provider_stat_on_resource_deletion",
+        )
+
+        signals.post_save.connect(
+            handlers.update_service_provider_stat_on_order_change,
+            sender=models.Order,
+            dispatch_uid="waldur_mastermind.marketplace.update_service_provider_stat_on_order_change",
+        )
+
+        signals.post_save.connect(
+            handlers.update_service_provider_stat_on_offering_change,
+            sender=models.Offering,
+            dispatch_uid="waldur_mastermind.marketplace.update_service_provider_stat_on_offering_change",
+        )
+
+        for signal in (signals.post_save, signals.post_delete):
+            signal.connect(
+                handlers.update_service_provider_stat_on_campaign_change,
+                sender=promotions_models.Campaign,
+                dispatch_uid="waldur_mastermind.marketplace.update_service_provider_stat_on_campaign_change",
+            )
+
+        signals.post_save.connect(
+            handlers.update_service_provider_stat_on_issue_change,
+            sender=support_models.Issue,
+            dispatch_uid="waldur_mastermind.marketplace.update_service_provider_stat_on_issue_change",
+        )
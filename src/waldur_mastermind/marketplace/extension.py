@@ -29,6 +29,11 @@ class MarketplaceExtension(WaldurExtension):
         from celery.schedules import crontab
 
         return {
+            "waldur-marketplace-update-service-providers-stats": {
+                "task": "waldur_mastermind.marketplace.update_service_providers_stats",
+                "schedule": timedelta(hours=1),
+                "args": (),
+            },
             "waldur-marketplace-calculate-usage": {
                 "task": "waldur_mastermind.marketplace.calculate_usage_for_current_month",
                 "schedule": timedelta(hours=1),
@@ -525,6 +525,9 @@ class ComponentUsageFilter(django_filters.FilterSet):
     )
     date_before = django_filters.DateFilter(field_name="date__date", lookup_expr="lte")
     date_after = django_filters.DateFilter(field_name="date__date", lookup_expr="gte")
+    modified_after = django_filters.IsoDateTimeFilter(
+        field_name="modified", lookup_expr="gte"
+    )
     type = django_filters.CharFilter(field_name="component__type")
 
     class Meta:
@@ -1,6 +1,7 @@
 import logging
 
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import transaction
 from django.db.models import signals
@@ -1076,3 +1077,70 @@ def log_resource_user_deleted(sender, instance: models.ResourceUser, **kwargs):
             "resource_user": instance,
         },
     )
+
+
+# Changes of the same service provider within this delay are folded into a single update
+SERVICE_PROVIDER_STAT_UPDATE_DELAY = 60
+
+
+def schedule_service_provider_stat_update(customer_id):
+    def schedule():
+        # Stat is calculated when task is run, so changes committed
+        # while lease is held are taken into account by scheduled task.
+        if cache.add(
+            f"service_provider_stat_update:{customer_id}",
+            True,
+            timeout=SERVICE_PROVIDER_STAT_UPDATE_DELAY,
+        ):
+            tasks.update_service_provider_stat.apply_async(
+                args=(customer_id,), countdown=SERVICE_PROVIDER_STAT_UPDATE_DELAY
+            )
+
+    transaction.on_commit(schedule)
+
+
+def update_service_provider_stat_on_resource_change(
+    sender, instance, created=False, **kwargs
+):
+    if not created and not instance.tracker.has_changed("state"):
+        return
+    schedule_service_provider_stat_update(instance.offering.customer_id)
+
+
+def update_service_provider_stat_on_resource_deletion(sender, instance, **kwargs):
+    schedule_service_provider_stat_update(instance.offering.customer_id)
+
+
+def update_service_provider_stat_on_order_change(
+    sender, instance, created=False, **kwargs
+):
+    if not created and not instance.tracker.has_changed("state"):
+        return
+    schedule_service_provider_stat_update(instance.offering.customer_id)
+
+
+def update_service_provider_stat_on_offering_change(
+    sender, instance, created=False, **kwargs
+):
+    if not created and not set(instance.tracker.changed()) & {
+        "state",
+        "billable",
+        "shared",
+        "customer_id",
+    }:
+        return
+    schedule_service_provider_stat_update(instance.customer_id)
+
+
+def update_service_provider_stat_on_campaign_change(sender, instance, **kwargs):
+    schedule_service_provider_stat_update(instance.service_provider.customer_id)
+
+
+def update_service_provider_stat_on_issue_change(
+    sender, instance, created=False, **kwargs
+):
+    if not created and not instance.tracker.has_changed("status"):
+        return
+    resource = instance.resource
+    if isinstance(resource, models.Resource):
+        schedule_service_provider_stat_update(resource.offering.customer_id)
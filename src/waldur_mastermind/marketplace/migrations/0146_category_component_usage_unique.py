@@ -0,0 +1,33 @@
+# Generated by Django 4.2.16 on 2026-10-17 08:50
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def delete_duplicate_usages(apps, schema_editor):
+    CategoryComponentUsage = apps.get_model("marketplace", "CategoryComponentUsage")
+    latest_ids = (
+        CategoryComponentUsage.objects.values(
+            "content_type", "object_id", "component", "date"
+        )
+        .annotate(latest_id=Max("id"))
+        .values_list("latest_id", flat=True)
+    )
+    CategoryComponentUsage.objects.exclude(id__in=list(latest_ids)).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("marketplace", "0145_clean_price_logs"),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_usages, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="categorycomponentusage",
+            constraint=models.UniqueConstraint(
+                fields=("content_type", "object_id", "component", "date"),
+                name="unique_category_component_usage",
+            ),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.16 on 2026-10-17 08:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("marketplace", "0146_category_component_usage_unique"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ServiceProviderStat",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("active_campaigns", models.PositiveIntegerField(default=0)),
+                ("current_customers", models.PositiveIntegerField(default=0)),
+                ("customers_number_change", models.IntegerField(default=0)),
+                ("active_resources", models.PositiveIntegerField(default=0)),
+                ("resources_number_change", models.IntegerField(default=0)),
+                ("active_and_paused_offerings", models.PositiveIntegerField(default=0)),
+                ("unresolved_tickets", models.PositiveIntegerField(default=0)),
+                ("pending_orders", models.PositiveIntegerField(default=0)),
+                ("erred_resources", models.PositiveIntegerField(default=0)),
+                ("modified", models.DateTimeField(auto_now=True)),
+                (
+                    "service_provider",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stat",
+                        to="marketplace.serviceprovider",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -108,6 +108,30 @@ class ServiceProvider(
         super().save(*args, **kwargs)
 
 
+class ServiceProviderStat(models.Model):
+    """
+    Statistics rendered in service provider dashboard.
+    It is updated when related objects are changed and by periodic task.
+    """
+
+    service_provider = models.OneToOneField(
+        ServiceProvider, on_delete=models.CASCADE, related_name="stat"
+    )
+    active_campaigns = models.PositiveIntegerField(default=0)
+    current_customers = models.PositiveIntegerField(default=0)
+    customers_number_change = models.IntegerField(default=0)
+    active_resources = models.PositiveIntegerField(default=0)
+    resources_number_change = models.IntegerField(default=0)
+    active_and_paused_offerings = models.PositiveIntegerField(default=0)
+    unresolved_tickets = models.PositiveIntegerField(default=0)
+    pending_orders = models.PositiveIntegerField(default=0)
+    erred_resources = models.PositiveIntegerField(default=0)
+    modified = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return str(self.service_provider)
+
+
 class CategoryGroup(
     core_models.UuidMixin,
     TimeStampedModel,
@@ -348,6 +372,14 @@ class CategoryComponentUsage(core_mixins.ScopeMixin):
     fixed_usage = models.BigIntegerField(null=True)
     objects = managers.MixinManager("scope")
 
+    class Meta:
+        constraints = [
+            UniqueConstraint(
+                fields=["content_type", "object_id", "component", "date"],
+                name="unique_category_component_usage",
+            ),
+        ]
+
     def __str__(self):
         return f"component: {str(self.component.name)}, date: {self.date}"
 
@@ -1,4 +1,7 @@
+import collections
+import functools
 import logging
+import operator
 from datetime import timedelta
 
 from django.core.exceptions import ObjectDoesNotExist
@@ -11,6 +14,7 @@ from waldur_mastermind.common import mixins as common_mixins
 from waldur_mastermind.common.utils import parse_datetime
 from waldur_mastermind.invoices import models as invoice_models
 from waldur_mastermind.invoices import registrators
+from waldur_mastermind.invoices import signals as invoice_signals
 from waldur_mastermind.invoices.registrators import RegistrationManager
 from waldur_mastermind.invoices.utils import get_current_month_end, get_full_days
 from waldur_mastermind.marketplace import PLUGIN_NAME, utils
@@ -47,11 +51,10 @@ class MarketplaceRegistrator(registrators.BaseRegistrator):
             )
         )
 
-    def get_sources(self, customer):
+    def _get_sources(self):
         return (
             marketplace_models.Resource.objects.filter(
                 offering__type=self.plugin_name,
-                project__customer=customer,
             )
             .exclude(
                 state__in=[
@@ -62,12 +65,28 @@ class MarketplaceRegistrator(registrators.BaseRegistrator):
             .distinct()
         )
 
+    def get_sources(self, customer):
+        return self._get_sources().filter(project__customer=customer)
+
+    def get_sources_for_customers(self, customers):
+        sources = (
+            self._get_sources()
+            .filter(project__customer__in=customers)
+            .select_related("project", "plan", "offering", "offering__customer")
+            .prefetch_related("plan__components__component")
+        )
+        result = collections.defaultdict(list)
+        for source in sources:
+            result[source.project.customer_id].append(source)
+        return result
+
     def get_customer(self, source):
         return source.project.customer
 
-    def _create_item(self, source, invoice, start, end, **kwargs):
+    def _build_items(self, source, invoice, start, end, **kwargs):
         resource = source
         plan = resource.plan
+        items = []
 
         if not plan:
             logger.warning(
@@ -76,7 +95,7 @@ class MarketplaceRegistrator(registrators.BaseRegistrator):
                 "Resource ID: %s",
                 resource.id,
             )
-            return
+            return items
 
         order_type = kwargs.get("order_type")
 
@@ -91,15 +110,16 @@ class MarketplaceRegistrator(registrators.BaseRegistrator):
             if is_limit:
                 # Avoid creating invoice item for limit-based components
                 # if limit period is total and resource is not being created
-                if offering_component.limit_period == LimitPeriods.TOTAL:
-                    if order_type == OrderTypes.CREATE:
-                        self.create_component_item(
-                            source, plan_component, invoice, start, end
-                        )
-                        continue
-                    else:
-                        continue
-                self.create_component_item(source, plan_component, invoice, start, end)
+                if (
+                    offering_component.limit_period == LimitPeriods.TOTAL
+                    and order_type != OrderTypes.CREATE
+                ):
+                    continue
+                item = self.build_component_item(
+                    source, plan_component, invoice, start, end
+                )
+                if item:
+                    items.append(item)
                 continue
 
             if (
@@ -136,21 +156,26 @@ class MarketplaceRegistrator(registrators.BaseRegistrator):
                     details["campaign_uuid"] = campaign.uuid.hex
                     details["unit_price"] = float(unit_price)
 
-                invoice_models.InvoiceItem.objects.create(
-                    name=name,
-                    details=details,
-                    resource=resource,
-                    project=resource.project,
-                    invoice=invoice,
-                    start=start,
-                    end=end,
-                    unit_price=discounted_unit_price,
-                    unit=unit,
-                    quantity=quantity,
-                    measured_unit=plan_component.component.measured_unit,
-                    article_code=offering_component.article_code or plan.article_code,
+                items.append(
+                    invoice_models.InvoiceItem(
+                        name=name,
+                        details=details,
+                        resource=resource,
+                        project=resource.project,
+                        invoice=invoice,
+                        start=start,
+                        end=end,
+                        unit_price=discounted_unit_price,
+                        unit=unit,
+                        quantity=quantity,
+                        measured_unit=plan_component.component.measured_unit,
+                        article_code=offering_component.article_code
+                        or plan.article_code,
+                    )
                 )
 
+        return items
+
     @classmethod
     def get_component_details(cls, resource, plan_component):
         customer = resource.offering.customer
@@ -187,6 +212,12 @@ class MarketplaceRegistrator(registrators.BaseRegistrator):
 
     @classmethod
     def create_component_item(cls, source, plan_component, invoice, start, end):
+        item = cls.build_component_item(source, plan_component, invoice, start, end)
+        if item:
+            item.save()
+
+    @classmethod
+    def build_component_item(cls, source, plan_component, invoice, start, end):
         offering_component = plan_component.component
         limit = source.limits.get(offering_component.type, 0)
         if not limit or limit == -1:
@@ -209,7 +240,7 @@ class MarketplaceRegistrator(registrators.BaseRegistrator):
         ):
             unit = invoice_models.Units.QUANTITY
 
-        invoice_models.InvoiceItem.objects.create(
+        return invoice_models.InvoiceItem(
             name=f"{RegistrationManager.get_name(source)} / {cls.get_component_name(plan_component)}",
             resource=source,
             project=source.project,
@@ -534,6 +565,164 @@ class MarketplaceRegistrator(registrators.BaseRegistrator):
                 invoice_item.quantity,
             )
 
+    @classmethod
+    def update_invoices_when_usages_are_reported(cls, component_usages):
+        """
+        Set-based counterpart of update_invoice_when_usage_is_reported.
+        It is used when usages are stored in bulk so that post_save is not sent.
+        """
+        component_usages = [
+            component_usage
+            for component_usage in component_usages
+            if component_usage.component.billing_type == BillingTypes.USAGE
+            and component_usage.plan_period
+        ]
+        if not component_usages:
+            return
+
+        billing_periods = {
+            (component_usage.billing_period.year, component_usage.billing_period.month)
+            for component_usage in component_usages
+        }
+        items_map = collections.defaultdict(list)
+        for item in invoice_models.InvoiceItem.objects.filter(
+            functools.reduce(
+                operator.or_,
+                [
+                    Q(invoice__year=year, invoice__month=month)
+                    for year, month in billing_periods
+                ],
+            ),
+            resource__in={
+                component_usage.resource_id for component_usage in component_usages
+            },
+            details__offering_component_type__in={
+                component_usage.component.type for component_usage in component_usages
+            },
+        ).select_related("invoice"):
+            key = (
+                item.resource_id,
+                item.details["offering_component_type"],
+                item.invoice.year,
+                item.invoice.month,
+            )
+            items_map[key].append(item)
+
+        plan_components = {
+            (plan_component.plan_id, plan_component.component_id): plan_component
+            for plan_component in marketplace_models.PlanComponent.objects.filter(
+                plan__in={
+                    component_usage.plan_period.plan_id
+                    for component_usage in component_usages
+                },
+                component__in={
+                    component_usage.component_id for component_usage in component_usages
+                },
+            ).select_related("component")
+        }
+
+        invoices = {}
+        updated_items = []
+        new_items = []
+        for component_usage in component_usages:
+            resource = component_usage.resource
+            offering_component = component_usage.component
+            plan_period = component_usage.plan_period
+            quantity = cls.convert_quantity(
+                component_usage.usage, offering_component.type
+            )
+            billing_period = component_usage.billing_period
+            period_start = plan_period.start or core_utils.month_start(billing_period)
+            period_end = plan_period.end or core_utils.month_end(billing_period)
+            key = (
+                resource.id,
+                offering_component.type,
+                billing_period.year,
+                billing_period.month,
+            )
+            item = next(
+                (
+                    item
+                    for item in items_map[key]
+                    if item.start >= period_start and item.end <= period_end
+                ),
+                None,
+            )
+            if item:
+                if item.quantity != quantity:
+                    item.quantity = quantity
+                    updated_items.append(item)
+                continue
+
+            plan_component = plan_components.get(
+                (plan_period.plan_id, offering_component.id)
+            )
+            if not plan_component:
+                logger.warning(
+                    "Skipping processing of component usage %s (ID %s) because "
+                    "plan component is not defined.",
+                    component_usage,
+                    component_usage.id,
+                )
+                continue
+
+            date = component_usage.date
+            project = resource.project
+            invoice_key = (project.customer_id, date.year, date.month)
+            if invoice_key not in invoices:
+                invoices[invoice_key], _ = RegistrationManager.get_or_create_invoice(
+                    project.customer, date
+                )
+
+            month_start = core_utils.month_start(date)
+            month_end = core_utils.month_end(date)
+            new_items.append(
+                invoice_models.InvoiceItem(
+                    resource=resource,
+                    project=project,
+                    project_name=project.name,
+                    project_uuid=project.uuid.hex,
+                    invoice=invoices[invoice_key],
+                    start=max(plan_period.start, month_start)
+                    if plan_period.start
+                    else month_start,
+                    end=min(plan_period.end, month_end)
+                    if plan_period.end
+                    else month_end,
+                    details=cls.get_component_details(resource, plan_component),
+                    unit_price=plan_component.price,
+                    quantity=quantity,
+                    unit=common_mixins.UnitPriceMixin.Units.QUANTITY,
+                    measured_unit=offering_component.measured_unit,
+                    article_code=offering_component.article_code
+                    or plan_period.plan.article_code,
+                    name=resource.name + " / " + offering_component.name,
+                )
+            )
+
+        items = updated_items + new_items
+        if not items:
+            return
+
+        with transaction.atomic():
+            invoice_models.InvoiceItem.objects.bulk_update(
+                updated_items, ["quantity"], batch_size=1000
+            )
+            invoice_models.InvoiceItem.objects.bulk_create(new_items, batch_size=1000)
+            invoice_ids = {item.invoice_id for item in items}
+            invoice_models.Invoice.objects.filter(id__in=invoice_ids).update_totals()
+            invoice_models.InvoiceCost.objects.refresh(invoice_ids)
+
+        logger.info(
+            "Invoice items have been processed for component usages, "
+            "updated: %s, created: %s",
+            len(updated_items),
+            len(new_items),
+        )
+        invoice_signals.invoice_items_updated.send(
+            sender=invoice_models.InvoiceItem, invoice_items=items
+        )
+
     @classmethod
     def convert_quantity(cls, usage, component_type: str):
         return usage
@@ -558,3 +747,18 @@ class MarketplaceRegistrator(registrators.BaseRegistrator):
             dispatch_uid="waldur_mastermind.marketplace."
             "update_invoice_when_usage_is_reported_%s" % cls.__name__,
         )
+
+
+def update_invoices_when_usages_are_reported(component_usages):
+    """Dispatch usages stored in bulk to registrators of their offerings."""
+    usages_map = collections.defaultdict(list)
+    for component_usage in component_usages:
+        usages_map[component_usage.resource.offering.type].append(component_usage)
+
+    for usages in usages_map.values():
+        try:
+            registrator = RegistrationManager.get_registrator(usages[0].resource)
+        except KeyError:
+            continue
+        if isinstance(registrator, MarketplaceRegistrator):
+            registrator.update_invoices_when_usages_are_reported(usages)
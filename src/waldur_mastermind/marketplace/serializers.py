@@ -1,3 +1,4 @@
+import collections
 import datetime
 import logging
 from decimal import Decimal
@@ -2805,6 +2806,43 @@ class ComponentUsageItemSerializer(serializers.Serializer):
     recurring = serializers.BooleanField(default=False)
 
 
+def validate_plan_period_is_open(plan_period):
+    date = datetime.date.today()
+    if plan_period.end and plan_period.end < core_utils.month_start(date):
+        raise serializers.ValidationError(_("Billing period is closed."))
+
+
+def validate_component_usages(attrs, components):
+    """
+    Validate usages reported either for plan period or resource and return the resource.
+    Components is a map from type to offering component which usage could be reported for.
+    """
+    plan_period = attrs.get("plan_period")
+    resource = plan_period and plan_period.resource or attrs.get("resource")
+    if not resource:
+        raise rf_exceptions.ValidationError(
+            _("Either plan_period or resource should be provided.")
+        )
+
+    States = models.Resource.States
+    if resource.state not in (States.OK, States.UPDATING, States.TERMINATING):
+        raise rf_exceptions.ValidationError(
+            {"resource": _("Resource is not in valid state.")}
+        )
+
+    valid_components = set(components(resource.offering))
+    actual_components = {usage["type"] for usage in attrs["usages"]}
+
+    invalid_components = ", ".join(sorted(actual_components - valid_components))
+
+    if invalid_components:
+        raise rf_exceptions.ValidationError(
+            _("These components are invalid: %s.") % invalid_components
+        )
+
+    return resource
+
+
 class ComponentUsageCreateSerializer(serializers.Serializer):
     usages = ComponentUsageItemSerializer(many=True)
     plan_period = serializers.SlugRelatedField(
@@ -2817,9 +2855,7 @@ class ComponentUsageCreateSerializer(serializers.Serializer):
     )
 
     def validate_plan_period(self, plan_period):
-        date = datetime.date.today()
-        if plan_period.end and plan_period.end < core_utils.month_start(date):
-            raise serializers.ValidationError(_("Billing period is closed."))
+        validate_plan_period_is_open(plan_period)
         return plan_period
 
     @classmethod
@@ -2832,30 +2868,7 @@ class ComponentUsageCreateSerializer(serializers.Serializer):
 
     def validate(self, attrs):
         attrs = super().validate(attrs)
-        plan_period = attrs.get("plan_period")
-        resource = plan_period and plan_period.resource or attrs.get("resource")
-        if not resource:
-            raise rf_exceptions.ValidationError(
-                _("Either plan_period or resource should be provided.")
-            )
-        offering = resource.offering
-
-        States = models.Resource.States
-        if resource.state not in (States.OK, States.UPDATING, States.TERMINATING):
-            raise rf_exceptions.ValidationError(
-                {"resource": _("Resource is not in valid state.")}
-            )
-
-        valid_components = set(self.get_components_map(offering))
-        actual_components = {usage["type"] for usage in attrs["usages"]}
-
-        invalid_components = ", ".join(sorted(actual_components - valid_components))
-
-        if invalid_components:
-            raise rf_exceptions.ValidationError(
-                _("These components are invalid: %s.") % invalid_components
-            )
-
+        validate_component_usages(attrs, self.get_components_map)
         return attrs
 
     def save(self):
@@ -2863,57 +2876,115 @@ class ComponentUsageCreateSerializer(serializers.Serializer):
         resource = (
             plan_period and plan_period.resource or self.validated_data.get("resource")
         )
-
-        components_map = self.get_components_map(resource.plan.offering)
-        now = timezone.now()
-        billing_period = core_utils.month_start(now)
         user: User = self.context["request"].user
         if user.is_anonymous:
             user = None
 
-        for usage in self.validated_data["usages"]:
-            amount = usage["amount"]
-            description = usage.get("description", "")
-            component = components_map[usage["type"]]
-            recurring = usage["recurring"]
-            if component.billing_type == models.OfferingComponent.BillingTypes.USAGE:
-                component.validate_amount(resource, amount, now)
+        entry = {
+            "resource": resource,
+            "plan_period": plan_period,
+            "usages": self.validated_data["usages"],
+            "components": self.get_components_map(resource.plan.offering),
+        }
+        utils.set_component_usages([entry], user)
 
-            models.ComponentUsage.objects.filter(
-                resource=resource,
-                component=component,
-                billing_period=billing_period,
-            ).update(recurring=False)
 
+class ComponentUsageBatchItemSerializer(serializers.Serializer):
+    usages = ComponentUsageItemSerializer(many=True)
+    plan_period = serializers.UUIDField(required=False)
+    resource = serializers.UUIDField(required=False)
+
+
+class ComponentUsageBatchCreateSerializer(serializers.Serializer):
+    """
+    Validates entries the same way as ComponentUsageCreateSerializer,
+    but plan periods, resources and components are loaded in bulk.
+    Errors are reported as a list aligned with entries.
+    """
+
+    resources = ComponentUsageBatchItemSerializer(many=True, allow_empty=False)
+
+    def resolve_entry(self, entry, plan_periods, resources):
+        attrs = {"usages": entry["usages"]}
+        if "plan_period" in entry:
+            plan_period = plan_periods.get(entry["plan_period"])
             if not plan_period:
-                plan_period = utils.get_plan_period(resource, now)
-
-            usage, created = models.ComponentUsage.objects.update_or_create(
-                resource=resource,
-                component=component,
-                plan_period=plan_period,
-                billing_period=billing_period,
-                defaults={
-                    "usage": amount,
-                    "date": now,
-                    "description": description,
-                    "recurring": recurring,
-                    "modified_by": user,
-                },
-            )
-            if created:
-                logger.info(
-                    f"Usage has been created for {resource}, component: {component.type}, value: {amount}"
+                raise rf_exceptions.ValidationError(
+                    {"plan_period": _("Plan period does not exist.")}
                 )
-            else:
-                logger.info(
-                    f"Usage has been updated for {resource}, component: {component.type}, value: {amount}"
+            try:
+                validate_plan_period_is_open(plan_period)
+            except serializers.ValidationError as e:
+                raise rf_exceptions.ValidationError({"plan_period": e.detail})
+            attrs["plan_period"] = plan_period
+        elif "resource" in entry:
+            resource = resources.get(entry["resource"])
+            if not resource:
+                raise rf_exceptions.ValidationError(
+                    {"resource": _("Resource does not exist.")}
                 )
-        resource.current_usages = {
-            usage["type"]: str(usage["amount"])
-            for usage in self.validated_data["usages"]
+            attrs["resource"] = resource
+        return attrs
+
+    def validate_resources(self, entries):
+        plan_periods = {
+            plan_period.uuid: plan_period
+            for plan_period in models.ResourcePlanPeriod.objects.filter(
+                uuid__in=[
+                    entry["plan_period"] for entry in entries if "plan_period" in entry
+                ]
+            ).select_related(
+                "resource__offering", "resource__plan", "resource__project"
+            )
+        }
+        resources = {
+            resource.uuid: resource
+            for resource in models.Resource.objects.filter(
+                uuid__in=[entry["resource"] for entry in entries if "resource" in entry]
+            ).select_related("offering", "plan", "project")
         }
-        resource.save(update_fields=["current_usages"])
+        offering_ids = {
+            plan_period.resource.offering_id for plan_period in plan_periods.values()
+        } | {resource.offering_id for resource in resources.values()}
+        components_map = collections.defaultdict(dict)
+        for component in models.OfferingComponent.objects.filter(
+            offering__in=offering_ids,
+            billing_type__in=[BillingTypes.USAGE, BillingTypes.LIMIT],
+        ):
+            components_map[component.offering_id][component.type] = component
+
+        def get_components(offering):
+            return components_map[offering.id]
+
+        validated_entries = []
+        errors = []
+        for entry in entries:
+            try:
+                attrs = self.resolve_entry(entry, plan_periods, resources)
+                resource = validate_component_usages(attrs, get_components)
+            except rf_exceptions.ValidationError as e:
+                errors.append(e.detail)
+                continue
+            errors.append({})
+            validated_entries.append(
+                {
+                    "resource": resource,
+                    "plan_period": attrs.get("plan_period"),
+                    "usages": entry["usages"],
+                    "components": get_components(resource.offering),
+                }
+            )
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
+
+        return validated_entries
+
+    def save(self):
+        user: User = self.context["request"].user
+        if user.is_anonymous:
+            user = None
+        utils.set_component_usages(self.validated_data["resources"], user)
 
 
 class OfferingFileSerializer(
@@ -3294,7 +3365,7 @@ class CostsSerializer(serializers.Serializer):
     total = serializers.SerializerMethodField()
 
     def get_period(self, record):
-        return "%s-%02d" % (record["invoice__year"], record["invoice__month"])
+        return "%s-%02d" % (record["year"], record["month"])
 
     def get_total(self, record):
         return round(record["computed_tax"] + record["computed_price"], 2)
@@ -3333,11 +3404,11 @@ class OfferingComponentStatSerializer(serializers.Serializer):
         return record["total_quantity"]
 
     def get_period(self, record):
-        return "%s-%02d" % (record["invoice__year"], record["invoice__month"])
+        return "%s-%02d" % (record["year"], record["month"])
 
     def get_component_attr(self, record, attrname):
         component = self.context["offering_components_map"].get(
-            record["details__offering_component_type"]
+            record["component_type"]
         )
         return component and getattr(component, attrname)
 
@@ -3804,10 +3875,26 @@ class RobotAccountDetailsSerializer(RobotAccountSerializer):
         ).data
 
 
+class ServiceProviderStatSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = models.ServiceProviderStat
+        fields = (
+            "active_campaigns",
+            "current_customers",
+            "customers_number_change",
+            "active_resources",
+            "resources_number_change",
+            "active_and_paused_offerings",
+            "unresolved_tickets",
+            "pending_orders",
+            "erred_resources",
+        )
+
+
 class ServiceProviderRevenues(serializers.Serializer):
     total = serializers.IntegerField()
-    year = serializers.CharField(source="invoice__year")
-    month = serializers.CharField(source="invoice__month")
+    year = serializers.CharField()
+    month = serializers.CharField()
 
 
 class SectionSerializer(serializers.HyperlinkedModelSerializer):
@@ -11,3 +11,7 @@ resource_creation_succeeded = Signal()
 
 # providing_args=['instance']
 resource_deletion_succeeded = Signal()
+
+# Sent when component usages are created or updated in bulk, so that post_save is not sent
+# providing_args=['component_usages']
+component_usages_updated = Signal()
@@ -129,87 +129,101 @@ def notify_about_resource_change(event_type, context, resource_uuid):
     core_utils.broadcast_mail("marketplace", event_type, context, emails)
 
 
-def filter_aggregate_by_scope(queryset, scope):
-    scope_path = None
-
-    if isinstance(scope, structure_models.Project):
-        scope_path = "resource__project"
-
-    if isinstance(scope, structure_models.Customer):
-        scope_path = "resource__project__customer"
-
-    if scope_path:
-        queryset = queryset.filter(**{scope_path: scope})
-
-    return queryset
-
-
-def aggregate_reported_usage(start, end, scope):
-    queryset = models.ComponentUsage.objects.filter(
-        date__date__gte=start, date__date__lte=end
-    ).exclude(component__parent=None)
-
-    queryset = filter_aggregate_by_scope(queryset, scope)
-
-    queryset = queryset.values("component__parent_id").annotate(total=Sum("usage"))
-
-    return {row["component__parent_id"]: row["total"] for row in queryset}
-
-
-def aggregate_fixed_usage(start, end, scope):
-    queryset = models.ResourcePlanPeriod.objects.filter(
-        # Resource has been active during billing period
-        Q(start__gte=start, end__lte=end)
-        | Q(end__isnull=True)  # Resource is still active
-        | Q(
-            end__gte=start, end__lte=end
-        )  # Resource has been launched in previous billing period and stopped in current
+def aggregate_reported_usage(start, end):
+    """Return reported usage grouped by project, its customer and parent component."""
+    return (
+        models.ComponentUsage.objects.filter(date__date__gte=start, date__date__lte=end)
+        .exclude(component__parent=None)
+        .values(
+            "resource__project_id",
+            "resource__project__customer_id",
+            category_component_id=F("component__parent_id"),
+        )
+        .annotate(total=Sum("usage"))
+        .order_by()
     )
-    queryset = filter_aggregate_by_scope(queryset, scope)
 
-    queryset = queryset.values("plan__components__component__parent_id").annotate(
-        total=Sum("plan__components__amount")
-    )
 
-    return {
-        row["plan__components__component__parent_id"]: row["total"] for row in queryset
-    }
+def aggregate_fixed_usage(start, end):
+    """Return fixed usage grouped by project, its customer and parent component."""
+    return (
+        models.ResourcePlanPeriod.objects.filter(
+            # Resource has been active during billing period
+            Q(start__gte=start, end__lte=end)
+            | Q(end__isnull=True)  # Resource is still active
+            | Q(
+                end__gte=start, end__lte=end
+            )  # Resource has been launched in previous billing period and stopped in current
+        )
+        .values(
+            "resource__project_id",
+            "resource__project__customer_id",
+            category_component_id=F("plan__components__component__parent_id"),
+        )
+        .annotate(total=Sum("plan__components__amount"))
+        .order_by()
+    )
 
 
-def calculate_usage_for_scope(start, end, scope):
-    reported_usage = aggregate_reported_usage(start, end, scope)
-    fixed_usage = aggregate_fixed_usage(start, end, scope)
-    # It needs to cover a case when a key is None because OfferingComponent.parent can be None.
-    fixed_usage.pop(None, None)
-    components = set(reported_usage.keys()) | set(fixed_usage.keys())
-    content_type = ContentType.objects.get_for_model(scope)
-
-    for component_id in components:
-        models.CategoryComponentUsage.objects.update_or_create(
-            content_type=content_type,
-            object_id=scope.id,
-            component_id=component_id,
-            date=start,
-            defaults={
-                "reported_usage": reported_usage.get(component_id),
-                "fixed_usage": fixed_usage.get(component_id),
-            },
+def summarize_usage_by_scope(rows, project_ids):
+    """
+    Return dictionary where key is tuple of scope content type ID, scope ID and component ID.
+    Usage of customer is a sum of usages of all its projects, including removed ones.
+    """
+    project_type = ContentType.objects.get_for_model(structure_models.Project)
+    customer_type = ContentType.objects.get_for_model(structure_models.Customer)
+    result = collections.defaultdict(int)
+    for row in rows:
+        # Component parent is not defined or plan does not have components
+        component_id = row["category_component_id"]
+        if component_id is None or row["total"] is None:
+            continue
+        customer_key = (
+            customer_type.id,
+            row["resource__project__customer_id"],
+            component_id,
         )
+        result[customer_key] += row["total"]
+        if row["resource__project_id"] in project_ids:
+            project_key = (project_type.id, row["resource__project_id"], component_id)
+            result[project_key] += row["total"]
+    return result
 
 
 @shared_task(name="waldur_mastermind.marketplace.calculate_usage_for_current_month")
 def calculate_usage_for_current_month():
     start = invoice_utils.get_current_month_start()
     end = invoice_utils.get_current_month_end()
-    scopes = []
-
-    for customer in structure_models.Customer.objects.all():
-        scopes.append(customer)
-        for project in customer.projects.all():
-            scopes.append(project)
-
-    for scope in scopes:
-        calculate_usage_for_scope(start, end, scope)
+    project_ids = set(
+        structure_models.Project.available_objects.values_list("id", flat=True)
+    )
+    reported_usage = summarize_usage_by_scope(
+        aggregate_reported_usage(start, end), project_ids
+    )
+    fixed_usage = summarize_usage_by_scope(
+        aggregate_fixed_usage(start, end), project_ids
+    )
+    keys = set(reported_usage.keys()) | set(fixed_usage.keys())
+
+    models.CategoryComponentUsage.objects.bulk_create(
+        [
+            models.CategoryComponentUsage(
+                content_type_id=content_type_id,
+                object_id=object_id,
+                component_id=component_id,
+                date=start,
+                reported_usage=reported_usage.get(
+                    (content_type_id, object_id, component_id)
+                ),
+                fixed_usage=fixed_usage.get((content_type_id, object_id, component_id)),
+            )
+            for content_type_id, object_id, component_id in keys
+        ],
+        update_conflicts=True,
+        unique_fields=["content_type", "object_id", "component", "date"],
+        update_fields=["reported_usage", "fixed_usage"],
+        batch_size=1000,
+    )
 
 
 @shared_task
@@ -532,3 +546,29 @@ def process_pending_project_orders():
             transaction.on_commit(
                 lambda: notify_provider_about_pending_order.delay(order.uuid)
             )
+
+
+@shared_task(name="waldur_mastermind.marketplace.update_service_provider_stat")
+def update_service_provider_stat(customer_id):
+    try:
+        service_provider = models.ServiceProvider.objects.get(customer_id=customer_id)
+    except models.ServiceProvider.DoesNotExist:
+        return
+    utils.update_service_provider_stat(service_provider)
+
+
+@shared_task(name="waldur_mastermind.marketplace.update_service_providers_stats")
+def update_service_providers_stats():
+    """
+    Stats are updated when related objects are changed,
+    this task covers changes which depend on current date or are not tracked by signals.
+    """
+    for service_provider in models.ServiceProvider.objects.select_related("customer"):
+        try:
+            utils.update_service_provider_stat(service_provider)
+        except Exception as e:
+            logger.exception(
+                "Unable to update stat of service provider %s. Error: %s",
+                service_provider,
+                e,
+            )
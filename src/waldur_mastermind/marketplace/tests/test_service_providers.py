@@ -1,4 +1,7 @@
+from unittest import mock
+
 from ddt import data, ddt
+from django.core.cache import cache
 from rest_framework import status, test
 
 from waldur_core.media.utils import dummy_image
@@ -7,7 +10,7 @@ from waldur_core.permissions.fixtures import CustomerRole, ProjectRole
 from waldur_core.permissions.utils import get_permissions
 from waldur_core.structure.tests import factories as structure_factories
 from waldur_core.structure.tests import fixtures as structure_fixtures
-from waldur_mastermind.marketplace import models, utils
+from waldur_mastermind.marketplace import handlers, models, tasks, utils
 from waldur_mastermind.marketplace.tests import fixtures
 from waldur_mastermind.marketplace.tests.helpers import override_marketplace_settings
 from waldur_mastermind.marketplace_support import PLUGIN_NAME
@@ -506,3 +509,67 @@ class ServiceProviderUserCustomersTest(test.APITransactionTestCase):
         self.client.force_authenticate(self.fixture.staff)
         response = self.client.get(self.url, {"user_uuid": self.fixture.user.uuid.hex})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class ServiceProviderStatTest(test.APITransactionTestCase):
+    def setUp(self):
+        self.fixture = fixtures.MarketplaceFixture()
+        self.service_provider = self.fixture.service_provider
+        self.resource = self.fixture.resource
+        self.resource.state = models.Resource.States.OK
+        self.resource.save()
+        self.url = factories.ServiceProviderFactory.get_url(
+            self.service_provider, "stat"
+        )
+
+    def test_stat_is_calculated_if_it_does_not_exist(self):
+        self.client.force_authenticate(self.fixture.staff)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["active_resources"], 1)
+        self.assertEqual(response.data["current_customers"], 1)
+        self.assertEqual(response.data["erred_resources"], 0)
+        self.assertTrue(
+            models.ServiceProviderStat.objects.filter(
+                service_provider=self.service_provider
+            ).exists()
+        )
+
+    def test_stat_is_read_from_snapshot(self):
+        models.ServiceProviderStat.objects.create(
+            service_provider=self.service_provider, pending_orders=7
+        )
+        self.client.force_authenticate(self.fixture.staff)
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["pending_orders"], 7)
+
+    @mock.patch("waldur_mastermind.marketplace.handlers.tasks")
+    def test_stat_update_is_scheduled_when_resource_state_is_changed(self, mock_tasks):
+        cache.clear()
+        self.resource.state = models.Resource.States.ERRED
+        self.resource.save()
+        mock_tasks.update_service_provider_stat.apply_async.assert_called_once_with(
+            args=(self.service_provider.customer_id,),
+            countdown=handlers.SERVICE_PROVIDER_STAT_UPDATE_DELAY,
+        )
+
+    @mock.patch("waldur_mastermind.marketplace.handlers.tasks")
+    def test_stat_update_is_scheduled_once_for_many_changes(self, mock_tasks):
+        cache.clear()
+        for state in (models.Resource.States.ERRED, models.Resource.States.OK):
+            self.resource.state = state
+            self.resource.save()
+        self.assertEqual(
+            mock_tasks.update_service_provider_stat.apply_async.call_count, 1
+        )
+
+    def test_stat_is_updated_by_task(self):
+        tasks.update_service_provider_stat(self.service_provider.customer_id)
+        self.resource.state = models.Resource.States.ERRED
+        self.resource.save()
+        tasks.update_service_providers_stats()
+        stat = models.ServiceProviderStat.objects.get(
+            service_provider=self.service_provider
+        )
+        self.assertEqual(stat.erred_resources, 1)
+        self.assertEqual(stat.active_resources, 1)
@@ -52,6 +52,20 @@ class CalculateUsageForCurrentMonthTest(test.APITransactionTestCase):
         tasks.calculate_usage_for_current_month()
         self.assertEqual(models.CategoryComponentUsage.objects.count(), 0)
 
+    def test_usage_is_updated_when_it_is_calculated_again(self):
+        tasks.calculate_usage_for_current_month()
+        models.ComponentUsage.objects.update(usage=20)
+        tasks.calculate_usage_for_current_month()
+        self.assertEqual(models.CategoryComponentUsage.objects.count(), 2)
+        self.assertEqual(
+            {(20, 1)},
+            set(
+                models.CategoryComponentUsage.objects.values_list(
+                    "reported_usage", "fixed_usage"
+                )
+            ),
+        )
+
 
 class NotificationTest(test.APITransactionTestCase):
     def test_notify_about_resource_change(self):
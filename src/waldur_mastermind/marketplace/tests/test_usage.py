@@ -12,6 +12,7 @@ from waldur_core.permissions.fixtures import CustomerRole, ProjectRole
 from waldur_core.structure.tests import fixtures as structure_fixtures
 from waldur_mastermind.common.mixins import UnitPriceMixin
 from waldur_mastermind.common.utils import parse_datetime
+from waldur_mastermind.invoices.models import InvoiceItem
 from waldur_mastermind.marketplace import callbacks, models
 from waldur_mastermind.marketplace.tests import factories
 
@@ -504,6 +505,110 @@ class SubmitUsageTest(test.APITransactionTestCase):
         response = self.submit_usage()
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_batch_usage_is_submitted_for_many_resources(self):
+        resource2 = self.create_resource()
+        self.client.force_authenticate(self.fixture.owner)
+        response = self.client.post(
+            "/api/marketplace-component-usages/batch_set_usage/",
+            self.get_batch_usage_data([self.resource, resource2]),
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        for resource in [self.resource, resource2]:
+            self.assertEqual(
+                2, models.ComponentUsage.objects.filter(resource=resource).count()
+            )
+            items = InvoiceItem.objects.filter(resource=resource)
+            self.assertEqual(2, items.count())
+            self.assertEqual({5}, {item.quantity for item in items})
+            resource.refresh_from_db()
+            self.assertEqual(resource.current_usages, {"cpu": "5.00", "ram": "5.00"})
+
+    def test_batch_usage_updates_existing_usages_and_invoice_items(self):
+        self.client.force_authenticate(self.fixture.owner)
+        url = "/api/marketplace-component-usages/batch_set_usage/"
+        self.client.post(url, self.get_batch_usage_data([self.resource]))
+        response = self.client.post(
+            url, self.get_batch_usage_data([self.resource], amount=7)
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        usages = models.ComponentUsage.objects.filter(resource=self.resource)
+        self.assertEqual({7}, {usage.usage for usage in usages})
+        items = InvoiceItem.objects.filter(resource=self.resource)
+        self.assertEqual(2, items.count())
+        self.assertEqual({7}, {item.quantity for item in items})
+        invoice = items.first().invoice
+        invoice.refresh_from_db()
+        self.assertEqual(2 * 7 * self.component.price, invoice.total_price)
+
+    def test_batch_usage_is_not_submitted_for_invalid_component(self):
+        self.client.force_authenticate(self.fixture.owner)
+        payload = self.get_batch_usage_data([self.resource])
+        payload["resources"][0]["usages"][0]["type"] = "gpu"
+        response = self.client.post(
+            "/api/marketplace-component-usages/batch_set_usage/", payload
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data["resources"][0], ["These components are invalid: gpu."]
+        )
+        self.assertFalse(models.ComponentUsage.objects.exists())
+
+    def test_batch_usage_errors_are_reported_for_each_entry(self):
+        resource2 = self.create_resource()
+        resource2.set_state_terminated()
+        resource2.save()
+        self.client.force_authenticate(self.fixture.owner)
+        response = self.client.post(
+            "/api/marketplace-component-usages/batch_set_usage/",
+            self.get_batch_usage_data([self.resource, resource2]),
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["resources"][0], {})
+        self.assertEqual(
+            response.data["resources"][1]["resource"],
+            "Resource is not in valid state.",
+        )
+        self.assertFalse(models.ComponentUsage.objects.exists())
+
+    @data("admin", "manager", "user")
+    def test_other_user_can_not_submit_batch_usage(self, role):
+        self.client.force_authenticate(getattr(self.fixture, role))
+        response = self.client.post(
+            "/api/marketplace-component-usages/batch_set_usage/",
+            self.get_batch_usage_data([self.resource]),
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(models.ComponentUsage.objects.exists())
+
+    def create_resource(self):
+        resource = models.Resource.objects.create(
+            offering=self.offering,
+            plan=self.plan,
+            project=self.fixture.project,
+        )
+        factories.OrderFactory(
+            resource=resource,
+            type=models.RequestTypeMixin.Types.CREATE,
+            state=models.Order.States.EXECUTING,
+            plan=self.plan,
+        )
+        callbacks.resource_creation_succeeded(resource)
+        return resource
+
+    def get_batch_usage_data(self, resources, amount=5):
+        return {
+            "resources": [
+                {
+                    "resource": resource.uuid.hex,
+                    "usages": [
+                        {"type": "cpu", "amount": amount},
+                        {"type": "ram", "amount": amount},
+                    ],
+                }
+                for resource in resources
+            ]
+        }
+
     def submit_usage(self, **extra):
         payload = self.get_valid_payload()
         payload.update(extra)
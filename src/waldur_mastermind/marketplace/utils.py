@@ -19,7 +19,6 @@ from django.core.files.storage import default_storage as storage
 from django.db import transaction
 from django.db.models import F, Q, Sum
 from django.db.models.fields import FloatField
-from django.db.models.functions.math import Ceil
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from PIL import Image
@@ -53,7 +52,7 @@ from waldur_mastermind.marketplace_slurm_remote import (
 )
 
 from . import PLUGIN_NAME as BASIC_PLUGIN_NAME
-from . import models, plugins
+from . import models, plugins, signals
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -615,12 +614,15 @@ def add_marketplace_offering(sender, fields, **kwargs):
     setattr(sender, "get_is_limit_based", get_is_limit_based)
 
 
-def get_offering_costs(invoice_items):
-    price = Ceil(F("quantity") * F("unit_price") * 100) / 100
+def get_offering_costs(invoice_costs):
     tax_rate = F("invoice__tax_percent") / 100
-    return invoice_items.values("invoice__year", "invoice__month").annotate(
-        computed_price=Sum(price, output_field=FloatField()),
-        computed_tax=Sum(price * tax_rate, output_field=FloatField()),
+    return (
+        invoice_costs.values("year", "month")
+        .annotate(
+            computed_price=Sum("price", output_field=FloatField()),
+            computed_tax=Sum(F("price") * tax_rate, output_field=FloatField()),
+        )
+        .order_by("year", "month")
     )
 
 
@@ -889,6 +891,175 @@ def get_plan_period(resource, date):
     )
 
 
+def get_plan_periods(resources, date):
+    """
+    Bulk counterpart of get_plan_period.
+    Returns map from resource ID to its plan period active at given date.
+    """
+    plan_periods = {}
+    for plan_period in (
+        models.ResourcePlanPeriod.objects.filter(
+            Q(start__lte=date) | Q(start__isnull=True)
+        )
+        .filter(Q(end__gt=date) | Q(end__isnull=True))
+        .filter(resource__in=resources)
+        .order_by("start")
+    ):
+        plan_periods[plan_period.resource_id] = plan_period
+    return plan_periods
+
+
+def save_component_usages(usages, update_fields, batch_size=1000):
+    """
+    Upsert unsaved component usages and update invoice items for them.
+    Existing rows are matched by resource, component, plan period and billing period,
+    only update_fields are overwritten. It is expected to be called within transaction.
+    """
+    from waldur_mastermind.marketplace import registrators
+
+    # Rows without plan period are covered by partial unique constraint
+    # which could not be used as conflict target, so they are saved one by one.
+    models.ComponentUsage.objects.bulk_create(
+        [usage for usage in usages if usage.plan_period],
+        update_conflicts=True,
+        unique_fields=["resource", "component", "plan_period", "billing_period"],
+        update_fields=update_fields + ["modified"],
+        batch_size=batch_size,
+    )
+    for usage in usages:
+        if usage.plan_period:
+            continue
+        models.ComponentUsage.objects.update_or_create(
+            resource=usage.resource,
+            component=usage.component,
+            plan_period=None,
+            billing_period=usage.billing_period,
+            defaults={field: getattr(usage, field) for field in update_fields},
+        )
+
+    # Bulk created rows do not send post_save, so they are reloaded
+    # to update invoices and notify receivers explicitly.
+    keys = {
+        (
+            usage.resource.id,
+            usage.component.id,
+            usage.plan_period.id,
+            usage.billing_period,
+        )
+        for usage in usages
+        if usage.plan_period
+    }
+    component_usages = [
+        usage
+        for usage in models.ComponentUsage.objects.filter(
+            resource_id__in={key[0] for key in keys},
+            component_id__in={key[1] for key in keys},
+            plan_period_id__in={key[2] for key in keys},
+            billing_period__in={key[3] for key in keys},
+        ).select_related(
+            "resource__offering__customer__serviceprovider",
+            "resource__project__customer",
+            "component",
+            "plan_period__plan",
+        )
+        if (
+            usage.resource_id,
+            usage.component_id,
+            usage.plan_period_id,
+            usage.billing_period,
+        )
+        in keys
+    ]
+    registrators.update_invoices_when_usages_are_reported(component_usages)
+    signals.component_usages_updated.send(
+        sender=models.ComponentUsage, component_usages=component_usages
+    )
+    return component_usages
+
+
+def set_component_usages(entries, user=None):
+    """
+    Store usages reported for many resources at once.
+    Each entry is a dict with resource, optional plan_period, usages
+    and components map from type to offering component.
+    Usages are upserted in bulk and invoice items are updated in a single pass.
+    """
+    now = timezone.now()
+    billing_period = core_utils.month_start(now).date()
+    plan_periods = get_plan_periods(
+        [entry["resource"] for entry in entries if not entry.get("plan_period")],
+        now,
+    )
+
+    # Usage reported later for the same component takes precedence
+    usages = {}
+    for entry in entries:
+        resource = entry["resource"]
+        plan_period = entry.get("plan_period") or plan_periods.get(resource.id)
+        for usage in entry["usages"]:
+            amount = usage["amount"]
+            component = entry["components"][usage["type"]]
+            if component.billing_type == models.OfferingComponent.BillingTypes.USAGE:
+                component.validate_amount(resource, amount, now)
+            usages[(resource.id, component.id)] = models.ComponentUsage(
+                resource=resource,
+                component=component,
+                plan_period=plan_period,
+                billing_period=billing_period,
+                usage=amount,
+                date=now,
+                description=usage.get("description", ""),
+                recurring=usage["recurring"],
+                modified_by=user,
+            )
+
+    usages = list(usages.values())
+    if not usages:
+        return []
+
+    # Rows are filtered by resources and components, exact pairs are matched in Python
+    # so that query size does not depend on the number of usages
+    usage_keys = {(usage.resource.id, usage.component.id) for usage in usages}
+    resource_ids = {resource_id for resource_id, _ in usage_keys}
+    component_ids = {component_id for _, component_id in usage_keys}
+
+    with transaction.atomic():
+        recurring_usage_ids = [
+            usage_id
+            for usage_id, resource_id, component_id in models.ComponentUsage.objects.filter(
+                billing_period=billing_period,
+                recurring=True,
+                resource_id__in=resource_ids,
+                component_id__in=component_ids,
+            ).values_list("id", "resource_id", "component_id")
+            if (resource_id, component_id) in usage_keys
+        ]
+        models.ComponentUsage.objects.filter(id__in=recurring_usage_ids).update(
+            recurring=False
+        )
+
+        resources = []
+        for entry in entries:
+            resource = entry["resource"]
+            resource.current_usages = {
+                usage["type"]: str(usage["amount"]) for usage in entry["usages"]
+            }
+            resources.append(resource)
+        models.Resource.objects.bulk_update(resources, ["current_usages"])
+
+        component_usages = save_component_usages(
+            usages,
+            ["usage", "date", "description", "recurring", "modified_by"],
+        )
+
+    logger.info(
+        "Usages have been set for %s resources, components: %s",
+        len(entries),
+        len(usages),
+    )
+    return component_usages
+
+
 def import_current_usages(resource):
     date = datetime.date.today()
 
@@ -1059,6 +1230,75 @@ def count_resources_number_change(service_provider):
     return created - terminated
 
 
+def count_unresolved_tickets(resources):
+    from waldur_mastermind.support import models as support_models
+
+    IssueStatus = support_models.IssueStatus
+    issues = support_models.Issue.objects.filter(
+        resource_content_type=ContentType.objects.get_for_model(models.Resource),
+        resource_object_id__in=resources.values("id"),
+    )
+    # Issue could be considered resolved only if both resolved and canceled statuses are defined
+    if (
+        IssueStatus.objects.filter(type=IssueStatus.Types.RESOLVED).exists()
+        and IssueStatus.objects.filter(type=IssueStatus.Types.CANCELED).exists()
+    ):
+        issues = issues.exclude(
+            status__in=IssueStatus.objects.filter(
+                type=IssueStatus.Types.RESOLVED
+            ).values("name")
+        )
+    return issues.count()
+
+
+def update_service_provider_stat(service_provider):
+    from waldur_mastermind.promotions import models as promotions_models
+
+    to_day = timezone.datetime.today().date()
+    customer = service_provider.customer
+    active_resources = models.Resource.objects.filter(
+        offering__customer=customer,
+    ).exclude(state=models.Resource.States.TERMINATED)
+
+    stat, _ = models.ServiceProviderStat.objects.update_or_create(
+        service_provider=service_provider,
+        defaults=dict(
+            active_campaigns=promotions_models.Campaign.objects.filter(
+                service_provider=service_provider,
+                state=promotions_models.Campaign.States.ACTIVE,
+                start_date__lte=to_day,
+                end_date__gte=to_day,
+            ).count(),
+            current_customers=active_resources.order_by()
+            .values_list("project__customer", flat=True)
+            .distinct()
+            .count(),
+            customers_number_change=count_customers_number_change(service_provider),
+            active_resources=active_resources.count(),
+            resources_number_change=count_resources_number_change(service_provider),
+            active_and_paused_offerings=models.Offering.objects.filter(
+                customer=customer,
+                billable=True,
+                shared=True,
+                state__in=(
+                    models.Offering.States.ACTIVE,
+                    models.Offering.States.PAUSED,
+                ),
+            ).count(),
+            unresolved_tickets=count_unresolved_tickets(active_resources),
+            pending_orders=models.Order.objects.filter(
+                offering__customer=customer,
+                state=models.Order.States.PENDING_PROVIDER,
+            ).count(),
+            erred_resources=models.Resource.objects.filter(
+                offering__customer=customer,
+                state=models.Resource.States.ERRED,
+            ).count(),
+        ),
+    )
+    return stat
+
+
 def generate_offering_password_hash(offering):
     password = offering.secret_options.get("shared_user_password")
     if password:
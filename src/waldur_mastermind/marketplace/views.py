@@ -62,7 +62,7 @@ from waldur_core.permissions.utils import (
     permission_factory,
 )
 from waldur_core.permissions.views import UserRoleMixin
-from waldur_core.quotas.models import QuotaUsage
+from waldur_core.quotas.models import QuotaUsage, QuotaUsageCheckpoint
 from waldur_core.structure import filters as structure_filters
 from waldur_core.structure import models as structure_models
 from waldur_core.structure import permissions as structure_permissions
@@ -95,8 +95,6 @@ from waldur_mastermind.marketplace_slurm_remote import (
     PLUGIN_NAME as SLURM_REMOTE_PLUGIN_NAME,
 )
 from waldur_mastermind.marketplace_support import PLUGIN_NAME as SUPPORT_PLUGIN_NAME
-from waldur_mastermind.promotions import models as promotions_models
-from waldur_mastermind.support import models as support_models
 from waldur_pid import models as pid_models
 
 from . import filters, log, models, permissions, plugins, serializers, tasks, utils
@@ -367,78 +365,14 @@ class ServiceProviderViewSet(PublicViewsetMixin, BaseMarketplaceView):
 
     @action(detail=True, methods=["GET"])
     def stat(self, request, uuid=None):
-        to_day = timezone.datetime.today().date()
         service_provider = self.get_object()
-
-        active_campaigns = promotions_models.Campaign.objects.filter(
-            service_provider=service_provider,
-            state=promotions_models.Campaign.States.ACTIVE,
-            start_date__lte=to_day,
-            end_date__gte=to_day,
-        ).count()
-
-        current_customers = (
-            models.Resource.objects.filter(
-                offering__customer=service_provider.customer,
-            )
-            .exclude(state=models.Resource.States.TERMINATED)
-            .order_by()
-            .values_list("project__customer", flat=True)
-            .distinct()
-            .count()
-        )
-
-        active_resources = models.Resource.objects.filter(
-            offering__customer=service_provider.customer,
-        ).exclude(state=models.Resource.States.TERMINATED)
-
-        active_and_paused_offerings = models.Offering.objects.filter(
-            customer=service_provider.customer,
-            billable=True,
-            shared=True,
-            state__in=(models.Offering.States.ACTIVE, models.Offering.States.PAUSED),
-        ).count()
-
-        content_type = ContentType.objects.get_for_model(support_models.Issue)
-        unresolved_tickets = len(
-            [
-                i
-                for i in support_models.Issue.objects.filter(
-                    resource_content_type=content_type,
-                    resource_object_id__in=(
-                        active_resources.values_list("id", flat=True)
-                    ),
-                )
-                if not i.resolved
-            ]
-        )
-
-        pending_orders = models.Order.objects.filter(
-            offering__customer=service_provider.customer,
-            state=models.Order.States.PENDING_PROVIDER,
-        ).count()
-
-        erred_resources = models.Resource.objects.filter(
-            offering__customer=service_provider.customer,
-            state=models.Resource.States.ERRED,
-        ).count()
+        try:
+            stat = service_provider.stat
+        except models.ServiceProviderStat.DoesNotExist:
+            stat = utils.update_service_provider_stat(service_provider)
 
         return Response(
-            {
-                "active_campaigns": active_campaigns,
-                "current_customers": current_customers,
-                "customers_number_change": utils.count_customers_number_change(
-                    service_provider
-                ),
-                "active_resources": active_resources.count(),
-                "resources_number_change": utils.count_resources_number_change(
-                    service_provider
-                ),
-                "active_and_paused_offerings": active_and_paused_offerings,
-                "unresolved_tickets": unresolved_tickets,
-                "pending_orders": pending_orders,
-                "erred_resources": erred_resources,
-            },
+            serializers.ServiceProviderStatSerializer(stat).data,
             status=status.HTTP_200_OK,
         )
 
@@ -449,13 +383,11 @@ class ServiceProviderViewSet(PublicViewsetMixin, BaseMarketplaceView):
         customer = service_provider.customer
 
         data = (
-            invoice_models.InvoiceItem.objects.filter(
-                invoice__created__gte=start,
-                resource__offering__customer=customer,
-            )
-            .values("invoice__year", "invoice__month")
-            .annotate(total=Sum(F("unit_price") * F("quantity")))
-            .order_by("invoice__year", "invoice__month")
+            invoice_models.InvoiceCost.objects.filter(provider=customer)
+            .filter_period(start)
+            .values("year", "month")
+            .annotate(total=Sum("price"))
+            .order_by("year", "month")
         )
 
         return Response(
@@ -1050,13 +982,11 @@ class ProviderOfferingViewSet(
         offering = self.get_object()
         active_customers = utils.get_active_customers(self.request, self)
         start, end = utils.get_start_and_end_dates_from_request(self.request)
-        invoice_items = invoice_models.InvoiceItem.objects.filter(
-            resource__offering=offering,
-            invoice__customer__in=active_customers,
-            invoice__created__gte=start,
-            invoice__created__lte=end,
-        )
-        queryset = get_queryset(invoice_items)
+        invoice_costs = invoice_models.InvoiceCost.objects.filter(
+            offering=offering,
+            customer__in=active_customers,
+        ).filter_period(start, end)
+        queryset = get_queryset(invoice_costs)
         serializer = serializer(
             instance=queryset, many=True, context=serializer_context
         )
@@ -1076,21 +1006,11 @@ class ProviderOfferingViewSet(
             component.type: component for component in offering.components.all()
         }
 
-        def get_offering_component_stats(invoice_items):
+        def get_offering_component_stats(invoice_costs):
             return (
-                invoice_items.filter(
-                    details__offering_component_type__in=offering_components_map.keys()
-                )
-                .values(
-                    "details__offering_component_type",
-                    "invoice__year",
-                    "invoice__month",
-                )
-                .order_by(
-                    "details__offering_component_type",
-                    "invoice__year",
-                    "invoice__month",
-                )
+                invoice_costs.filter(component_type__in=offering_components_map.keys())
+                .values("component_type", "year", "month")
+                .order_by("component_type", "year", "month")
                 .annotate(total_quantity=Sum("quantity"))
             )
 
@@ -2768,6 +2688,26 @@ class ComponentUsageViewSet(core_views.ReadOnlyActionsViewSet):
 
     set_usage_serializer_class = serializers.ComponentUsageCreateSerializer
 
+    @action(detail=False, methods=["post"])
+    def batch_set_usage(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        offerings = {
+            entry["resource"].offering
+            for entry in serializer.validated_data["resources"]
+        }
+        for offering in offerings:
+            if not has_permission(
+                request, PermissionEnum.SET_RESOURCE_USAGE, offering.customer
+            ) and not has_permission(
+                request, PermissionEnum.SET_RESOURCE_USAGE, offering
+            ):
+                raise PermissionDenied()
+        serializer.save()
+        return Response(status=status.HTTP_201_CREATED)
+
+    batch_set_usage_serializer_class = serializers.ComponentUsageBatchCreateSerializer
+
     @action(detail=True, methods=["post"])
     def set_user_usage(self, request, *args, **kwargs):
         component_usage = self.get_object()
@@ -3044,8 +2984,15 @@ class StatsViewSet(rf_viewsets.ViewSet):
             name="nc_user_count",
         )
 
+        users_checkpoint = QuotaUsageCheckpoint.objects.filter(
+            object_id=OuterRef("pk"),
+            content_type=ContentType.objects.get_for_model(structure_models.Customer),
+            name="nc_user_count",
+        )
+
         customers = structure_models.Customer.objects.annotate(
-            count=core_utils.SubquerySum(users_count, "delta"),
+            count=Coalesce(core_utils.SubquerySum(users_count, "delta"), 0)
+            + Coalesce(core_utils.SubquerySum(users_checkpoint, "value"), 0),
             has_resources=Exists(has_resources),
         ).values("uuid", "name", "abbreviation", "count", "has_resources")
 
@@ -142,8 +142,7 @@ def import_quotas(offering, source_values):
 
 
 def _apply_quotas(target: openstack_models.Tenant, quotas: dict[str, int]):
-    for name, limit in quotas.items():
-        target.set_quota_limit(name, limit)
+    target.set_quota_limits(quotas)
 
 
 def import_usage(resource):
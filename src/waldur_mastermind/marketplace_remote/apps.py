@@ -87,3 +87,27 @@ class MarketplaceRemoteConfig(AppConfig):
             sender=models.Resource,
             dispatch_uid="marketplace_remote.update_remote_resource_options",
         )
+
+        signals.post_save.connect(
+            handlers.reset_offering_sync_state_on_offering_change,
+            sender=models.Offering,
+            dispatch_uid="marketplace_remote.reset_offering_sync_state_on_offering_change",
+        )
+
+        for signal in (signals.post_save, signals.post_delete):
+            for model in (
+                models.OfferingComponent,
+                models.Plan,
+                models.OfferingAccessEndpoint,
+            ):
+                signal.connect(
+                    handlers.reset_offering_sync_state_on_offering_details_change,
+                    sender=model,
+                    dispatch_uid="marketplace_remote.reset_offering_sync_state_on_offering_details_change",
+                )
+
+            signal.connect(
+                handlers.reset_offering_sync_state_on_plan_component_change,
+                sender=models.PlanComponent,
+                dispatch_uid="marketplace_remote.reset_offering_sync_state_on_plan_component_change",
+            )
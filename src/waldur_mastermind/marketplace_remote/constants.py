@@ -35,3 +35,7 @@ PLAN_FIELDS = (
 )
 
 RESOURCE_FIELDS = ("report", "attributes", "options")
+
+# Maximum number of concurrent requests to remote Waldur
+# issued while project permissions are synchronized.
+PERMISSION_SYNC_WORKERS = 8
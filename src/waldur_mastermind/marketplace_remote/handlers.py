@@ -14,7 +14,7 @@ from waldur_core.structure import permissions as structure_permissions
 from waldur_mastermind.marketplace.models import Resource
 from waldur_mastermind.marketplace_remote.utils import INVALID_RESOURCE_STATES
 
-from . import PLUGIN_NAME, log, models, tasks, utils
+from . import PLUGIN_NAME, constants, log, models, tasks, utils
 
 logger = logging.getLogger(__name__)
 
@@ -219,3 +219,30 @@ def update_remote_resource_options(sender, instance, created=False, **kwargs):
         return
 
     transaction.on_commit(lambda: utils.push_resource_options(instance))
+
+
+def reset_offering_sync_state(offering_id):
+    # Offering pull skips unchanged remote offering, so local changes
+    # would not be overwritten until remote offering is changed.
+    models.OfferingSyncState.objects.filter(
+        offering_id=offering_id, offering__type=PLUGIN_NAME
+    ).exclude(offering_hash="").update(offering_hash="")
+
+
+def reset_offering_sync_state_on_offering_change(
+    sender, instance, created=False, **kwargs
+):
+    if created or not set(instance.tracker.changed()) & {
+        *constants.OFFERING_FIELDS,
+        "thumbnail",
+    }:
+        return
+    reset_offering_sync_state(instance.id)
+
+
+def reset_offering_sync_state_on_offering_details_change(sender, instance, **kwargs):
+    reset_offering_sync_state(instance.offering_id)
+
+
+def reset_offering_sync_state_on_plan_component_change(sender, instance, **kwargs):
+    reset_offering_sync_state(instance.plan.offering_id)
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.16 on 2026-10-17 09:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("marketplace", "0147_serviceproviderstat"),
+        ("marketplace_remote", "0005_projectupdaterequest_created_by"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OfferingSyncState",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "usages_pulled_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="Start time of the latest pull of component usages.",
+                        null=True,
+                    ),
+                ),
+                (
+                    "offering",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="marketplace.offering",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.16 on 2026-10-17 09:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("marketplace_remote", "0006_offeringsyncstate"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="offeringsyncstate",
+            name="offering_hash",
+            field=models.CharField(
+                blank=True,
+                help_text="Hash of remote offering details applied by the latest pull.",
+                max_length=64,
+            ),
+        ),
+    ]
@@ -42,3 +42,22 @@ class ProjectUpdateRequest(UuidMixin, ReviewMixin):
     class Permissions:
         customer_path = "offering__customer"
         project_path = "project"
+
+
+class OfferingSyncState(models.Model):
+    offering = models.OneToOneField(
+        Offering, on_delete=models.CASCADE, related_name="+"
+    )
+    usages_pulled_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Start time of the latest pull of component usages.",
+    )
+    offering_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="Hash of remote offering details applied by the latest pull.",
+    )
+
+    def __str__(self):
+        return str(self.offering)
@@ -1,12 +1,13 @@
 import collections
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 
 import requests
 from celery.app import shared_task
 from dateutil.relativedelta import relativedelta
 from django.conf import settings
-from django.core.exceptions import ObjectDoesNotExist
+from django.db import connection, transaction
 from django.utils import dateparse, timezone
 from rest_framework import exceptions as rf_exceptions
 from waldur_client import WaldurClient, WaldurClientException
@@ -22,17 +23,16 @@ from waldur_core.core.utils import (
 from waldur_core.structure import models as structure_models
 from waldur_core.structure.exceptions import ServiceBackendError
 from waldur_core.structure.tasks import BackgroundListPullTask, BackgroundPullTask
-from waldur_mastermind.common.utils import parse_datetime
 from waldur_mastermind.invoices import models as invoice_models
 from waldur_mastermind.invoices.registrators import RegistrationManager
 from waldur_mastermind.invoices.utils import get_previous_month
 from waldur_mastermind.marketplace import models
 from waldur_mastermind.marketplace.callbacks import sync_order_state
-from waldur_mastermind.marketplace.utils import get_plan_period
 from waldur_mastermind.marketplace_remote import models as remote_models
 from waldur_mastermind.marketplace_remote.constants import (
     OFFERING_COMPONENT_FIELDS,
     OFFERING_FIELDS,
+    PERMISSION_SYNC_WORKERS,
     PLAN_FIELDS,
     RESOURCE_FIELDS,
 )
@@ -50,29 +50,53 @@ OrderInvertStates = {key: val for val, key in models.Order.States.CHOICES}
 
 
 class OfferingPullTask(BackgroundPullTask):
-    def pull(self, local_offering: models.Offering):
+    """
+    Pull offering details. Offerings which have not changed since the previous pull are skipped
+    unless pull is forced, for example, when it is requested by user.
+    """
+
+    def run(self, serialized_instance, **kwargs):
+        instance = deserialize_instance(serialized_instance)
+        try:
+            self.pull(instance, **kwargs)
+        except ServiceBackendError as e:
+            self.on_pull_fail(instance, e)
+        else:
+            self.on_pull_success(instance)
+
+    def pull(self, local_offering: models.Offering, force=False):
         client = get_client_for_offering(local_offering)
         remote_offering = client.get_marketplace_public_offering(
             local_offering.backend_id
         )
+        offering_hash = utils.get_remote_offering_hash(remote_offering)
+        sync_state, _ = remote_models.OfferingSyncState.objects.get_or_create(
+            offering=local_offering
+        )
+        if not force and sync_state.offering_hash == offering_hash:
+            logger.info("Offering %s has not been changed remotely", local_offering)
+            return
+
         pull_fields(OFFERING_FIELDS, local_offering, remote_offering)
         utils.import_offering_thumbnail(local_offering, remote_offering)
         self.sync_offering_components(local_offering, remote_offering)
         self.sync_plans(local_offering, remote_offering)
         self.sync_access_endpoints(local_offering, remote_offering)
 
+        sync_state.offering_hash = offering_hash
+        sync_state.save(update_fields=["offering_hash"])
+
     def sync_access_endpoints(self, local_offering, remote_offering):
         if not remote_offering.get("endpoints"):
             return
-        remote_endpoints = remote_offering["endpoints"]
-        local_endpoints = local_offering.endpoints.all()
-        remote_endpoints_map = {item["url"]: item for item in remote_endpoints}
-        local_endpoint_urls = {item.url for item in local_endpoints}
-
-        new_urls = set(remote_endpoints_map.keys()) - local_endpoint_urls
-        stale_urls = local_endpoint_urls - set(remote_endpoints_map.keys())
-        existing_urls = local_endpoint_urls & set(remote_endpoints_map.keys())
+        remote_endpoints_map = {
+            item["url"]: item for item in remote_offering["endpoints"]
+        }
+        local_endpoints_map = {
+            item.url: item for item in local_offering.endpoints.all()
+        }
 
+        stale_urls = set(local_endpoints_map) - set(remote_endpoints_map)
         if stale_urls:
             local_offering.endpoints.filter(url__in=stale_urls).delete()
             logger.info(
@@ -81,37 +105,35 @@ class OfferingPullTask(BackgroundPullTask):
                 local_offering,
             )
 
-        for new_url in new_urls:
-            models.OfferingAccessEndpoint.objects.create(
-                url=new_url,
-                name=remote_endpoints_map[new_url]["name"],
-                offering=local_offering,
-            )
+        new_endpoints = []
+        changed_endpoints = []
+        for url, remote_endpoint in remote_endpoints_map.items():
+            endpoint = local_endpoints_map.get(url)
+            if not endpoint:
+                new_endpoints.append(
+                    models.OfferingAccessEndpoint(
+                        url=url, name=remote_endpoint["name"], offering=local_offering
+                    )
+                )
+            elif endpoint.name != remote_endpoint["name"]:
+                endpoint.name = remote_endpoint["name"]
+                changed_endpoints.append(endpoint)
 
-        for existing_url in existing_urls:
-            endpoint: models.OfferingAccessEndpoint = local_offering.endpoints.get(
-                url=existing_url
-            )
-            if endpoint.name != remote_endpoints_map[existing_url]["name"]:
-                endpoint.name = remote_endpoints_map[existing_url]["name"]
-                endpoint.save(update_fields=["name"])
+        models.OfferingAccessEndpoint.objects.bulk_create(new_endpoints)
+        models.OfferingAccessEndpoint.objects.bulk_update(changed_endpoints, ["name"])
 
     def sync_offering_components(
         self, local_offering: models.Offering, remote_offering
     ):
-        remote_components = remote_offering["components"]
-        local_components = local_offering.components.all()
-        remote_component_types_map = {item["type"]: item for item in remote_components}
-        local_component_types = [item.type for item in local_components]
+        remote_component_types_map = {
+            item["type"]: item for item in remote_offering["components"]
+        }
+        local_component_types_map = {
+            item.type: item for item in local_offering.components.all()
+        }
 
-        new_component_types = set(remote_component_types_map.keys()) - set(
-            local_component_types
-        )
-        stale_component_types = set(local_component_types) - set(
-            remote_component_types_map.keys()
-        )
-        existing_component_types = set(local_component_types) & set(
-            remote_component_types_map.keys()
+        stale_component_types = set(local_component_types_map) - set(
+            remote_component_types_map
         )
         if stale_component_types:
             local_offering.components.filter(type__in=stale_component_types).delete()
@@ -125,40 +147,40 @@ class OfferingPullTask(BackgroundPullTask):
             local_offering,
             {
                 "components": [
-                    comp
-                    for comp_type, comp in remote_component_types_map.items()
-                    if comp_type in new_component_types
+                    remote_component
+                    for component_type, remote_component in remote_component_types_map.items()
+                    if component_type not in local_component_types_map
                 ]
             },
         )
 
-        for existing_component_type in existing_component_types:
-            remote_component = remote_component_types_map[existing_component_type]
-            local_component: models.OfferingComponent = local_offering.components.get(
-                type=existing_component_type
-            )
-            pull_fields(OFFERING_COMPONENT_FIELDS, local_component, remote_component)
-            logger.info(
-                "Component %s for offering %s has been updated",
-                existing_component_type,
-                local_offering,
-            )
+        for component_type, local_component in local_component_types_map.items():
+            remote_component = remote_component_types_map.get(component_type)
+            if not remote_component:
+                continue
+            if pull_fields(
+                OFFERING_COMPONENT_FIELDS, local_component, remote_component
+            ):
+                logger.info(
+                    "Component %s for offering %s has been updated",
+                    component_type,
+                    local_offering,
+                )
 
     def sync_plans(self, local_offering: models.Offering, remote_offering):
         """
         Sync plans for an existing offering
         """
-        local_plans = models.Plan.objects.filter(offering=local_offering)
-        remote_plans = remote_offering["plans"]
-
-        local_plan_uuids = [item.backend_id for item in local_plans]
-        remote_plans_map = {item["uuid"]: item for item in remote_plans}
-
-        new_plans = set(remote_plans_map.keys()) - set(local_plan_uuids)
-        stale_plans = set(local_plan_uuids) - set(remote_plans_map.keys())
-        existing_plans = set(local_plan_uuids) & set(remote_plans_map.keys())
+        local_plans_map = {
+            item.backend_id: item
+            for item in models.Plan.objects.filter(offering=local_offering)
+        }
+        remote_plans_map = {item["uuid"]: item for item in remote_offering["plans"]}
 
-        for stale_plan in local_offering.plans.filter(backend_id__in=stale_plans):
+        stale_plans = set(local_plans_map) - set(remote_plans_map)
+        for stale_plan in local_offering.plans.filter(
+            backend_id__in=stale_plans, archived=False
+        ):
             stale_plan.archived = True
             stale_plan.save()
             logger.info(
@@ -172,19 +194,20 @@ class OfferingPullTask(BackgroundPullTask):
         }
         new_remote_plans = {
             "plans": [
-                item for item in remote_offering["plans"] if item["uuid"] in new_plans
+                item
+                for item in remote_offering["plans"]
+                if item["uuid"] not in local_plans_map
             ]
         }
         utils.import_plans(local_offering, new_remote_plans, local_components_map)
 
-        for existing_plan_backend_id in existing_plans:
-            remote_plan = remote_plans_map[existing_plan_backend_id]
-            local_plan: models.Plan = local_offering.plans.get(
-                backend_id=existing_plan_backend_id
-            )
+        for backend_id, local_plan in local_plans_map.items():
+            remote_plan = remote_plans_map.get(backend_id)
+            if not remote_plan:
+                continue
             updated_fields = pull_fields(PLAN_FIELDS, local_plan, remote_plan)
 
-            self.sync_plan_components(local_plan, remote_plan)
+            self.sync_plan_components(local_plan, remote_plan, local_components_map)
 
             if updated_fields:
                 logger.info(
@@ -193,61 +216,71 @@ class OfferingPullTask(BackgroundPullTask):
                     local_offering,
                 )
 
-    def sync_plan_components(self, local_plan: models.Plan, remote_plan):
+    def sync_plan_components(
+        self, local_plan: models.Plan, remote_plan, local_components_map
+    ):
         """
         Sync plan componets for an existing plan
         This method skips check of stale plan components, because it assumes they have been already removed in `sync_components` method
         """
-        local_offering = local_plan.offering
-        local_offering_components = local_offering.components
-        local_plan_components = set(
-            local_plan.components.all().values_list("component__type", flat=True)
-        )
+        local_plan_components_map = {
+            item.component.type: item
+            for item in local_plan.components.select_related("component")
+        }
         remote_prices = remote_plan["prices"]
         remote_quotas = remote_plan["quotas"]
         remote_plan_components = set(remote_prices.keys()) | set(remote_quotas.keys())
 
-        new_plan_components = remote_plan_components - local_plan_components
-
-        existing_plan_components = local_plan_components & remote_plan_components
-
-        for component_type in new_plan_components:
-            plan_component = models.PlanComponent.objects.create(
+        new_plan_components = [
+            models.PlanComponent(
                 plan=local_plan,
-                component=local_offering_components.get(type=component_type),
+                component=local_components_map[component_type],
                 price=remote_prices[component_type],
                 amount=remote_quotas[component_type],
             )
+            for component_type in remote_plan_components
+            if component_type not in local_plan_components_map
+        ]
+        if new_plan_components:
+            models.PlanComponent.objects.bulk_create(new_plan_components)
             logger.info(
-                "Plan component %s of offering %s has been created",
-                plan_component,
+                "Plan components %s of offering %s have been created",
+                [item.component.type for item in new_plan_components],
                 local_plan.offering,
             )
 
-        for existing_plan_component in existing_plan_components:
-            local_component: models.OfferingComponent = local_offering_components.get(
-                type=existing_plan_component
-            )
-            local_plan_component: models.PlanComponent = local_plan.components.get(
-                component=local_component
-            )
+        for component_type, local_plan_component in local_plan_components_map.items():
+            if component_type not in remote_plan_components:
+                continue
+            # Price and amount changes are saved one by one so that audit events are emitted
             changed_fields = pull_fields(
                 ["price", "amount"],
                 local_plan_component,
                 {
-                    "price": remote_prices[existing_plan_component],
-                    "amount": remote_quotas[existing_plan_component],
+                    "price": remote_prices[component_type],
+                    "amount": remote_quotas[component_type],
                 },
             )
 
             if changed_fields:
                 logger.info(
                     "Plan component %s of offering %s has been updated",
-                    existing_plan_component,
-                    local_offering,
+                    component_type,
+                    local_plan.offering,
                 )
 
 
+class OfferingResourceListPullTask(BackgroundListPullTask):
+    """Pulls objects of remote offerings in chunks grouped by offering."""
+
+    chunk_size = 10
+    max_concurrency = 2
+    schedule_period = 50 * 60
+
+    def get_backend_key(self, instance):
+        return instance.offering_id
+
+
 class OfferingListPullTask(BackgroundListPullTask):
     name = "waldur_mastermind.marketplace_remote.pull_offerings"
     pull_task = OfferingPullTask
@@ -336,7 +369,7 @@ class ResourcePullTask(BackgroundPullTask):
             utils.pull_resource_state(local_resource)
 
 
-class ResourceListPullTask(BackgroundListPullTask):
+class ResourceListPullTask(OfferingResourceListPullTask):
     name = "waldur_mastermind.marketplace_remote.pull_resources"
     pull_task = ResourcePullTask
 
@@ -389,7 +422,7 @@ class OrderStatePullTask(OrderPullTask):
             self.retry()
 
 
-class OrderListPullTask(BackgroundListPullTask):
+class OrderListPullTask(OfferingResourceListPullTask):
     name = "waldur_mastermind.marketplace_remote.pull_orders"
     pull_task = OrderPullTask
 
@@ -474,7 +507,17 @@ def pull_offering_orders(serialized_offering):
         OrderPullTask().delay(serialize_instance(order))
 
 
-class UsagePullTask(BackgroundPullTask):
+class OfferingUsagePullTask(BackgroundPullTask):
+    """Pull component usages of all resources of the offering in bulk.
+
+    Only usages modified since the previous pull are transferred.
+    The watermark is not advanced while usages of remote resources
+    which are not imported yet are skipped.
+    """
+
+    # Covers clock difference between local and remote Waldur
+    changes_since_margin = timedelta(minutes=5)
+
     def run(self, serialized_instance, **kwargs):
         instance = deserialize_instance(serialized_instance)
         try:
@@ -484,74 +527,54 @@ class UsagePullTask(BackgroundPullTask):
         else:
             self.on_pull_success(instance)
 
-    def pull(self, local_resource: models.Resource, from_creation_date=False):
-        """Pull resource usage either from 4 month ago or since resource creation date."""
-        client = get_client_for_offering(local_resource.offering)
-
-        today = datetime.today()
-        if from_creation_date:
-            start_date = month_start(local_resource.created)
-        else:
-            start_date = month_start(today - relativedelta(months=4))
+    def pull(self, local_offering: models.Offering, from_creation_date=False):
+        """Pull offering usages either from 4 month ago or since resources creation date."""
+        client = get_client_for_offering(local_offering)
+        sync_state, _ = remote_models.OfferingSyncState.objects.get_or_create(
+            offering=local_offering
+        )
+        pulled_at = timezone.now()
 
-        start_date_str = start_date.strftime("%Y-%m-%d")
+        params = {"offering_uuid": local_offering.backend_id}
+        if not from_creation_date:
+            start_date = month_start(datetime.today() - relativedelta(months=4))
+            params["date_after"] = start_date.strftime("%Y-%m-%d")
+            if sync_state.usages_pulled_at:
+                changes_since = sync_state.usages_pulled_at - self.changes_since_margin
+                params["modified_after"] = changes_since.isoformat()
 
         logger.info(
-            "Pulling resource %s usages from %s", local_resource, start_date_str
+            "Pulling offering %s usages with filters %s", local_offering, params
         )
 
-        remote_usages = client.list_component_usages(
-            local_resource.backend_id,
-            date_after=start_date_str,
+        remote_usages = utils.list_offering_component_usages(
+            client, local_offering, params
+        )
+        missing_resource_uuids = utils.import_component_usages(
+            local_offering, remote_usages
         )
 
-        for remote_usage in remote_usages:
-            try:
-                offering_component = models.OfferingComponent.objects.get(
-                    offering=local_resource.offering, type=remote_usage["type"]
-                )
-            except ObjectDoesNotExist:
-                continue
-            usage_date = parse_datetime(remote_usage["date"])
-            if usage_date < local_resource.created:
-                logger.info(
-                    f"Invalid component usage date detected for resource {local_resource.id}"
-                )
-                continue
-            defaults = {
-                "usage": remote_usage["usage"],
-                "description": remote_usage["description"],
-                "created": remote_usage["created"],
-                "date": usage_date,
-                "recurring": remote_usage["recurring"],
-                "backend_id": remote_usage["uuid"],
-            }
-            plan_period = get_plan_period(local_resource, usage_date)
-            models.ComponentUsage.objects.update_or_create(
-                resource=local_resource,
-                component=offering_component,
-                plan_period=plan_period,
-                billing_period=remote_usage["billing_period"],
-                defaults=defaults,
-            )
+        # Skipped usages are not modified again after resource is imported,
+        # so watermark is kept until they could be imported.
+        if missing_resource_uuids:
+            return
+
+        remote_models.OfferingSyncState.objects.filter(pk=sync_state.pk).update(
+            usages_pulled_at=pulled_at
+        )
 
 
 class UsageListPullTask(BackgroundListPullTask):
     name = "waldur_mastermind.marketplace_remote.pull_usage"
-    pull_task = UsagePullTask
+    pull_task = OfferingUsagePullTask
 
     def get_pulled_objects(self):
-        return models.Resource.objects.exclude(backend_id="").filter(
-            offering__type=PLUGIN_NAME
-        )
+        return models.Offering.objects.filter(type=PLUGIN_NAME).exclude(backend_id="")
 
 
 @shared_task
 def pull_offering_usage(serialized_offering):
-    offering = deserialize_instance(serialized_offering)
-    resources = models.Resource.objects.exclude(backend_id="").filter(offering=offering)
-    for resource in resources:
-        UsagePullTask().delay(serialize_instance(resource), from_creation_date=True)
+    OfferingUsagePullTask().delay(serialized_offering, from_creation_date=True)
 
 
 class ResourceInvoicePullTask(BackgroundPullTask):
@@ -589,62 +612,68 @@ class ResourceInvoicePullTask(BackgroundPullTask):
         stale_item_ids = local_item_ids - remote_item_ids
         existing_item_ids = local_item_ids & remote_item_ids
 
-        if len(stale_item_ids) > 0:
-            invoice_models.InvoiceItem.objects.filter(name__in=stale_item_ids).delete()
-            logger.info(
-                f"The following invoice items for resource [uuid={local_resource.uuid}] have been deleted: {stale_item_ids}"
-            )
+        # Invoice costs are refreshed once when all items are stored
+        with transaction.atomic():
+            if len(stale_item_ids) > 0:
+                invoice_models.InvoiceItem.objects.filter(
+                    name__in=stale_item_ids
+                ).delete()
+                logger.info(
+                    f"The following invoice items for resource [uuid={local_resource.uuid}] have been deleted: {stale_item_ids}"
+                )
 
-        new_invoice_items = [
-            item for item in remote_invoice_items if item["uuid"] in new_item_ids
-        ]
-        for item in new_invoice_items:
-            invoice_models.InvoiceItem.objects.create(
-                backend_uuid=item["uuid"],
-                resource=local_resource,
-                invoice=local_invoice,
-                start=dateparse.parse_datetime(item["start"]),
-                end=dateparse.parse_datetime(item["end"]),
-                name=item["name"],
-                project=local_resource.project,
-                unit=item["unit"],
-                measured_unit=item["measured_unit"],
-                article_code=item["article_code"],
-                unit_price=item["unit_price"],
-                details=item["details"],
-                quantity=item["quantity"],
-            )
+            new_invoice_items = [
+                item for item in remote_invoice_items if item["uuid"] in new_item_ids
+            ]
+            for item in new_invoice_items:
+                invoice_models.InvoiceItem.objects.create(
+                    backend_uuid=item["uuid"],
+                    resource=local_resource,
+                    invoice=local_invoice,
+                    start=dateparse.parse_datetime(item["start"]),
+                    end=dateparse.parse_datetime(item["end"]),
+                    name=item["name"],
+                    project=local_resource.project,
+                    unit=item["unit"],
+                    measured_unit=item["measured_unit"],
+                    article_code=item["article_code"],
+                    unit_price=item["unit_price"],
+                    details=item["details"],
+                    quantity=item["quantity"],
+                )
 
-        existing_invoice_items = [
-            item for item in remote_invoice_items if item["uuid"] in existing_item_ids
-        ]
-        for item in existing_invoice_items:
-            local_item = local_invoice_items.get(
-                backend_uuid=item["uuid"],
-            )
-            local_item.start = dateparse.parse_datetime(item["start"])
-            local_item.end = dateparse.parse_datetime(item["end"])
-            local_item.measured_unit = item["measured_unit"]
-            local_item.details = item["details"]
-            local_item.quantity = item["quantity"]
-            local_item.article_code = item["article_code"]
-            local_item.unit_price = item["unit_price"]
-            local_item.unit = item["unit"]
-            local_item.save(
-                update_fields=[
-                    "start",
-                    "end",
-                    "measured_unit",
-                    "details",
-                    "quantity",
-                    "article_code",
-                    "unit_price",
-                    "unit",
-                ]
-            )
+            existing_invoice_items = [
+                item
+                for item in remote_invoice_items
+                if item["uuid"] in existing_item_ids
+            ]
+            for item in existing_invoice_items:
+                local_item = local_invoice_items.get(
+                    backend_uuid=item["uuid"],
+                )
+                local_item.start = dateparse.parse_datetime(item["start"])
+                local_item.end = dateparse.parse_datetime(item["end"])
+                local_item.measured_unit = item["measured_unit"]
+                local_item.details = item["details"]
+                local_item.quantity = item["quantity"]
+                local_item.article_code = item["article_code"]
+                local_item.unit_price = item["unit_price"]
+                local_item.unit = item["unit"]
+                local_item.save(
+                    update_fields=[
+                        "start",
+                        "end",
+                        "measured_unit",
+                        "details",
+                        "quantity",
+                        "article_code",
+                        "unit_price",
+                        "unit",
+                    ]
+                )
 
 
-class ResourceInvoiceListPullTask(BackgroundListPullTask):
+class ResourceInvoiceListPullTask(OfferingResourceListPullTask):
     name = "waldur_mastermind.marketplace_remote.pull_invoices"
     pull_task = ResourceInvoicePullTask
 
@@ -710,7 +739,7 @@ class ResourceRobotAccountPullTask(BackgroundPullTask):
                 local_account.save(update_fields=modified)
 
 
-class ResourceRobotAccountListPullTask(BackgroundListPullTask):
+class ResourceRobotAccountListPullTask(OfferingResourceListPullTask):
     name = "waldur_mastermind.marketplace_remote.pull_robot_accounts"
     pull_task = ResourceRobotAccountPullTask
 
@@ -789,149 +818,172 @@ def update_remote_customer_permissions(
         sync_project_permission(grant, project, role_name, user, new_expiration_time)
 
 
-@shared_task(
-    name="waldur_mastermind.marketplace_remote.sync_remote_project_permissions"
-)
-def sync_remote_project_permissions():
-    if not settings.WALDUR_AUTH_SOCIAL["ENABLE_EDUTEAMS_SYNC"]:
+def sync_offering_project_permissions(pool, project, offering, local_permissions):
+    try:
+        _sync_offering_project_permissions(pool, project, offering, local_permissions)
+    finally:
+        # Worker threads open their own database connections.
+        connection.close()
+
+
+def _sync_offering_project_permissions(pool, project, offering, local_permissions):
+    client = pool.get_client(offering)
+
+    try:
+        remote_project = utils.get_remote_project(offering, project, client)
+        if not remote_project:
+            if not local_permissions:
+                logger.info(
+                    f"Skipping remote project {project} synchronization in "
+                    "offering {offering} because there are no users to be synced."
+                )
+            else:
+                remote_project = utils.create_remote_project(offering, project, client)
+                utils.push_project_users(
+                    offering, project, remote_project["uuid"], pool
+                )
+            return
+    except rf_exceptions.ValidationError as e:
+        logger.warning(
+            f"Unable to fetch remote project {project} in offering {offering}: {e}"
+        )
+        return
+    except WaldurClientException as e:
+        logger.warning(
+            f"Unable to create remote project {project} in offering {offering}: {e}"
+        )
         return
+    else:
+        remote_project_uuid = remote_project["uuid"]
 
-    for project, offerings in utils.get_projects_with_remote_offerings().items():
-        for offering in offerings:
-            local_permissions = utils.collect_local_permissions(offering, project)
-            client = utils.get_client_for_offering(offering)
+    try:
+        remote_permissions = client.get_project_permissions(remote_project_uuid)
+    except WaldurClientException as e:
+        logger.warning(
+            f"Unable to get project permissions for project {project} in offering {offering}: {e}"
+        )
+        return
+
+    remote_user_roles = collections.defaultdict()
+    for remote_permission in remote_permissions:
+        remote_expiration_time = remote_permission["expiration_time"]
+        remote_user_roles[remote_permission["user_username"]] = (
+            remote_permission["role_name"],
+            dateparse.parse_datetime(remote_expiration_time)
+            if remote_expiration_time
+            else remote_expiration_time,
+            remote_permission["user_uuid"],
+        )
+
+    for username, (new_role, new_expiration_time) in local_permissions.items():
+        try:
+            remote_user_uuid = pool.get_remote_user_uuid(offering, username)
+        except WaldurClientException as e:
+            logger.warning(
+                f"Unable to fetch remote user {username} in offering {offering}: {e}"
+            )
+            continue
 
+        if username not in remote_user_roles:
             try:
-                remote_project = utils.get_remote_project(offering, project, client)
-                if not remote_project:
-                    if not local_permissions:
-                        logger.info(
-                            f"Skipping remote project {project} synchronization in "
-                            "offering {offering} because there are no users to be synced."
-                        )
-                    else:
-                        remote_project = utils.create_remote_project(
-                            offering, project, client
-                        )
-                        utils.push_project_users(
-                            offering, project, remote_project["uuid"]
-                        )
-                    continue
-            except rf_exceptions.ValidationError as e:
-                logger.warning(
-                    f"Unable to fetch remote project {project} in offering {offering}: {e}"
+                client.create_project_permission(
+                    remote_project_uuid,
+                    remote_user_uuid,
+                    new_role,
+                    new_expiration_time.isoformat()
+                    if new_expiration_time
+                    else new_expiration_time,
                 )
-                continue
             except WaldurClientException as e:
                 logger.warning(
-                    f"Unable to create remote project {project} in offering {offering}: {e}"
+                    f"Unable to create permission for user [{remote_user_uuid}] with role {new_role} (until {new_expiration_time}) "
+                    f"and project [{remote_project_uuid}] in offering [{offering}]: {e}"
                 )
-                continue
-            else:
-                remote_project_uuid = remote_project["uuid"]
+            continue
+
+        old_role, old_expiration_time, _ = remote_user_roles[username]
 
+        if old_role != new_role:
             try:
-                remote_permissions = client.get_project_permissions(remote_project_uuid)
+                client.remove_project_permission(
+                    remote_project_uuid, remote_user_uuid, old_role
+                )
             except WaldurClientException as e:
                 logger.warning(
-                    f"Unable to get project permissions for project {project} in offering {offering}: {e}"
+                    f"Unable to remove permission for user [{remote_user_uuid}] with role {old_role} "
+                    f"and project [{remote_project_uuid}] in offering [{offering}]: {e}"
                 )
-                continue
+            try:
+                client.create_project_permission(
+                    remote_project_uuid,
+                    remote_user_uuid,
+                    new_role,
+                    new_expiration_time.isoformat()
+                    if new_expiration_time
+                    else new_expiration_time,
+                )
+            except WaldurClientException as e:
+                logger.warning(
+                    f"Unable to create permission for user [{remote_user_uuid}] with role {new_role} (until {new_expiration_time}) "
+                    f"and project [{remote_project_uuid}] in offering [{offering}]: {e}"
+                )
+            continue
 
-            remote_user_roles = collections.defaultdict()
-            for remote_permission in remote_permissions:
-                remote_expiration_time = remote_permission["expiration_time"]
-                remote_user_roles[remote_permission["user_username"]] = (
-                    remote_permission["role_name"],
-                    dateparse.parse_datetime(remote_expiration_time)
-                    if remote_expiration_time
-                    else remote_expiration_time,
-                    remote_permission["user_uuid"],
+        if old_expiration_time != new_expiration_time:
+            try:
+                client.update_project_permission(
+                    remote_project_uuid,
+                    remote_user_uuid,
+                    new_role,
+                    new_expiration_time.isoformat()
+                    if new_expiration_time
+                    else new_expiration_time,
+                )
+            except WaldurClientException as e:
+                logger.warning(
+                    f"Unable to update permission for user [{remote_user_uuid}] with role {old_role} (until {new_expiration_time}) "
+                    f"and project [{remote_project_uuid}] in offering [{offering}]: {e}"
                 )
 
-            for username, (new_role, new_expiration_time) in local_permissions.items():
-                try:
-                    remote_user_uuid = client.get_remote_eduteams_user(username)["uuid"]
-                except WaldurClientException as e:
-                    logger.warning(
-                        f"Unable to fetch remote user {username} in offering {offering}: {e}"
-                    )
-                    continue
+    stale_usernames = set(remote_user_roles.keys()) - set(local_permissions.keys())
+    for username in stale_usernames:
+        role_name, _, remote_user_uuid = remote_user_roles[username]
+        try:
+            client.remove_project_permission(
+                remote_project_uuid, remote_user_uuid, role_name
+            )
+        except WaldurClientException as e:
+            logger.warning(
+                f"Unable to remove permission [{role_name}] for user [{username}] in offering [{offering}]: {e}"
+            )
 
-                if username not in remote_user_roles:
-                    try:
-                        client.create_project_permission(
-                            remote_project_uuid,
-                            remote_user_uuid,
-                            new_role,
-                            new_expiration_time.isoformat()
-                            if new_expiration_time
-                            else new_expiration_time,
-                        )
-                    except WaldurClientException as e:
-                        logger.warning(
-                            f"Unable to create permission for user [{remote_user_uuid}] with role {new_role} (until {new_expiration_time}) "
-                            f"and project [{remote_project_uuid}] in offering [{offering}]: {e}"
-                        )
-                    continue
 
-                old_role, old_expiration_time, _ = remote_user_roles[username]
-
-                if old_role != new_role:
-                    try:
-                        client.remove_project_permission(
-                            remote_project_uuid, remote_user_uuid, old_role
-                        )
-                    except WaldurClientException as e:
-                        logger.warning(
-                            f"Unable to remove permission for user [{remote_user_uuid}] with role {old_role} "
-                            f"and project [{remote_project_uuid}] in offering [{offering}]: {e}"
-                        )
-                    try:
-                        client.create_project_permission(
-                            remote_project_uuid,
-                            remote_user_uuid,
-                            new_role,
-                            new_expiration_time.isoformat()
-                            if new_expiration_time
-                            else new_expiration_time,
-                        )
-                    except WaldurClientException as e:
-                        logger.warning(
-                            f"Unable to create permission for user [{remote_user_uuid}] with role {new_role} (until {new_expiration_time}) "
-                            f"and project [{remote_project_uuid}] in offering [{offering}]: {e}"
-                        )
-                    continue
+@shared_task(
+    name="waldur_mastermind.marketplace_remote.sync_remote_project_permissions"
+)
+def sync_remote_project_permissions():
+    if not settings.WALDUR_AUTH_SOCIAL["ENABLE_EDUTEAMS_SYNC"]:
+        return
 
-                if old_expiration_time != new_expiration_time:
-                    try:
-                        client.update_project_permission(
-                            remote_project_uuid,
-                            remote_user_uuid,
-                            new_role,
-                            new_expiration_time.isoformat()
-                            if new_expiration_time
-                            else new_expiration_time,
-                        )
-                    except WaldurClientException as e:
-                        logger.warning(
-                            f"Unable to update permission for user [{remote_user_uuid}] with role {old_role} (until {new_expiration_time}) "
-                            f"and project [{remote_project_uuid}] in offering [{offering}]: {e}"
-                        )
-
-            stale_usernames = set(remote_user_roles.keys()) - set(
-                local_permissions.keys()
-            )
-            for username in stale_usernames:
-                role_name, _, remote_user_uuid = remote_user_roles[username]
-                try:
-                    client.remove_project_permission(
-                        remote_project_uuid, remote_user_uuid, role_name
-                    )
-                except WaldurClientException as e:
-                    logger.warning(
-                        f"Unable to remove permission [{role_name}] for user [{username}] in offering [{offering}]: {e}"
-                    )
+    pool = utils.RemoteClientPool()
+    jobs = [
+        (project, offering, utils.collect_local_permissions(offering, project))
+        for project, offerings in utils.get_projects_with_remote_offerings().items()
+        for offering in offerings
+    ]
+    with ThreadPoolExecutor(max_workers=PERMISSION_SYNC_WORKERS) as executor:
+        futures = {
+            executor.submit(sync_offering_project_permissions, pool, *job): job
+            for job in jobs
+        }
+        for future in as_completed(futures):
+            project, offering, _ = futures[future]
+            try:
+                future.result()
+            except Exception:
+                logger.exception(
+                    f"Unable to sync permissions of project {project} in offering {offering}"
+                )
 
 
 @shared_task
@@ -1130,7 +1182,9 @@ class RemoteProjectDataPushTask(BackgroundPullTask):
             .values_list("project_id", flat=True)
             .distinct()
         )
-        for project in structure_models.Project.objects.filter(id__in=project_ids):
+        for project in structure_models.Project.objects.filter(
+            id__in=project_ids
+        ).select_related("customer"):
             try:
                 logger.info("Pushing project %s data to remote Waldur", project)
                 request = remote_models.ProjectUpdateRequest(
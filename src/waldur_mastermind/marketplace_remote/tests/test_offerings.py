@@ -283,6 +283,107 @@ class OfferingDetailsPullTest(test.APITransactionTestCase):
 
         self.assertIsNone(endpoints.filter(name="Stale Endpoint").first())
 
+    @responses.activate
+    @mock.patch(
+        "waldur_mastermind.marketplace_remote.tasks.utils.import_offering_thumbnail"
+    )
+    def test_unchanged_offering_is_skipped(self, import_offering_thumbnail):
+        responses.add(
+            responses.GET,
+            f"https://remote-waldur.com/marketplace-public-offerings/{self.offering.backend_id}/",
+            json=self.remote_offering,
+        )
+
+        self.task.pull(self.offering)
+        self.task.pull(self.offering)
+
+        self.assertEqual(import_offering_thumbnail.call_count, 1)
+
+    @responses.activate
+    @mock.patch(
+        "waldur_mastermind.marketplace_remote.tasks.utils.import_offering_thumbnail"
+    )
+    def test_unchanged_offering_is_synced_if_pull_is_forced(
+        self, import_offering_thumbnail
+    ):
+        responses.add(
+            responses.GET,
+            f"https://remote-waldur.com/marketplace-public-offerings/{self.offering.backend_id}/",
+            json=self.remote_offering,
+        )
+
+        self.task.pull(self.offering)
+        self.task.pull(self.offering, force=True)
+
+        self.assertEqual(import_offering_thumbnail.call_count, 2)
+
+    @responses.activate
+    def test_local_offering_change_is_repaired_by_next_pull(self):
+        self.offering.type = PLUGIN_NAME
+        self.offering.save()
+        responses.add(
+            responses.GET,
+            f"https://remote-waldur.com/marketplace-public-offerings/{self.offering.backend_id}/",
+            json=self.remote_offering,
+        )
+        self.task.pull(self.offering)
+
+        self.offering.name = "Local name"
+        self.offering.save()
+        self.task.pull(self.offering)
+
+        self.offering.refresh_from_db()
+        self.assertEqual(self.offering.name, self.remote_offering["name"])
+
+    @responses.activate
+    def test_deleted_local_plan_component_is_restored_by_next_pull(self):
+        self.offering.type = PLUGIN_NAME
+        self.offering.save()
+        responses.add(
+            responses.GET,
+            f"https://remote-waldur.com/marketplace-public-offerings/{self.offering.backend_id}/",
+            json=self.remote_offering,
+        )
+        self.task.pull(self.offering)
+
+        self.plan.components.all().delete()
+        self.task.pull(self.offering)
+
+        self.assertTrue(self.plan.components.filter(component=self.component).exists())
+
+    @mock.patch("waldur_mastermind.marketplace_remote.views.PullOfferingDetails.task")
+    def test_pull_requested_by_user_is_forced(self, task):
+        self.offering.type = PLUGIN_NAME
+        self.offering.save()
+        self.client.force_authenticate(structure_factories.UserFactory(is_staff=True))
+
+        response = self.client.post(
+            f"/api/remote-waldur-api/pull_offering_details/{self.offering.uuid.hex}/"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(task.delay.call_args.kwargs["force"])
+
+    @responses.activate
+    def test_changed_offering_is_synced_again(self):
+        responses.add(
+            responses.GET,
+            f"https://remote-waldur.com/marketplace-public-offerings/{self.offering.backend_id}/",
+            json=self.remote_offering,
+        )
+        self.task.pull(self.offering)
+
+        self.remote_offering["plans"][0]["prices"][self.component.type] = 50.0
+        responses.replace(
+            responses.GET,
+            f"https://remote-waldur.com/marketplace-public-offerings/{self.offering.backend_id}/",
+            json=self.remote_offering,
+        )
+        self.task.pull(self.offering)
+
+        self.plan_component.refresh_from_db()
+        self.assertEqual(self.plan_component.price, 50)
+
 
 class OfferingUpdateTest(test.APITransactionTestCase):
     def setUp(self) -> None:
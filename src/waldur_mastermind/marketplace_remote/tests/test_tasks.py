@@ -1,16 +1,21 @@
+import threading
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from unittest import mock
 
+import responses
 from django.core import mail
 from django.core.exceptions import ObjectDoesNotExist
 from django.test import override_settings
 from django.utils import timezone
+from responses import matchers
 from rest_framework import test
+from waldur_client import WaldurClient, WaldurClientException
 
 from waldur_auth_social.models import ProviderChoices
-from waldur_core.core.utils import format_text, serialize_instance
+from waldur_core.core.utils import format_text, month_start, serialize_instance
 from waldur_core.permissions.enums import RoleEnum
-from waldur_core.permissions.fixtures import CustomerRole
+from waldur_core.permissions.fixtures import CustomerRole, ProjectRole
 from waldur_core.structure.tests.factories import (
     NotificationFactory,
     ProjectFactory,
@@ -18,8 +23,10 @@ from waldur_core.structure.tests.factories import (
 )
 from waldur_core.structure.tests.fixtures import ProjectFixture
 from waldur_mastermind.marketplace import models
+from waldur_mastermind.marketplace import signals as marketplace_signals
 from waldur_mastermind.marketplace.tests import factories, fixtures
 from waldur_mastermind.marketplace_remote import PLUGIN_NAME, tasks, utils
+from waldur_mastermind.marketplace_remote import models as remote_models
 from waldur_mastermind.marketplace_remote.models import ProjectUpdateRequest
 
 
@@ -280,6 +287,110 @@ class SyncRemoteProjectPermissionsTest(test.APITransactionTestCase):
             self.remote_project_uuid, self.remote_user_uuid, RoleEnum.PROJECT_ADMIN
         )
 
+    @mock.patch("waldur_mastermind.marketplace_remote.tasks.PERMISSION_SYNC_WORKERS", 1)
+    def test_remote_user_is_fetched_once_for_all_projects(self):
+        # Arrange
+        self.fixture.manager.registration_method = ProviderChoices.EDUTEAMS
+        self.fixture.manager.save()
+        project = ProjectFactory(customer=self.fixture.customer)
+        project.add_user(self.fixture.manager, ProjectRole.MANAGER)
+        factories.ResourceFactory(
+            offering=self.resource.offering,
+            project=project,
+            state=models.Resource.States.OK,
+        )
+
+        self.client.list_projects.return_value = [{"uuid": self.remote_project_uuid}]
+        self.client.get_remote_eduteams_user.return_value = {
+            "uuid": self.remote_user_uuid
+        }
+        self.client.get_project_permissions.return_value = []
+        self.client.get_remote_eduteams_user.reset_mock()
+
+        # Act
+        tasks.sync_remote_project_permissions()
+
+        # Assert
+        self.client.get_remote_eduteams_user.assert_called_once_with(
+            self.fixture.manager.username
+        )
+        self.assertEqual(self.client.create_project_permission.call_count, 2)
+
+
+class RemoteClientPoolTest(test.APISimpleTestCase):
+    def setUp(self):
+        self.offering = mock.Mock(
+            secret_options={"api_url": "https://example.com/", "token": "token"}
+        )
+        self.client = mock.Mock()
+        self.pool = utils.RemoteClientPool()
+        self.pool._clients[("https://example.com/", "token")] = self.client
+
+    def test_concurrent_lookups_of_the_same_user_are_deduplicated(self):
+        lookup_started = threading.Event()
+        release_lookup = threading.Event()
+
+        def get_remote_eduteams_user(username):
+            lookup_started.set()
+            release_lookup.wait(timeout=5)
+            return {"uuid": "remote-user-uuid"}
+
+        self.client.get_remote_eduteams_user.side_effect = get_remote_eduteams_user
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [
+                executor.submit(self.pool.get_remote_user_uuid, self.offering, "user")
+            ]
+            lookup_started.wait(timeout=5)
+            futures += [
+                executor.submit(self.pool.get_remote_user_uuid, self.offering, "user")
+                for _ in range(3)
+            ]
+            release_lookup.set()
+            results = [future.result() for future in futures]
+
+        self.assertEqual(results, ["remote-user-uuid"] * 4)
+        self.client.get_remote_eduteams_user.assert_called_once_with("user")
+
+    def test_failed_lookup_is_retried(self):
+        self.client.get_remote_eduteams_user.side_effect = [
+            WaldurClientException("Not found"),
+            {"uuid": "remote-user-uuid"},
+        ]
+
+        with self.assertRaises(WaldurClientException):
+            self.pool.get_remote_user_uuid(self.offering, "user")
+
+        self.assertEqual(
+            self.pool.get_remote_user_uuid(self.offering, "user"), "remote-user-uuid"
+        )
+
+
+class ProjectsWithRemoteOfferingsTest(test.APITransactionTestCase):
+    def setUp(self):
+        self.offering = factories.OfferingFactory(type=PLUGIN_NAME)
+        self.resource = factories.ResourceFactory(
+            offering=self.offering, state=models.Resource.States.OK
+        )
+        self.order = factories.OrderFactory(
+            offering=factories.OfferingFactory(type=PLUGIN_NAME),
+            project=self.resource.project,
+            state=models.Order.States.EXECUTING,
+        )
+
+    def test_projects_are_mapped_to_offerings_of_resources_and_orders(self):
+        with self.assertNumQueries(4):
+            result = utils.get_projects_with_remote_offerings()
+
+        self.assertEqual(
+            result, {self.resource.project: {self.offering, self.order.offering}}
+        )
+
+    def test_removed_projects_are_skipped(self):
+        self.resource.project.delete()
+
+        self.assertEqual(utils.get_projects_with_remote_offerings(), {})
+
 
 class DeleteRemoteProjectsTest(test.APITransactionTestCase):
     def setUp(self):
@@ -373,6 +484,141 @@ class OfferingUserPullTest(test.APITransactionTestCase):
         self.assertEqual(offering_user.username, "alice")
 
 
+class OfferingUsagePullTest(test.APITransactionTestCase):
+    def setUp(self):
+        self.patcher = mock.patch(
+            "waldur_mastermind.marketplace_remote.utils.WaldurClient"
+        )
+        self.client = self.patcher.start()()
+        self.fixture = fixtures.MarketplaceFixture()
+        self.offering = self.fixture.offering
+        self.offering.type = PLUGIN_NAME
+        self.offering.backend_id = uuid.uuid4().hex
+        self.offering.secret_options = {
+            "api_url": "https://example.com/",
+            "token": "token",
+        }
+        self.offering.save()
+        self.component = self.fixture.offering_usage_component
+        self.resource = self.fixture.resource
+        self.resource.backend_id = uuid.uuid4().hex
+        self.resource.save()
+        self.plan_period = factories.ResourcePlanPeriodFactory(
+            resource=self.resource,
+            plan=self.resource.plan,
+            start=month_start(timezone.now()),
+        )
+
+    def tearDown(self):
+        super().tearDown()
+        mock.patch.stopall()
+
+    def get_remote_usage(self, usage):
+        now = timezone.localtime()
+        return {
+            "uuid": uuid.uuid4().hex,
+            "resource_uuid": str(uuid.UUID(self.resource.backend_id)),
+            "type": self.component.type,
+            "usage": usage,
+            "description": "",
+            "created": now.isoformat(),
+            "date": now.isoformat(),
+            "recurring": False,
+            "billing_period": month_start(now).strftime("%Y-%m-%d"),
+        }
+
+    def pull(self, **kwargs):
+        tasks.OfferingUsagePullTask().run(serialize_instance(self.offering), **kwargs)
+
+    def test_usages_of_all_offering_resources_are_imported(self):
+        self.client._query_resource_list.return_value = [
+            self.get_remote_usage(10),
+            {**self.get_remote_usage(5), "resource_uuid": uuid.uuid4().hex},
+        ]
+
+        self.pull()
+
+        usage = models.ComponentUsage.objects.get(resource=self.resource)
+        self.assertEqual(usage.usage, 10)
+        self.assertEqual(usage.component, self.component)
+        self.assertEqual(usage.plan_period, self.plan_period)
+        self.assertEqual(models.ComponentUsage.objects.count(), 1)
+
+    def test_component_usages_updated_signal_is_sent(self):
+        self.client._query_resource_list.return_value = [self.get_remote_usage(10)]
+        receiver = mock.Mock()
+        marketplace_signals.component_usages_updated.connect(receiver)
+        self.addCleanup(
+            marketplace_signals.component_usages_updated.disconnect, receiver
+        )
+
+        self.pull()
+
+        component_usages = receiver.call_args.kwargs["component_usages"]
+        self.assertEqual(
+            [usage.resource for usage in component_usages], [self.resource]
+        )
+
+    def test_existing_usage_is_updated(self):
+        self.client._query_resource_list.return_value = [self.get_remote_usage(10)]
+        self.pull()
+        self.client._query_resource_list.return_value = [self.get_remote_usage(20)]
+        self.pull()
+
+        usage = models.ComponentUsage.objects.get(resource=self.resource)
+        self.assertEqual(usage.usage, 20)
+
+    def test_only_changed_usages_are_pulled_after_first_pull(self):
+        self.client._query_resource_list.return_value = []
+
+        self.pull()
+        params = self.client._query_resource_list.call_args[0][1]
+        self.assertEqual(params["offering_uuid"], self.offering.backend_id)
+        self.assertNotIn("modified_after", params)
+
+        self.pull()
+        params = self.client._query_resource_list.call_args[0][1]
+        self.assertIn("modified_after", params)
+
+    def test_full_pull_ignores_watermark(self):
+        self.client._query_resource_list.return_value = []
+        self.pull()
+
+        self.pull(from_creation_date=True)
+        params = self.client._query_resource_list.call_args[0][1]
+        self.assertNotIn("modified_after", params)
+        self.assertNotIn("date_after", params)
+
+    def test_watermark_is_kept_while_resource_is_not_imported(self):
+        self.client._query_resource_list.return_value = [
+            self.get_remote_usage(10),
+            {**self.get_remote_usage(5), "resource_uuid": uuid.uuid4().hex},
+        ]
+        self.pull()
+        self.pull()
+
+        params = self.client._query_resource_list.call_args[0][1]
+        self.assertNotIn("modified_after", params)
+        self.assertFalse(
+            remote_models.OfferingSyncState.objects.get(
+                offering=self.offering
+            ).usages_pulled_at
+        )
+
+    def test_usages_are_listed_per_resource_if_client_does_not_support_query(self):
+        client = mock.Mock(spec=["list_component_usages"])
+        client.list_component_usages.return_value = [self.get_remote_usage(10)]
+
+        usages = utils.list_offering_component_usages(
+            client, self.offering, {"date_after": "2024-09-01"}
+        )
+
+        client.list_component_usages.assert_called_once_with(
+            self.resource.backend_id, date_after="2024-09-01"
+        )
+        self.assertEqual(len(usages), 1)
+
+
 class ResourceOrderImportTest(test.APITransactionTestCase):
     def setUp(self):
         self.patcher = mock.patch(
@@ -541,3 +787,48 @@ class NotificationAboutProjectUpdatesTest(test.APITransactionTestCase):
         NotificationFactory(key=f"marketplace_remote.{event_type}")
         tasks.notify_about_project_details_update(serialized_project)
         self.assertEqual(len(mail.outbox), 2)
+
+
+class ComponentUsagesListTest(test.APITransactionTestCase):
+    def setUp(self):
+        responses.start()
+        self.url = "https://example.com/api/marketplace-component-usages/"
+        self.waldur_client = WaldurClient("https://example.com/api/", "token")
+
+    def tearDown(self):
+        super().tearDown()
+        responses.stop()
+        responses.reset()
+
+    def test_usages_of_offering_are_listed_from_all_pages(self):
+        params = {"offering_uuid": "offering", "modified_after": "2024-09-01"}
+        first_page = f"{self.url}?page=1"
+        second_page = f"{self.url}?page=2"
+        responses.add(
+            responses.GET,
+            self.url,
+            json=[{"uuid": "usage1"}],
+            headers={
+                "Link": f'<{first_page}>; rel="first", '
+                f'<{second_page}>; rel="next", <{second_page}>; rel="last"'
+            },
+            match=[
+                matchers.query_param_matcher({**params, "page_size": "200"}),
+            ],
+        )
+        responses.add(
+            responses.GET,
+            self.url,
+            json=[{"uuid": "usage2"}],
+            headers={
+                "Link": f'<{first_page}>; rel="first", '
+                f'<{first_page}>; rel="prev", <{second_page}>; rel="last"'
+            },
+            match=[matchers.query_param_matcher({"page": "2"})],
+        )
+
+        usages = utils.list_offering_component_usages(
+            self.waldur_client, fixtures.MarketplaceFixture().offering, params
+        )
+
+        self.assertEqual([usage["uuid"] for usage in usages], ["usage1", "usage2"])
@@ -1,13 +1,18 @@
+import hashlib
 import io
+import json
 import logging
+import threading
 from collections import defaultdict
+from concurrent.futures import Future
 
 import requests
+from django.db import transaction
 from django.db.models import Q
 from django.utils import dateparse
 from django.utils.dateparse import parse_datetime
 from rest_framework.exceptions import ValidationError
-from waldur_client import WaldurClient, WaldurClientException
+from waldur_client import Endpoints, WaldurClient, WaldurClientException
 
 from waldur_auth_social.models import ProviderChoices
 from waldur_core.core.utils import get_system_robot
@@ -17,7 +22,9 @@ from waldur_core.permissions.enums import RoleEnum
 from waldur_core.permissions.models import UserRole
 from waldur_core.permissions.utils import get_permissions
 from waldur_core.structure import models as structure_models
+from waldur_mastermind.common import utils as common_utils
 from waldur_mastermind.marketplace import models as marketplace_models
+from waldur_mastermind.marketplace import utils as marketplace_utils
 from waldur_mastermind.marketplace_remote.constants import (
     OFFERING_COMPONENT_FIELDS,
     PLAN_FIELDS,
@@ -40,6 +47,49 @@ def get_client_for_offering(offering):
     return WaldurClient(api_url, token)
 
 
+class RemoteClientPool:
+    """
+    Shares clients and remote user UUID lookups between all projects
+    synchronized within a single run. It is safe to use from multiple threads.
+    """
+
+    def __init__(self):
+        self._clients = {}
+        self._user_uuids = {}
+        self._lock = threading.Lock()
+
+    def get_client(self, offering):
+        options = offering.secret_options
+        key = (options["api_url"], options["token"])
+        with self._lock:
+            if key not in self._clients:
+                self._clients[key] = get_client_for_offering(offering)
+            return self._clients[key]
+
+    def get_remote_user_uuid(self, offering, username):
+        key = (offering.secret_options["api_url"], username)
+        # Only one lookup per user is in flight, other threads wait for its result
+        with self._lock:
+            future = self._user_uuids.get(key)
+            is_lookup_owner = future is None
+            if is_lookup_owner:
+                future = self._user_uuids[key] = Future()
+
+        if is_lookup_owner:
+            try:
+                client = self.get_client(offering)
+                remote_user = client.get_remote_eduteams_user(username)
+            except Exception as e:
+                # Failed lookup is not cached so that it could be retried later
+                with self._lock:
+                    del self._user_uuids[key]
+                future.set_exception(e)
+            else:
+                future.set_result(remote_user["uuid"])
+
+        return future.result()
+
+
 def get_project_backend_id(project):
     return f"{project.customer.uuid}_{project.uuid}"
 
@@ -70,24 +120,16 @@ def get_remote_offerings_for_project(project):
 
 
 def get_projects_with_remote_offerings():
-    projects_with_offerings = defaultdict(set)
+    """
+    Return map from project to set of remote offerings it has resources or pending orders in.
+    Referenced projects and offerings are fetched in bulk.
+    """
     resource_pairs = (
         marketplace_models.Resource.objects.filter(offering__type=PLUGIN_NAME)
         .exclude(state__in=INVALID_RESOURCE_STATES)
-        .values("offering", "project")
+        .values_list("project_id", "offering_id")
         .distinct()
     )
-    for pair in resource_pairs:
-        try:
-            project = structure_models.Project.available_objects.get(pk=pair["project"])
-        except structure_models.Project.DoesNotExist:
-            logger.debug(
-                f'Skipping resource from a removed project with PK {pair["project"]}'
-            )
-            continue
-        offering = marketplace_models.Offering.objects.get(pk=pair["offering"])
-        projects_with_offerings[project].add(offering)
-
     order_pairs = (
         marketplace_models.Order.objects.filter(
             offering__type=PLUGIN_NAME,
@@ -97,19 +139,27 @@ def get_projects_with_remote_offerings():
                 marketplace_models.Order.States.EXECUTING,
             ),
         )
-        .values("offering", "project")
+        .values_list("project_id", "offering_id")
         .distinct()
     )
-    for pair in order_pairs:
-        try:
-            project = structure_models.Project.available_objects.get(pk=pair["project"])
-        except structure_models.Project.DoesNotExist:
+    pairs = set(resource_pairs) | set(order_pairs)
+
+    projects = structure_models.Project.available_objects.select_related(
+        "customer"
+    ).in_bulk({project_id for project_id, _ in pairs})
+    offerings = marketplace_models.Offering.objects.select_related("customer").in_bulk(
+        {offering_id for _, offering_id in pairs}
+    )
+
+    projects_with_offerings = defaultdict(set)
+    for project_id, offering_id in pairs:
+        project = projects.get(project_id)
+        if not project:
             logger.debug(
-                f'Skipping order from a removed project with PK {pair["project"]}'
+                f"Skipping remote offering of a removed project with PK {project_id}"
             )
             continue
-        offering = marketplace_models.Offering.objects.get(pk=pair["offering"])
-        projects_with_offerings[project].add(offering)
+        projects_with_offerings[project].add(offerings[offering_id])
 
     return projects_with_offerings
 
@@ -295,14 +345,15 @@ def sync_project_permission(grant, project, role_name, user, expiration_time):
                 )
 
 
-def push_project_users(offering, project, remote_project_uuid):
-    client = get_client_for_offering(offering)
+def push_project_users(offering, project, remote_project_uuid, pool=None):
+    pool = pool or RemoteClientPool()
+    client = pool.get_client(offering)
 
     permissions = collect_local_permissions(offering, project)
 
     for username, (role_name, expiration_time) in permissions.items():
         try:
-            remote_user_uuid = client.get_remote_eduteams_user(username)["uuid"]
+            remote_user_uuid = pool.get_remote_user_uuid(offering, username)
         except WaldurClientException as e:
             logger.debug(
                 f"Unable to fetch remote user {username} in offering {offering}: {e}"
@@ -357,6 +408,138 @@ def collect_local_permissions(
     return permissions
 
 
+def list_offering_component_usages(client, offering, params):
+    """
+    List component usages of all resources of the offering.
+    WaldurClient exposes only per-resource listing of component usages,
+    so offering-level listing goes through its generic paginated query if it is available.
+    Otherwise usages are listed for each local resource of the offering.
+    """
+    if hasattr(client, "_query_resource_list"):
+        return client._query_resource_list(
+            Endpoints.MarketplaceComponentUsage, dict(params)
+        )
+
+    logger.warning(
+        "Offering-level listing of component usages is not supported by client, "
+        "usages of offering %s are listed for each resource.",
+        offering,
+    )
+    remote_usages = []
+    for backend_id in (
+        marketplace_models.Resource.objects.filter(offering=offering)
+        .exclude(backend_id="")
+        .values_list("backend_id", flat=True)
+    ):
+        remote_usages.extend(
+            client.list_component_usages(
+                backend_id, date_after=params.get("date_after")
+            )
+        )
+    return remote_usages
+
+
+def normalize_uuid(value):
+    return str(value).replace("-", "")
+
+
+def get_plan_period_at(plan_periods, date):
+    """Pick plan period active at given date from periods ordered by start."""
+    result = None
+    for plan_period in plan_periods:
+        if plan_period.start and plan_period.start > date:
+            continue
+        if plan_period.end and plan_period.end <= date:
+            continue
+        result = plan_period
+    return result
+
+
+def import_component_usages(offering, remote_usages, batch_size=500):
+    """
+    Upsert component usages pulled from remote Waldur for all resources of the offering.
+    Resources, components and plan periods are resolved from maps loaded in advance.
+    Returns UUIDs of remote resources which are not imported yet, so their usages are skipped.
+    """
+    resources = {
+        normalize_uuid(resource.backend_id): resource
+        for resource in marketplace_models.Resource.objects.filter(
+            offering=offering
+        ).exclude(backend_id="")
+    }
+    components = {component.type: component for component in offering.components.all()}
+    plan_periods = defaultdict(list)
+    for plan_period in marketplace_models.ResourcePlanPeriod.objects.filter(
+        resource__in=resources.values()
+    ).order_by("start"):
+        plan_periods[plan_period.resource_id].append(plan_period)
+
+    usages = {}
+    missing_resource_uuids = set()
+    for remote_usage in remote_usages:
+        resource_uuid = normalize_uuid(remote_usage["resource_uuid"])
+        resource = resources.get(resource_uuid)
+        if not resource:
+            missing_resource_uuids.add(resource_uuid)
+            continue
+        component = components.get(remote_usage["type"])
+        if not component:
+            continue
+        usage_date = common_utils.parse_datetime(remote_usage["date"])
+        if usage_date < resource.created:
+            logger.info(
+                f"Invalid component usage date detected for resource {resource.id}"
+            )
+            continue
+        plan_period = get_plan_period_at(plan_periods[resource.id], usage_date)
+        billing_period = dateparse.parse_date(remote_usage["billing_period"])
+        usages[(resource.id, component.id, plan_period, billing_period)] = (
+            marketplace_models.ComponentUsage(
+                resource=resource,
+                component=component,
+                plan_period=plan_period,
+                billing_period=billing_period,
+                usage=remote_usage["usage"],
+                description=remote_usage["description"],
+                created=parse_datetime(remote_usage["created"]),
+                date=usage_date,
+                recurring=remote_usage["recurring"],
+                backend_id=remote_usage["uuid"],
+            )
+        )
+
+    if missing_resource_uuids:
+        logger.warning(
+            "Usages of offering %s are skipped for remote resources "
+            "which are not imported: %s",
+            offering,
+            ", ".join(sorted(missing_resource_uuids)),
+        )
+
+    usages = list(usages.values())
+    if usages:
+        with transaction.atomic():
+            marketplace_utils.save_component_usages(
+                usages,
+                [
+                    "usage",
+                    "description",
+                    "created",
+                    "date",
+                    "recurring",
+                    "backend_id",
+                ],
+                batch_size=batch_size,
+            )
+
+    logger.info(
+        "Component usages of offering %s have been imported: %s",
+        offering,
+        len(usages),
+    )
+    return missing_resource_uuids
+
+
 def parse_resource_state(serialized_state):
     return {v: k for (k, v) in marketplace_models.Resource.States.CHOICES}[
         serialized_state
@@ -476,6 +659,11 @@ def import_plans(local_offering, remote_offering, local_components_map):
             )
 
 
+def get_remote_offering_hash(remote_offering):
+    content = json.dumps(remote_offering, sort_keys=True, default=str)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
 def import_offering_thumbnail(
     local_offering: marketplace_models.Offering, remote_offering
 ):
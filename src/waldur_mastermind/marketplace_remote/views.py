@@ -202,6 +202,8 @@ class CancelTerminationOrderView(APIView):
 
 
 class OfferingActionView(APIView):
+    task_kwargs = {}
+
     def post(self, request, uuid):
         qs = models.Offering.objects.filter(type=PLUGIN_NAME)
         offering = get_object_or_404(qs, uuid=uuid)
@@ -211,12 +213,13 @@ class OfferingActionView(APIView):
             request, PermissionEnum.UPDATE_OFFERING, offering.customer
         ):
             raise PermissionDenied()
-        self.task.delay(serialize_instance(offering))
+        self.task.delay(serialize_instance(offering), **self.task_kwargs)
         return Response(status=status.HTTP_200_OK)
 
 
 class PullOfferingDetails(OfferingActionView):
     task = tasks.OfferingPullTask()
+    task_kwargs = {"force": True}
 
 
 class PullOfferingUsers(OfferingActionView):
@@ -28,7 +28,10 @@ class VirtualMachineRegistrator(MarketplaceRegistrator):
             .distinct()
         )
 
-    def _create_item(self, source, invoice, start, end, **kwargs):
+    def get_sources_for_customers(self, customers):
+        return {customer.id: self.get_sources(customer) for customer in customers}
+
+    def _build_items(self, source, invoice, start, end, **kwargs):
         try:
             resource = marketplace_models.Resource.objects.get(scope=source)
             plan = resource.plan
@@ -39,7 +42,7 @@ class VirtualMachineRegistrator(MarketplaceRegistrator):
                     "Resource ID: %s",
                     resource.id,
                 )
-                return
+                return []
         except marketplace_models.Resource.DoesNotExist:
             logger.warning(
                 "Skipping VMware item invoice creation because "
@@ -47,7 +50,7 @@ class VirtualMachineRegistrator(MarketplaceRegistrator):
                 "Resource ID: %s",
                 source.id,
             )
-            return
+            return []
 
         components_map = {
             plan_component.component.type: plan_component.price
@@ -62,7 +65,7 @@ class VirtualMachineRegistrator(MarketplaceRegistrator):
                 plan.id,
                 ", ".join(missing_components),
             )
-            return
+            return []
 
         cores_price = components_map["cpu"] * source.cores
         ram_price = components_map["ram"] * mb_to_gb(source.ram)
@@ -70,17 +73,19 @@ class VirtualMachineRegistrator(MarketplaceRegistrator):
         total_price = cores_price + ram_price + disk_price
 
         details = self.get_details(source)
-        invoices_models.InvoiceItem.objects.create(
-            resource=resource,
-            project=_get_project(source),
-            unit_price=total_price,
-            unit=plan.unit,
-            article_code=plan.article_code,
-            invoice=invoice,
-            start=start,
-            end=end,
-            details=details,
-        )
+        return [
+            invoices_models.InvoiceItem(
+                resource=resource,
+                project=_get_project(source),
+                unit_price=total_price,
+                unit=plan.unit,
+                article_code=plan.article_code,
+                invoice=invoice,
+                start=start,
+                end=end,
+                details=details,
+            )
+        ]
 
     def get_name(self, source):
         return f"{source.name} ({source.cores} CPU, {mb_to_gb(source.ram)} GB RAM, {mb_to_gb(source.total_disk)} GB disk)"
@@ -9,10 +9,19 @@ class PolicyConfig(AppConfig):
         from django.db.models import signals
 
         from waldur_core.core.utils import camel_case_to_underscore
+        from waldur_mastermind.invoices import models as invoices_models
+        from waldur_mastermind.invoices import signals as invoices_signals
+        from waldur_mastermind.marketplace import models as marketplace_models
+        from waldur_mastermind.marketplace import signals as marketplace_signals
         from waldur_mastermind.policy import handlers
 
         from . import models
 
+        bulk_signals = {
+            invoices_models.InvoiceItem: invoices_signals.invoice_items_updated,
+            marketplace_models.ComponentUsage: marketplace_signals.component_usages_updated,
+        }
+
         for klass in [
             models.ProjectEstimatedCostPolicy,
             models.CustomerEstimatedCostPolicy,
@@ -27,6 +36,11 @@ class PolicyConfig(AppConfig):
                     sender=klass.trigger_class,
                     dispatch_uid=f"{klass_name}_handler",
                 )
+                bulk_signals[klass.trigger_class].connect(
+                    getattr(handlers, f"{klass_name}_bulk_trigger_handler"),
+                    sender=klass.trigger_class,
+                    dispatch_uid=f"{klass_name}_bulk_handler",
+                )
 
             for observable_klass in klass.observable_classes:
                 signals.post_save.connect(
@@ -84,6 +84,53 @@ offering_estimated_cost_policy_trigger_handler = get_offering_trigger_handler(
 )
 
 
+def get_offering_bulk_trigger_handler(klass, instances_kwarg):
+    def handler(sender, **kwargs):
+        scopes = {
+            (
+                instance.resource.offering_id,
+                instance.resource.project.customer.organization_group_id,
+            )
+            for instance in kwargs[instances_kwarg]
+            if instance.resource
+        }
+
+        for offering_id, organization_group_id in scopes:
+            policies = klass.objects.filter(
+                scope_id=offering_id,
+                organization_groups=organization_group_id,
+            )
+            run_immediate_actions(policies)
+
+    return handler
+
+
+offering_usage_policy_bulk_trigger_handler = get_offering_bulk_trigger_handler(
+    models.OfferingUsagePolicy, "component_usages"
+)
+offering_estimated_cost_policy_bulk_trigger_handler = get_offering_bulk_trigger_handler(
+    models.OfferingEstimatedCostPolicy, "invoice_items"
+)
+
+
+def customer_estimated_cost_policy_bulk_trigger_handler(
+    sender, invoice_items, **kwargs
+):
+    customer_ids = {invoice_item.invoice.customer_id for invoice_item in invoice_items}
+    policies = models.CustomerEstimatedCostPolicy.objects.filter(
+        scope_id__in=customer_ids
+    )
+    run_immediate_actions(policies)
+
+
+def project_estimated_cost_policy_bulk_trigger_handler(sender, invoice_items, **kwargs):
+    project_ids = {invoice_item.project_id for invoice_item in invoice_items}
+    policies = models.ProjectEstimatedCostPolicy.objects.filter(
+        scope_id__in=project_ids
+    )
+    run_immediate_actions(policies)
+
+
 def get_estimated_cost_policy_handler_for_observable_class(klass, observable_class):
     def handler(sender, instance, created=False, **kwargs):
         if not isinstance(instance, observable_class):
@@ -6,6 +6,7 @@ from rest_framework import status, test
 
 from waldur_core.core import utils as core_utils
 from waldur_core.structure.tests import factories as structure_factories
+from waldur_mastermind.marketplace import utils as marketplace_utils
 from waldur_mastermind.marketplace.tests import factories as marketplace_factories
 from waldur_mastermind.policy.models import OfferingUsagePolicy
 from waldur_mastermind.policy.tests import factories, fixtures
@@ -172,6 +173,33 @@ class OfferingUsagePolicyTriggerTest(test.APITransactionTestCase):
         self.policy.refresh_from_db()
         self.assertTrue(self.policy.has_fired)
 
+    def test_policy_has_fired_if_usages_are_set_in_bulk(self):
+        self.customer.organization_group = self.organization_group
+        self.customer.save()
+        plan_period = marketplace_factories.ResourcePlanPeriodFactory(
+            resource=self.resource, plan=self.resource.plan
+        )
+
+        marketplace_utils.set_component_usages(
+            [
+                {
+                    "resource": self.resource,
+                    "plan_period": plan_period,
+                    "usages": [
+                        {
+                            "type": self.component.type,
+                            "amount": self.fixture.component_limit.limit + 1,
+                            "recurring": False,
+                        }
+                    ],
+                    "components": {self.component.type: self.component},
+                }
+            ]
+        )
+
+        self.policy.refresh_from_db()
+        self.assertTrue(self.policy.has_fired)
+
     @freeze_time("2024-09-01")
     def test_policy_period(self):
         self.customer.organization_group = self.organization_group
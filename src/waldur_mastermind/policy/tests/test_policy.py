@@ -5,6 +5,8 @@ from freezegun import freeze_time
 from rest_framework import status, test
 
 from waldur_core.structure.tests import factories as structure_factories
+from waldur_mastermind.invoices import models as invoices_models
+from waldur_mastermind.invoices import signals as invoices_signals
 from waldur_mastermind.invoices.tests import factories as invoices_factories
 from waldur_mastermind.marketplace import models as marketplace_models
 from waldur_mastermind.marketplace import utils as marketplace_utils
@@ -145,6 +147,22 @@ class ActionsFunctionsTest(test.APITransactionTestCase):
         self.assertEqual(self.policy.has_fired, False)
         self.assertTrue(self.policy.fired_datetime)
 
+    def test_has_fired_if_invoice_items_are_updated_in_bulk(self):
+        invoice_item = invoices_factories.InvoiceItemFactory(
+            invoice=self.invoice,
+            project=self.project,
+            quantity=1,
+            unit_price=0,
+        )
+        invoice_item.unit_price = self.policy.limit_cost + 1
+        invoices_models.InvoiceItem.objects.bulk_update([invoice_item], ["unit_price"])
+        invoices_signals.invoice_items_updated.send(
+            sender=invoices_models.InvoiceItem, invoice_items=[invoice_item]
+        )
+
+        self.policy.refresh_from_db()
+        self.assertEqual(self.policy.has_fired, True)
+
     def test_compensation(self):
         self.create_or_update_invoice_item(self.policy.limit_cost - 1)
         self.policy.refresh_from_db()
@@ -1,3 +1,4 @@
+import collections
 import functools
 import logging
 import re
@@ -22,6 +23,7 @@ from requests import ConnectionError
 from waldur_core.core import models as core_models
 from waldur_core.core import utils as core_utils
 from waldur_core.core.utils import create_batch_fetcher, pwgen
+from waldur_core.logging.loggers import buffered_events
 from waldur_core.structure.backend import ServiceBackend, log_backend_action
 from waldur_core.structure.registry import get_resource_type
 from waldur_core.structure.signals import resource_pulled
@@ -64,6 +66,17 @@ def get_tenant_session(tenant: models.Tenant):
     return get_keystone_session(tenant.service_settings, tenant)
 
 
+def is_changed_since(backend_object, changes_since):
+    """Check if Cinder object has been updated since the given time."""
+    updated_at = getattr(backend_object, "updated_at", None)
+    if not updated_at:
+        return True
+    updated_at = dateparse.parse_datetime(updated_at)
+    if timezone.is_naive(updated_at):
+        updated_at = timezone.make_aware(updated_at, timezone.utc)
+    return updated_at >= changes_since
+
+
 def reraise_exceptions(func):
     @functools.wraps(func)
     def wrapped(self, *args, **kwargs):
@@ -692,7 +705,7 @@ class OpenStackBackend(ServiceBackend):
         except neutron_exceptions.NeutronClientException as e:
             raise OpenStackBackendError(e)
 
-        with transaction.atomic():
+        with transaction.atomic(), buffered_events():
             self._update_tenant_security_groups(tenant, backend_security_groups)
             self._remove_stale_security_groups([tenant], backend_security_groups)
 
@@ -3034,8 +3047,13 @@ class OpenStackBackend(ServiceBackend):
 
         return local_port
 
-    def pull_tenant_volumes(self, tenant: models.Tenant):
-        backend_volumes = self.get_volumes(tenant)
+    def pull_tenant_volumes(self, tenant: models.Tenant, changes_since=None):
+        """Pull volumes of the tenant.
+
+        If changes_since is specified, only volumes updated since then are pulled.
+        Deleted volumes are detected only by full pull.
+        """
+        backend_volumes = self.get_volumes(tenant, changes_since)
         volumes = models.Volume.objects.filter(
             tenant=tenant,
             state__in=[
@@ -3047,6 +3065,8 @@ class OpenStackBackend(ServiceBackend):
             backend_volume.backend_id: backend_volume
             for backend_volume in backend_volumes
         }
+        if changes_since:
+            volumes = volumes.filter(backend_id__in=backend_volumes_map.keys())
         for volume in volumes:
             try:
                 backend_volume = backend_volumes_map[volume.backend_id]
@@ -3060,8 +3080,13 @@ class OpenStackBackend(ServiceBackend):
                 )
                 handle_resource_update_success(volume)
 
-    def pull_tenant_snapshots(self, tenant: models.Tenant):
-        backend_snapshots = self.get_snapshots(tenant)
+    def pull_tenant_snapshots(self, tenant: models.Tenant, changes_since=None):
+        """Pull snapshots of the tenant.
+
+        If changes_since is specified, only snapshots updated since then are pulled.
+        Deleted snapshots are detected only by full pull.
+        """
+        backend_snapshots = self.get_snapshots(tenant, changes_since)
         snapshots = models.Snapshot.objects.filter(
             tenant=tenant,
             state__in=[
@@ -3073,6 +3098,8 @@ class OpenStackBackend(ServiceBackend):
             backend_snapshot.backend_id: backend_snapshot
             for backend_snapshot in backend_snapshots
         }
+        if changes_since:
+            snapshots = snapshots.filter(backend_id__in=backend_snapshots_map.keys())
         for snapshot in snapshots:
             try:
                 backend_snapshot = backend_snapshots_map[snapshot.backend_id]
@@ -3086,9 +3113,14 @@ class OpenStackBackend(ServiceBackend):
                 )
                 handle_resource_update_success(snapshot)
 
-    def pull_tenant_instances(self, tenant: models.Tenant):
-        backend_instances = self.get_instances(tenant)
-        instances = models.Instance.objects.filter(
+    def pull_tenant_instances(self, tenant: models.Tenant, changes_since=None):
+        """Pull instances of the tenant.
+
+        If changes_since is specified, only instances changed since then are pulled.
+        In this case Nova reports deleted instances too.
+        """
+        backend_instances = self.get_instances(tenant, changes_since)
+        tenant_instances = models.Instance.objects.filter(
             tenant=tenant,
             state__in=[
                 models.Instance.States.OK,
@@ -3099,16 +3131,29 @@ class OpenStackBackend(ServiceBackend):
             backend_instance.backend_id: backend_instance
             for backend_instance in backend_instances
         }
+        instances = tenant_instances
+        if changes_since:
+            instances = instances.filter(backend_id__in=backend_instances_map.keys())
+        pulled_instances = []
+        missing_instance_ids = []
         for instance in instances:
-            try:
-                backend_instance = backend_instances_map[instance.backend_id]
-            except KeyError:
+            backend_instance = backend_instances_map.get(instance.backend_id)
+            if backend_instance is None or backend_instance.runtime_state == "DELETED":
                 handle_resource_not_found(instance)
+                missing_instance_ids.append(instance.id)
             else:
                 self.update_instance_fields(instance, backend_instance)
-                # XXX: can be optimized after https://goo.gl/BZKo8Y will be resolved.
-                self.pull_instance_security_groups(instance)
-                handle_resource_update_success(instance)
+                pulled_instances.append(instance)
+        # Security groups of instance could be changed without changing the instance itself,
+        # so they are reconciled for all instances of the tenant, not only for pulled ones.
+        if changes_since:
+            self.pull_instances_security_groups(
+                tenant, list(tenant_instances.exclude(id__in=missing_instance_ids))
+            )
+        else:
+            self.pull_instances_security_groups(tenant, pulled_instances)
+        for instance in pulled_instances:
+            handle_resource_update_success(instance)
 
     def update_instance_fields(self, instance: models.Instance, backend_instance):
         # Preserve flavor fields in Waldur database if flavor is deleted in OpenStack
@@ -3384,13 +3429,21 @@ class OpenStackBackend(ServiceBackend):
                 ).first()
         return volume
 
-    def get_volumes(self, tenant: models.Tenant):
+    def get_volumes(self, tenant: models.Tenant, changes_since=None):
         session = get_tenant_session(tenant)
         cinder = get_cinder_client(session)
         try:
             backend_volumes = cinder.volumes.list()
         except cinder_exceptions.ClientException as e:
             raise OpenStackBackendError(e)
+        # Filtering by update time is supported by Cinder API since version 3.60,
+        # so that volumes are filtered on client side to skip conversion of unchanged ones.
+        if changes_since:
+            backend_volumes = [
+                backend_volume
+                for backend_volume in backend_volumes
+                if is_changed_since(backend_volume, changes_since)
+            ]
         return [
             self._backend_volume_to_volume(tenant, backend_volume)
             for backend_volume in backend_volumes
@@ -3527,13 +3580,19 @@ class OpenStackBackend(ServiceBackend):
             ).first()
         return snapshot
 
-    def get_snapshots(self, tenant: models.Tenant):
+    def get_snapshots(self, tenant: models.Tenant, changes_since=None):
         session = get_tenant_session(tenant)
         cinder = get_cinder_client(session)
         try:
             backend_snapshots = cinder.volume_snapshots.list()
         except cinder_exceptions.ClientException as e:
             raise OpenStackBackendError(e)
+        if changes_since:
+            backend_snapshots = [
+                backend_snapshot
+                for backend_snapshot in backend_snapshots
+                if is_changed_since(backend_snapshot, changes_since)
+            ]
         return [
             self._backend_snapshot_to_snapshot(tenant, backend_snapshot)
             for backend_snapshot in backend_snapshots
@@ -4072,15 +4131,18 @@ class OpenStackBackend(ServiceBackend):
         except nova_exceptions.ClientException as e:
             raise OpenStackBackendError(e)
 
-    def get_instances(self, tenant: models.Tenant) -> list[models.Instance]:
+    def get_instances(
+        self, tenant: models.Tenant, changes_since=None
+    ) -> list[models.Instance]:
         nova = get_nova_client(self.admin_session)
+        # We use search_opts according to the rules in
+        # https://docs.openstack.org/api-ref/compute/?expanded=list-servers-detail#list-server-request
+        search_opts = {"project_id": tenant.backend_id, "all_tenants": 1}
+        if changes_since:
+            search_opts["changes-since"] = changes_since.isoformat()
 
         try:
-            # We use search_opts according to the rules in
-            # https://docs.openstack.org/api-ref/compute/?expanded=list-servers-detail#list-server-request
-            backend_instances = nova.servers.list(
-                search_opts={"project_id": tenant.backend_id, "all_tenants": 1}
-            )
+            backend_instances = nova.servers.list(search_opts=search_opts)
         except nova_exceptions.ClientException as e:
             raise OpenStackBackendError(e)
 
@@ -4489,6 +4551,70 @@ class OpenStackBackend(ServiceBackend):
             else:
                 instance.security_groups.add(security_group)
 
+    def pull_instances_security_groups(self, tenant: models.Tenant, instances):
+        """Pull security groups of tenant instances at once.
+
+        Security groups of instance are collected from its ports,
+        so that ports of the tenant are listed in single Neutron request.
+        """
+        if not instances:
+            return
+        session = get_tenant_session(tenant)
+        neutron = get_neutron_client(session)
+        try:
+            backend_ports = neutron.list_ports(
+                tenant_id=tenant.backend_id, fields=["device_id", "security_groups"]
+            )["ports"]
+        except neutron_exceptions.NeutronClientException as e:
+            raise OpenStackBackendError(e)
+
+        remote_groups = collections.defaultdict(set)
+        for backend_port in backend_ports:
+            remote_groups[backend_port["device_id"]].update(
+                backend_port["security_groups"]
+            )
+        security_group_mapping = self._tenant_mappings(
+            models.SecurityGroup.objects.filter(tenant=tenant)
+        )
+
+        remote_ids = set()
+        for instance in instances:
+            for group_id in remote_groups[instance.backend_id]:
+                try:
+                    remote_ids.add((instance.id, security_group_mapping[group_id]))
+                except KeyError:
+                    logger.warning(
+                        f"Security group with id {group_id} does not exist in database. "
+                        f"Server ID: {instance.backend_id}"
+                    )
+
+        InstanceSecurityGroup = models.Instance.security_groups.through
+        local_rows = {
+            (instance_id, group_id): row_id
+            for row_id, instance_id, group_id in InstanceSecurityGroup.objects.filter(
+                instance__in=instances
+            )
+            .exclude(securitygroup__backend_id="")
+            .values_list("id", "instance_id", "securitygroup_id")
+        }
+        local_ids = set(local_rows)
+
+        stale_ids = local_ids - remote_ids
+        if stale_ids:
+            InstanceSecurityGroup.objects.filter(
+                id__in=[local_rows[key] for key in stale_ids]
+            ).delete()
+
+        InstanceSecurityGroup.objects.bulk_create(
+            [
+                InstanceSecurityGroup(
+                    instance_id=instance_id, securitygroup_id=group_id
+                )
+                for instance_id, group_id in remote_ids - local_ids
+            ],
+            ignore_conflicts=True,
+        )
+
     @log_backend_action()
     def push_instance_security_groups(self, instance: models.Instance):
         session = get_tenant_session(instance.tenant)
@@ -0,0 +1,28 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("openstack", "0043_alter_backup_options_alter_port_options_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tenant",
+            name="resources_pulled_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Start time of the latest pull of tenant resources.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="tenant",
+            name="resources_reconciled_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Start time of the latest full pull of tenant resources.",
+                null=True,
+            ),
+        ),
+    ]
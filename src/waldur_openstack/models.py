@@ -70,6 +70,16 @@ class Tenant(
     )
     user_username = models.CharField(max_length=50, blank=True)
     user_password = models.CharField(max_length=50, blank=True)
+    resources_pulled_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text=_("Start time of the latest pull of tenant resources."),
+    )
+    resources_reconciled_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text=_("Start time of the latest full pull of tenant resources."),
+    )
 
     tracker = FieldTracker()
 
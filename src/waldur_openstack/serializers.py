@@ -27,6 +27,7 @@ from waldur_core.core import signals as core_signals
 from waldur_core.core import utils as core_utils
 from waldur_core.core.validators import BackendURLValidator, validate_x509_certificate
 from waldur_core.quotas.models import SharedQuotaMixin
+from waldur_core.quotas.serializers import QuotasListSerializer
 from waldur_core.structure import models as structure_models
 from waldur_core.structure import permissions as structure_permissions
 from waldur_core.structure import serializers as structure_serializers
@@ -791,6 +792,7 @@ class TenantSerializer(structure_serializers.BaseResourceSerializer):
             "subnet_cidr",
             "default_volume_type_name",
         )
+        list_serializer_class = QuotasListSerializer
         read_only_fields = (
             structure_serializers.BaseResourceSerializer.Meta.read_only_fields
             + (
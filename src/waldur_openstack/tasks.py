@@ -53,9 +53,6 @@ class TenantCreateSuccessTask(core_tasks.StateTransitionTask):
 class TenantPullQuotas(core_tasks.BackgroundTask):
     name = "openstack.TenantPullQuotas"
 
-    def is_equal(self, other_task):
-        return self.name == other_task.get("name")
-
     def run(self):
         from . import executors
 
@@ -237,9 +234,6 @@ class BaseScheduleTask(core_tasks.BackgroundTask):
     model = NotImplemented
     resource_attribute = NotImplemented
 
-    def is_equal(self, other_task):
-        return self.name == other_task.get("name")
-
     @transaction.atomic()
     def run(self):
         schedules = self.model.objects.filter(
@@ -381,9 +375,6 @@ class ScheduleBackups(BaseScheduleTask):
 class BaseDeleteExpiredResourcesTask(core_tasks.BackgroundTask):
     model = NotImplemented
 
-    def is_equal(self, other_task):
-        return self.name == other_task.get("name")
-
     def _get_executor(self):
         raise NotImplementedError()
 
@@ -494,17 +485,46 @@ class ThrottleProvisionStateTask(
 
 
 class TenantResourcesPullTask(structure_tasks.BackgroundPullTask):
+    """Pull resources changed since the previous pull.
+
+    Full pull is done once per reconciliation period in order to detect deleted resources.
+    """
+
+    # Covers clock difference between Waldur and OpenStack
+    changes_since_margin = timezone.timedelta(minutes=5)
+
+    def get_changes_since(self, tenant: models.Tenant, pulled_at):
+        period = settings.WALDUR_OPENSTACK["TENANT_RESOURCES_RECONCILIATION_PERIOD"]
+        if (
+            not period
+            or not tenant.resources_pulled_at
+            or not tenant.resources_reconciled_at
+            or tenant.resources_reconciled_at < pulled_at - period
+        ):
+            return None
+        return tenant.resources_pulled_at - self.changes_since_margin
+
     def pull(self, tenant: models.Tenant):
         backend = OpenStackBackend(tenant.service_settings)
-        backend.pull_tenant_instances(tenant)
-        backend.pull_tenant_volumes(tenant)
-        backend.pull_tenant_snapshots(tenant)
+        pulled_at = timezone.now()
+        changes_since = self.get_changes_since(tenant, pulled_at)
+        backend.pull_tenant_instances(tenant, changes_since)
+        backend.pull_tenant_volumes(tenant, changes_since)
+        backend.pull_tenant_snapshots(tenant, changes_since)
+
+        update_fields = {"resources_pulled_at": pulled_at}
+        if changes_since is None:
+            update_fields["resources_reconciled_at"] = pulled_at
+        models.Tenant.objects.filter(pk=tenant.pk).update(**update_fields)
 
 
 class TenantResourcesListPullTask(structure_tasks.BackgroundListPullTask):
     name = "openstack.tenant_resources_list_pull_task"
     pull_task = TenantResourcesPullTask
     model = models.Tenant
+    chunk_size = 5
+    max_concurrency = 4
+    schedule_period = 50 * 60
 
 
 class TenantSubresourcesPullTask(structure_tasks.BackgroundPullTask):
@@ -523,6 +543,9 @@ class TenantSubresourcesListPullTask(structure_tasks.BackgroundListPullTask):
     name = "openstack.tenant_subresources_list_pull_task"
     pull_task = TenantSubresourcesPullTask
     model = models.Tenant
+    chunk_size = 5
+    max_concurrency = 4
+    schedule_period = 50 * 60
 
 
 class TenantPropertiesPullTask(structure_tasks.BackgroundPullTask):
@@ -539,3 +562,6 @@ class TenantPropertiesListPullTask(structure_tasks.BackgroundListPullTask):
     name = "openstack.tenant_properties_list_pull_task"
     pull_task = TenantPropertiesPullTask
     model = models.Tenant
+    chunk_size = 5
+    max_concurrency = 4
+    schedule_period = 50 * 60
@@ -4,6 +4,7 @@ from unittest import mock
 from cinderclient.v2.volumes import Volume
 from ddt import data, ddt
 from django.test import TestCase
+from django.utils.dateparse import parse_datetime
 from novaclient.v2.flavors import Flavor
 from novaclient.v2.servers import Server
 
@@ -108,6 +109,20 @@ class GetVolumesTest(VolumesBaseTest):
         self.assertEqual(sorted(returned_backend_ids), sorted(expected_backend_ids))
 
 
+class GetChangedVolumesTest(VolumesBaseTest):
+    def test_only_updated_volumes_are_returned(self):
+        old_volume, new_volume = self._generate_volumes(backend=True, count=2)
+        old_volume.updated_at = "2024-01-01T10:00:00.000000"
+        new_volume.updated_at = "2024-01-02T10:00:00.000000"
+        self.mocked_cinder.volumes.list.return_value = [old_volume, new_volume]
+
+        result = self.backend.get_volumes(
+            self.tenant, changes_since=parse_datetime("2024-01-02T00:00:00Z")
+        )
+
+        self.assertEqual([item.backend_id for item in result], [new_volume.id])
+
+
 class CreateVolumesTest(VolumesBaseTest):
     def setUp(self):
         super().setUp()
@@ -790,6 +805,121 @@ class GetInstancesTest(BaseBackendTest):
         self.assertEqual(sorted(returned_backend_ids), sorted(expected_backend_ids))
 
 
+class PullTenantInstancesTest(BaseBackendTest):
+    def setUp(self):
+        super().setUp()
+        self.instance = self.fixture.instance
+        self.mocked_nova.flavors.get.side_effect = self._get_valid_flavor
+
+    def test_changes_since_is_passed_to_nova(self):
+        self.mocked_nova.servers.list.return_value = []
+        changes_since = parse_datetime("2024-01-02T00:00:00Z")
+
+        self.backend.pull_tenant_instances(self.tenant, changes_since)
+
+        search_opts = self.mocked_nova.servers.list.call_args.kwargs["search_opts"]
+        self.assertEqual(search_opts["changes-since"], changes_since.isoformat())
+
+    def test_unchanged_instance_is_not_marked_as_erred(self):
+        self.mocked_nova.servers.list.return_value = []
+
+        self.backend.pull_tenant_instances(
+            self.tenant, parse_datetime("2024-01-02T00:00:00Z")
+        )
+
+        self.instance.refresh_from_db()
+        self.assertEqual(self.instance.state, models.Instance.States.OK)
+
+    def test_deleted_instance_is_marked_as_erred(self):
+        backend_instance = self._get_valid_instance(self.instance.backend_id)
+        backend_instance.status = "DELETED"
+        self.mocked_nova.servers.list.return_value = [backend_instance]
+
+        self.backend.pull_tenant_instances(
+            self.tenant, parse_datetime("2024-01-02T00:00:00Z")
+        )
+
+        self.instance.refresh_from_db()
+        self.assertEqual(self.instance.state, models.Instance.States.ERRED)
+
+    def test_security_groups_of_unchanged_instance_are_pulled(self):
+        security_group = factories.SecurityGroupFactory(tenant=self.tenant)
+        self.mocked_nova.servers.list.return_value = []
+        self.mocked_neutron.list_ports.return_value = {
+            "ports": [
+                {
+                    "device_id": self.instance.backend_id,
+                    "security_groups": [security_group.backend_id],
+                }
+            ]
+        }
+
+        self.backend.pull_tenant_instances(
+            self.tenant, parse_datetime("2024-01-02T00:00:00Z")
+        )
+
+        self.assertEqual(list(self.instance.security_groups.all()), [security_group])
+        self.mocked_neutron.list_ports.assert_called_once()
+
+    def test_missing_instance_is_marked_as_erred_during_full_pull(self):
+        self.mocked_nova.servers.list.return_value = []
+
+        self.backend.pull_tenant_instances(self.tenant)
+
+        self.instance.refresh_from_db()
+        self.assertEqual(self.instance.state, models.Instance.States.ERRED)
+
+
+class PullInstancesSecurityGroupsTest(BaseBackendTest):
+    def setUp(self):
+        super().setUp()
+        self.instance = self.fixture.instance
+        self.stale_group = factories.SecurityGroupFactory(tenant=self.tenant)
+        self.kept_group = factories.SecurityGroupFactory(tenant=self.tenant)
+        self.new_group = factories.SecurityGroupFactory(tenant=self.tenant)
+        self.instance.security_groups.add(self.stale_group, self.kept_group)
+        self.mocked_neutron.list_ports.return_value = {
+            "ports": [
+                {
+                    "device_id": self.instance.backend_id,
+                    "security_groups": [self.kept_group.backend_id],
+                },
+                {
+                    "device_id": self.instance.backend_id,
+                    "security_groups": [
+                        self.kept_group.backend_id,
+                        self.new_group.backend_id,
+                    ],
+                },
+                {
+                    "device_id": "router_id",
+                    "security_groups": [self.stale_group.backend_id],
+                },
+            ]
+        }
+
+    def test_security_groups_are_pulled_from_tenant_ports(self):
+        self.backend.pull_instances_security_groups(self.tenant, [self.instance])
+
+        self.assertEqual(
+            set(self.instance.security_groups.all()),
+            {self.kept_group, self.new_group},
+        )
+        self.mocked_nova.servers.list_security_group.assert_not_called()
+
+    def test_ports_are_listed_once_per_tenant(self):
+        other_instance = factories.InstanceFactory(
+            tenant=self.tenant, project=self.fixture.project
+        )
+
+        self.backend.pull_instances_security_groups(
+            self.tenant, [self.instance, other_instance]
+        )
+
+        self.mocked_neutron.list_ports.assert_called_once()
+        self.assertEqual(other_instance.security_groups.count(), 0)
+
+
 class ImportInstanceTest(BaseBackendTest):
     def setUp(self):
         super().setUp()
@@ -331,3 +331,56 @@ class SnapshotScheduleTaskTest(TestCase):
             "event_type"
         ]
         self.assertEqual(event_type, "resource_snapshot_schedule_deactivated")
+
+
+@mock.patch("waldur_openstack.tasks.OpenStackBackend")
+class TenantResourcesPullTaskTest(TestCase):
+    def setUp(self):
+        self.tenant = factories.TenantFactory()
+
+    def pull(self):
+        tasks.TenantResourcesPullTask().pull(self.tenant)
+        self.tenant.refresh_from_db()
+
+    def test_resources_are_fully_pulled_first_time(self, mocked_backend):
+        with freeze_time("2024-01-01 10:00"):
+            self.pull()
+
+        mocked_backend().pull_tenant_instances.assert_called_once_with(
+            self.tenant, None
+        )
+        pulled_at = datetime(2024, 1, 1, 10, 0, tzinfo=pytz.UTC)
+        self.assertEqual(self.tenant.resources_pulled_at, pulled_at)
+        self.assertEqual(self.tenant.resources_reconciled_at, pulled_at)
+
+    def test_changed_resources_are_pulled_after_full_pull(self, mocked_backend):
+        with freeze_time("2024-01-01 10:00"):
+            self.pull()
+        with freeze_time("2024-01-01 11:00"):
+            self.pull()
+
+        mocked_backend().pull_tenant_volumes.assert_called_with(
+            self.tenant, datetime(2024, 1, 1, 9, 55, tzinfo=pytz.UTC)
+        )
+        self.assertEqual(
+            self.tenant.resources_pulled_at,
+            datetime(2024, 1, 1, 11, 0, tzinfo=pytz.UTC),
+        )
+        self.assertEqual(
+            self.tenant.resources_reconciled_at,
+            datetime(2024, 1, 1, 10, 0, tzinfo=pytz.UTC),
+        )
+
+    def test_resources_are_fully_pulled_after_reconciliation_period(
+        self, mocked_backend
+    ):
+        with freeze_time("2024-01-01 10:00"):
+            self.pull()
+        with freeze_time("2024-01-02 11:00"):
+            self.pull()
+
+        mocked_backend().pull_tenant_snapshots.assert_called_with(self.tenant, None)
+        self.assertEqual(
+            self.tenant.resources_reconciled_at,
+            datetime(2024, 1, 2, 11, 0, tzinfo=pytz.UTC),
+        )
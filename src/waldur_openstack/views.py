@@ -434,8 +434,7 @@ class TenantViewSet(structure_views.ResourceViewSet):
         serializer.is_valid(raise_exception=True)
 
         quotas = dict(serializer.validated_data)
-        for quota_name, limit in quotas.items():
-            tenant.set_quota_limit(quota_name, limit)
+        tenant.set_quota_limits(quotas)
         executors.TenantPushQuotasExecutor.execute(tenant, quotas=quotas)
 
         return response.Response(
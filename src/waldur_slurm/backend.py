@@ -31,6 +31,7 @@ class SlurmBackend(ServiceBackend):
             port=settings.options.get("port", 22),
             key_path=django_settings.WALDUR_SLURM["PRIVATE_KEY_PATH"],
             use_sudo=settings.options.get("use_sudo", False),
+            control_persist=django_settings.WALDUR_SLURM["SSH_CONTROL_PERSIST"],
         )
 
     def pull_resources(self):
@@ -55,46 +56,91 @@ class SlurmBackend(ServiceBackend):
             return True
 
     def sync_users(self, allocation):
+        """
+        Create missing and delete stale associations of allocation account.
+        Associations are created and deleted in batches in order to avoid SSH round trip per user.
+        """
+        account = allocation.backend_id
+
+        if not account.strip():
+            raise ServiceBackendError(
+                "Empty backend_id for allocation: %s" % allocation
+            )
+
         users = allocation.project.get_users()
-        profiles = freeipa_models.Profile.objects.filter(user__in=users)
-        for profile in profiles:
-            succeeded = self.add_user(
-                allocation, profile.user, profile.username.lower()
+        profiles = list(freeipa_models.Profile.objects.filter(user__in=users))
+        all_backend_usernames = self.client.list_account_users(account)
+
+        new_profiles = [
+            profile
+            for profile in profiles
+            if profile.username.lower() not in all_backend_usernames
+        ]
+        default_account = self.settings.options.get("default_account")
+        results = self.client.create_associations(
+            [profile.username.lower() for profile in new_profiles],
+            account,
+            default_account,
+        )
+        failed_profiles = set()
+        for profile, result in zip(new_profiles, results):
+            if result.error:
+                logger.error("Unable to create association in Slurm: %s", result.error)
+                failed_profiles.add(profile)
+                continue
+            logger.info(
+                "Association between %s and %s has been created",
+                profile.username.lower(),
+                account,
+            )
+            signals.slurm_association_created.send(
+                models.Allocation,
+                allocation=allocation,
+                user=profile.user,
+                username=profile.username.lower(),
             )
-            if succeeded:
+
+        for profile in profiles:
+            if profile not in failed_profiles:
                 models.Association.objects.get_or_create(
                     allocation=allocation,
                     username=profile.username,
                 )
 
-        all_backend_usernames = self.client.list_account_users(allocation.backend_id)
         backend_usernames = freeipa_models.Profile.objects.filter(
             username__in=all_backend_usernames
         ).values_list("username", flat=True)
         local_usernames = [profile.username for profile in profiles]
         stale_usernames = set(backend_usernames) - set(local_usernames)
-
-        for profile in freeipa_models.Profile.objects.filter(
-            username__in=stale_usernames
-        ):
+        stale_profiles = list(
+            freeipa_models.Profile.objects.filter(username__in=stale_usernames)
+        )
+        results = self.client.delete_associations(
+            [profile.username.lower() for profile in stale_profiles], account
+        )
+        for profile, result in zip(stale_profiles, results):
             username = profile.username.lower()
-            succeeded = self.delete_user(allocation, profile.user, username)
-            if succeeded:
-                try:
-                    models.Association.objects.get(
-                        allocation=allocation, username=username
-                    ).delete()
-                    logger.info(
-                        "Association between %s and %s has been deleted",
-                        allocation,
-                        profile.user,
-                    )
-                except models.Association.DoesNotExist:
-                    logger.warn(
-                        "Association between %s and %s has been already deleted",
-                        allocation,
-                        profile.user,
-                    )
+            if result.error:
+                logger.error("Unable to delete association in Slurm: %s", result.error)
+                continue
+            signals.slurm_association_deleted.send(
+                models.Allocation, allocation=allocation, user=profile.user
+            )
+            deleted, _ = models.Association.objects.filter(
+                allocation=allocation, username=username
+            ).delete()
+            if deleted:
+                logger.info(
+                    "Association between %s and %s has been deleted",
+                    allocation,
+                    profile.user,
+                )
+            else:
+                logger.warning(
+                    "Association between %s and %s has been already deleted",
+                    allocation,
+                    profile.user,
+                )
 
     def create_allocation(self, allocation):
         project = allocation.project
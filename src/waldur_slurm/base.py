@@ -1,6 +1,10 @@
 import abc
+import collections
 import logging
+import os
 import subprocess  # noqa: S404
+import tempfile
+import uuid
 
 from django.utils.functional import cached_property
 
@@ -13,13 +17,25 @@ class BatchError(Exception):
     pass
 
 
+CommandResult = collections.namedtuple("CommandResult", ["output", "error"])
+
+
 class BaseBatchClient(metaclass=abc.ABCMeta):
-    def __init__(self, hostname, key_path, username="root", port=22, use_sudo=False):
+    def __init__(
+        self,
+        hostname,
+        key_path,
+        username="root",
+        port=22,
+        use_sudo=False,
+        control_persist=None,
+    ):
         self.hostname = hostname
         self.key_path = key_path
         self.username = username
         self.port = port
         self.use_sudo = use_sudo
+        self.control_persist = control_persist
 
     @abc.abstractmethod
     def list_accounts(self):
@@ -109,28 +125,50 @@ class BaseBatchClient(metaclass=abc.ABCMeta):
         """
         raise NotImplementedError()
 
-    def execute_command(self, command):
-        server = f"{self.username}@{self.hostname}"
-        port = str(self.port)
-        if self.use_sudo:
-            account_command = ["sudo"]
-        else:
-            account_command = []
-
-        account_command.extend(command)
+    def get_ssh_command(self, remote_command):
         ssh_command = [
             "ssh",
             "-o",
             "UserKnownHostsFile=/dev/null",
             "-o",
             "StrictHostKeyChecking=no",
-            server,
-            "-p",
-            port,
-            "-i",
-            self.key_path,
-            " ".join(account_command),
         ]
+        if self.control_persist:
+            # SSH connection is shared by subsequent commands until it is idle for control_persist
+            ssh_command.extend(
+                [
+                    "-o",
+                    "ControlMaster=auto",
+                    "-o",
+                    "ControlPath=%s"
+                    % os.path.join(tempfile.gettempdir(), "waldur-slurm-%C"),
+                    "-o",
+                    "ControlPersist=%s" % self.control_persist,
+                ]
+            )
+        ssh_command.extend(
+            [
+                f"{self.username}@{self.hostname}",
+                "-p",
+                str(self.port),
+                "-i",
+                self.key_path,
+                remote_command,
+            ]
+        )
+        return ssh_command
+
+    def get_account_command(self, command):
+        if self.use_sudo:
+            account_command = ["sudo"]
+        else:
+            account_command = []
+
+        account_command.extend(command)
+        return " ".join(account_command)
+
+    def execute_command(self, command):
+        ssh_command = self.get_ssh_command(self.get_account_command(command))
 
         try:
             logger.debug("Executing SSH command: %s", " ".join(ssh_command))
@@ -139,12 +177,63 @@ class BaseBatchClient(metaclass=abc.ABCMeta):
             )
         except subprocess.CalledProcessError as e:
             logger.exception('Failed to execute command "%s".', ssh_command)
-            stdout = e.output or ""
-            lines = stdout.splitlines()
-            if len(lines) > 0 and lines[0].startswith("Warning: Permanently added"):
-                lines = lines[1:]
-            stdout = "\n".join(lines)
-            raise BatchError(stdout)
+            raise BatchError(self._clean_output(e.output))
+
+    def execute_commands(self, commands):
+        """
+        Execute several commands within a single SSH session.
+        Commands are executed one after another even if some of them fail.
+        :param commands: list[list[string]]
+        :return: list[CommandResult] in the same order as commands
+        """
+        if not commands:
+            return []
+
+        marker = "waldur-batch-%s" % uuid.uuid4().hex
+        script = "\n".join(
+            f'{self.get_account_command(command)}; echo "{marker} $?"'
+            for command in commands
+        )
+        ssh_command = self.get_ssh_command(script)
+
+        try:
+            logger.debug("Executing batch of %s SSH commands", len(commands))
+            output = subprocess.check_output(  # noqa: S603
+                ssh_command, stderr=subprocess.STDOUT, encoding="utf-8"
+            )
+        except subprocess.CalledProcessError as e:
+            logger.exception('Failed to execute batch "%s".', ssh_command)
+            output = e.output or ""
+
+        results = []
+        lines = []
+        for line in output.splitlines():
+            if marker not in line:
+                lines.append(line)
+                continue
+            # Output of the command may lack trailing newline
+            line, status = line.split(marker)
+            if line:
+                lines.append(line)
+            command_output = self._clean_output("\n".join(lines))
+            lines = []
+            if status.strip() == "0":
+                results.append(CommandResult(command_output, None))
+            else:
+                results.append(CommandResult(None, BatchError(command_output)))
+
+        # Commands without status have not been executed because SSH session has failed
+        error = BatchError(self._clean_output("\n".join(lines)))
+        results.extend(
+            CommandResult(None, error) for _ in range(len(commands) - len(results))
+        )
+        return results
+
+    def _clean_output(self, stdout):
+        lines = (stdout or "").splitlines()
+        if len(lines) > 0 and lines[0].startswith("Warning: Permanently added"):
+            lines = lines[1:]
+        return "\n".join(lines)
 
 
 class BaseReportLine(metaclass=abc.ABCMeta):
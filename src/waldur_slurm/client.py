@@ -102,27 +102,57 @@ class SlurmClient(BaseBatchClient):
 
     def create_association(self, username, account, default_account=""):
         return self._execute_command(
+            self._get_create_association_command(username, account, default_account)
+        )
+
+    def create_associations(self, usernames, account, default_account=""):
+        """
+        Create associations between several users and account in a single round trip.
+        :return: list[base.CommandResult] in the same order as usernames
+        """
+        return self._execute_commands(
             [
-                "add",
-                "user",
-                username,
-                "account=%s" % account,
-                "DefaultAccount=%s" % default_account,
+                self._get_create_association_command(username, account, default_account)
+                for username in usernames
             ]
         )
 
+    def _get_create_association_command(self, username, account, default_account):
+        return [
+            "add",
+            "user",
+            username,
+            "account=%s" % account,
+            "DefaultAccount=%s" % default_account,
+        ]
+
     def delete_association(self, username, account):
         return self._execute_command(
+            self._get_delete_association_command(username, account)
+        )
+
+    def delete_associations(self, usernames, account):
+        """
+        Delete associations between several users and account in a single round trip.
+        :return: list[base.CommandResult] in the same order as usernames
+        """
+        return self._execute_commands(
             [
-                "remove",
-                "user",
-                "where",
-                "name=%s" % username,
-                "and",
-                "account=%s" % account,
+                self._get_delete_association_command(username, account)
+                for username in usernames
             ]
         )
 
+    def _get_delete_association_command(self, username, account):
+        return [
+            "remove",
+            "user",
+            "where",
+            "name=%s" % username,
+            "and",
+            "account=%s" % account,
+        ]
+
     def get_usage_report(self, accounts):
         month_start, month_end = format_current_month()
 
@@ -168,8 +198,21 @@ class SlurmClient(BaseBatchClient):
         ]
 
     def _execute_command(self, command, command_name="sacctmgr", immediate=True):
+        return self.execute_command(
+            self._get_account_command(command, command_name, immediate)
+        )
+
+    def _execute_commands(self, commands, command_name="sacctmgr", immediate=True):
+        return self.execute_commands(
+            [
+                self._get_account_command(command, command_name, immediate)
+                for command in commands
+            ]
+        )
+
+    def _get_account_command(self, command, command_name, immediate):
         account_command = [command_name, "--parsable2", "--noheader"]
         if immediate:
             account_command.append("--immediate")
         account_command.extend(command)
-        return self.execute_command(account_command)
+        return account_command
@@ -0,0 +1,120 @@
+import shlex
+import subprocess  # noqa: S404
+
+
+class FakeSlurmShell:
+    """
+    Emulates SLURM master reachable over SSH.
+    It replaces subprocess.check_output and keeps accounts and associations in memory.
+    Both single commands and batches sent by BaseBatchClient.execute_commands are supported.
+    """
+
+    def __init__(self):
+        self.accounts = {}
+        self.associations = set()
+        self.limits = {}
+        self.report = ""
+        self.ssh_commands = []
+
+    def __call__(self, ssh_command, **kwargs):
+        self.ssh_commands.append(ssh_command)
+        output = []
+        for line in ssh_command[-1].splitlines():
+            command, _, status_command = line.partition("; echo ")
+            code, command_output = self.run(shlex.split(command))
+            output.append(command_output)
+            if status_command:
+                marker = shlex.split(status_command)[0].split()[0]
+                output.append(f"{marker} {code}\n")
+            elif code:
+                raise subprocess.CalledProcessError(
+                    code, ssh_command, output="".join(output)
+                )
+        return "".join(output)
+
+    def add_account(self, name, description="", organization="", parent=None):
+        self.accounts[name] = (description, organization, parent)
+
+    def run(self, argv):
+        if argv and argv[0] == "sudo":
+            argv = argv[1:]
+        if argv[0] == "sacct":
+            return 0, self.report
+        if argv[0] != "sacctmgr":
+            return 127, f"sh: {argv[0]}: command not found\n"
+
+        args = [arg for arg in argv[1:] if not arg.startswith("--")]
+        options = dict(arg.split("=", 1) for arg in args if "=" in arg)
+        action, entity = args[0], args[1]
+
+        if action in ("list", "show") and entity == "account":
+            names = args[2:] or list(self.accounts)
+            return 0, "".join(
+                "{}|{}|{}\n".format(name, *self.accounts[name][:2])
+                for name in names
+                if name in self.accounts
+            )
+
+        if action == "add" and entity == "account":
+            if args[2] in self.accounts:
+                return 1, " Nothing new added.\n"
+            self.add_account(
+                args[2],
+                options.get("description", ""),
+                options.get("organization", ""),
+                options.get("parent"),
+            )
+            return 0, f" Adding Account(s)\n  {args[2]}\n"
+
+        if action == "remove" and entity == "account":
+            name = options["name"]
+            self.accounts.pop(name, None)
+            self.associations = {item for item in self.associations if item[0] != name}
+            return 0, f" Deleting account(s)...\n  {name}\n"
+
+        if action == "modify" and entity == "account":
+            self.limits[args[2]] = args[4].split("=", 1)[1]
+            return 0, " Modified account associations...\n"
+
+        if action == "add" and entity == "user":
+            account, user = options["account"], args[2]
+            if account not in self.accounts:
+                return 1, f" Account '{account}' does not exist.\n"
+            if (account, user) in self.associations:
+                return 1, " Nothing new added.\n"
+            self.associations.add((account, user))
+            return 0, f" Associations =\n  U = {user} A = {account}\n"
+
+        if action == "remove" and entity == "user":
+            stale = {
+                (account, user)
+                for account, user in self.associations
+                if options.get("account", account) == account
+                and options.get("name", user) == user
+            }
+            if not stale:
+                return 1, " Nothing deleted\n"
+            self.associations -= stale
+            return 0, " Deleting user associations...\n"
+
+        if action in ("list", "show") and entity.startswith("association"):
+            if options.get("format") == "account,GrpTRESMins":
+                account = options["accounts"]
+                return 0, f"{account}|{self.limits.get(account, '')}\n"
+            account = options.get("account")
+            lines = []
+            if "user" not in options:
+                lines.append(f"{account}|")
+            lines.extend(
+                f"{account}|{user}"
+                for item_account, user in sorted(self.associations)
+                if item_account == account and options.get("user", user) == user
+            )
+            if options.get("format") == "account,user":
+                return 0, "".join(line + "\n" for line in lines)
+            return 0, "".join(
+                "cluster|{}|||||||{}\n".format(line, self.limits.get(account, ""))
+                for line in lines
+            )
+
+        return 1, f" Unknown option: {' '.join(args)}\n"
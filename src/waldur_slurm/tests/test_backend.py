@@ -1,3 +1,5 @@
+import os
+import tempfile
 from unittest import mock
 
 from django.conf import settings as django_settings
@@ -65,6 +67,12 @@ class BackendTest(TestCase):
             "UserKnownHostsFile=/dev/null",
             "-o",
             "StrictHostKeyChecking=no",
+            "-o",
+            "ControlMaster=auto",
+            "-o",
+            "ControlPath=%s" % os.path.join(tempfile.gettempdir(), "waldur-slurm-%C"),
+            "-o",
+            "ControlPersist=%s" % django_settings.WALDUR_SLURM["SSH_CONTROL_PERSIST"],
             "root@localhost",
             "-p",
             "22",
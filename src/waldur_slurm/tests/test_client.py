@@ -0,0 +1,106 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from waldur_freeipa import models as freeipa_models
+from waldur_slurm import models
+from waldur_slurm.client import SlurmClient
+
+from . import factories, fixtures
+from .fake_slurm import FakeSlurmShell
+
+
+class SlurmClientTest(TestCase):
+    def setUp(self):
+        self.shell = FakeSlurmShell()
+        self.shell.add_account("allocation1")
+        patcher = mock.patch("subprocess.check_output", self.shell)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = SlurmClient("localhost", "/etc/waldur/id_rsa")
+
+    def test_batch_is_sent_in_single_ssh_session(self):
+        results = self.client.create_associations(
+            ["user1", "user2"], "allocation1", "allocation1"
+        )
+
+        self.assertEqual(len(self.shell.ssh_commands), 1)
+        self.assertEqual([result.error for result in results], [None, None])
+        self.assertEqual(
+            self.shell.associations,
+            {("allocation1", "user1"), ("allocation1", "user2")},
+        )
+
+    def test_failed_commands_do_not_abort_batch(self):
+        self.shell.associations.add(("allocation1", "user1"))
+
+        results = self.client.create_associations(["user1", "user2"], "allocation1")
+
+        self.assertIsNotNone(results[0].error)
+        self.assertIsNone(results[1].error)
+        self.assertIn(("allocation1", "user2"), self.shell.associations)
+
+    def test_empty_batch_is_not_sent(self):
+        self.assertEqual(self.client.delete_associations([], "allocation1"), [])
+        self.assertEqual(self.shell.ssh_commands, [])
+
+    def test_connection_is_reused_if_control_persist_is_set(self):
+        self.client.control_persist = "10m"
+        self.client.list_accounts()
+
+        ssh_command = self.shell.ssh_commands[0]
+        self.assertIn("ControlMaster=auto", ssh_command)
+        self.assertIn("ControlPersist=10m", ssh_command)
+
+    def test_connection_is_not_reused_if_control_persist_is_not_set(self):
+        self.client.list_accounts()
+
+        ssh_command = self.shell.ssh_commands[0]
+        self.assertNotIn("ControlMaster=auto", ssh_command)
+
+
+class SyncUsersTest(TestCase):
+    def setUp(self):
+        self.shell = FakeSlurmShell()
+        patcher = mock.patch("subprocess.check_output", self.shell)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.fixture = fixtures.SlurmFixture()
+        self.allocation = self.fixture.allocation
+        self.account = self.allocation.backend_id
+        self.shell.add_account(self.account)
+        freeipa_models.Profile.objects.create(user=self.fixture.admin, username="User1")
+        freeipa_models.Profile.objects.create(
+            user=self.fixture.manager, username="user2"
+        )
+        self.backend = self.allocation.get_backend()
+
+    def test_associations_are_created_in_single_batch(self):
+        self.backend.sync_users(self.allocation)
+
+        self.assertEqual(
+            self.shell.associations,
+            {(self.account, "user1"), (self.account, "user2")},
+        )
+        # Account users are listed and missing ones are added in a batch
+        self.assertEqual(len(self.shell.ssh_commands), 2)
+        self.assertEqual(
+            set(self.allocation.associations.values_list("username", flat=True)),
+            {"User1", "user2"},
+        )
+
+    def test_stale_associations_are_deleted(self):
+        stale_user = self.fixture.user
+        freeipa_models.Profile.objects.create(user=stale_user, username="user3")
+        self.shell.associations.add((self.account, "user3"))
+        factories.AssociationFactory(allocation=self.allocation, username="user3")
+
+        self.backend.sync_users(self.allocation)
+
+        self.assertNotIn((self.account, "user3"), self.shell.associations)
+        self.assertFalse(
+            models.Association.objects.filter(
+                allocation=self.allocation, username="user3"
+            ).exists()
+        )